@@ -3,133 +3,452 @@
 Interactive test for WLASL and How2Sign - Type text and see outputs!
 Run from backend directory: python interactive_test.py
 """
-import requests
+import argparse
+import asyncio
+import atexit
+import contextlib
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import httpx
+import importlib.util
+import itertools
 import json
+import mmap
+import pathlib
+import sys
+from typing import Callable, List, Optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ijson
+except ImportError:
+    ijson = None
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+except ImportError:
+    PromptSession = None
+
+# httpx only speaks HTTP/2 when the h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 BASE = "http://localhost:8000"
+URL_VOCAB = "/asl/wlasl-vocabulary"
+URL_WLASL_ANIM = "/asl/text-to-wlasl-animation"
+URL_H2S_INFO = "/how2sign/info"
+URL_H2S_ANIM = "/how2sign/animation"
 
-def print_section(title):
-    print(f"\n{'='*50}")
-    print(f"  {title}")
-    print(f"{'='*50}")
+# 30s read timeout, 3s to establish the connection
+TIMEOUT = httpx.Timeout(30.0, connect=3.0)
 
-def test_wlasl(text):
-    """Test WLASL text-to-animation"""
-    print_section("WLASL TEST")
-    print(f"Input text: '{text}'")
-    
-    try:
-        # Get WLASL vocabulary first
-        vocab_response = requests.get(f"{BASE}/asl/wlasl-vocabulary")
-        if vocab_response.status_code == 200:
-            vocab_data = vocab_response.json()
-            print(f"✓ WLASL Vocabulary loaded: {len(vocab_data.get('vocabulary', []))} words")
-        else:
-            print(f"✗ WLASL Vocabulary failed: {vocab_response.status_code}")
-        
-        # Test text-to-WLASL animation
-        print(f"\nTesting WLASL animation for: '{text}'")
-        response = requests.post(f"{BASE}/asl/text-to-wlasl-animation", 
-                               json={"text": text})
-        
-        if response.status_code == 200:
-            data = response.json()
-            print("✓ WLASL Animation Response:")
-            print(f"  Success: {data.get('success', 'N/A')}")
-            print(f"  Gloss: {data.get('gloss', 'N/A')}")
-            print(f"  Has animation data: {bool(data.get('animation_data') or data.get('animation'))}")
-            
-            # Show some animation details if available
-            if data.get('animation_data'):
-                anim_data = data['animation_data']
-                if isinstance(anim_data, list):
-                    print(f"  Animation frames: {len(anim_data)}")
-                elif isinstance(anim_data, dict):
-                    print(f"  Animation keys: {list(anim_data.keys())}")
-            
+# Pooled keepalive connections to the backend, shared by every request in a
+# turn and across REPL turns. With HTTP/2 the concurrent requests are
+# multiplexed over a single connection instead.
+LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=4)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Animation summaries keyed by endpoint and request body; disable with
+# --no-cache
+CACHE_DIR = pathlib.Path("~/.cache/v4e-interactive").expanduser()
+USE_CACHE = True
+
+# Previously entered phrases, recalled with the up arrow
+HISTORY_FILE = pathlib.Path("~/.v4e_history").expanduser()
+
+# Transient failures (connection errors and these statuses) are retried
+# with exponential backoff: 0.3s, 0.6s, 1.2s
+RETRIES = 3
+BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+
+def _loads(content):
+    """Decode a JSON response body straight from bytes"""
+    return orjson.loads(content) if orjson else json.loads(content)
+
+def _dumps(payload):
+    """Encode a JSON request body to bytes"""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode()
+
+@contextlib.asynccontextmanager
+async def _stream(client, method, url, **kwargs):
+    """Open a streamed request, retrying transient failures with backoff"""
+    request = client.build_request(method, url, **kwargs)
+    for attempt in range(RETRIES + 1):
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TransportError:
+            if attempt == RETRIES:
+                raise
         else:
-            print(f"✗ WLASL Animation failed: {response.status_code}")
-            print(f"  Error: {response.text}")
-            
+            if response.status_code not in RETRY_STATUSES or attempt == RETRIES:
+                break
+            await response.aclose()
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+# In-flight or finished fetches of endpoints that do not change while the
+# backend is up, keyed by URL. Storing the task lets concurrent tests in a
+# batch share a single request.
+_static_cache = {}
+
+async def _fetch_json(client, url):
+    async with _stream(client, "GET", url) as response:
+        if response.status_code != 200:
+            return response.status_code, None
+        return 200, _loads(await response.aread())
+
+async def _get_static(client, url):
+    """GET a static endpoint once per session; returns (status_code, data)"""
+    task = _static_cache.get(url)
+    if task is None:
+        task = _static_cache[url] = asyncio.ensure_future(_fetch_json(client, url))
+
+    try:
+        status, data = await task
+    except Exception:
+        _static_cache.pop(url, None)
+        raise
+
+    if status != 200:
+        # Don't remember failures; retry on the next turn
+        _static_cache.pop(url, None)
+    return status, data
+
+class _ResponseReader:
+    """Async file-like view of a streamed httpx response body, for ijson"""
+
+    def __init__(self, response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size=-1):
+        if size == 0:
+            # ijson probes with read(0) to tell bytes from str
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+def _count_items(data, prefix):
+    """Length of the list found at a dotted ijson-style prefix, or None"""
+    for key in prefix.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return len(data) if isinstance(data, list) else None
+
+@lru_cache(maxsize=256)
+def _gloss(text):
+    """Normalise input text to the gloss form How2Sign expects"""
+    return text.upper()
+
+@lru_cache(maxsize=256)
+def _wlasl_body(text):
+    return _dumps({"text": text})
+
+@lru_cache(maxsize=256)
+def _h2s_body(gloss):
+    return _dumps({"sign_gloss": gloss})
+
+async def _fetch_animation(client, url, body, frames_prefix):
+    """POST for an animation and parse the reply as it streams in.
+
+    The frames under ``frames_prefix`` are counted rather than kept, so the
+    bulk of the payload is never held in memory. Returns
+    (status_code, data, frame_count, error_text).
+    """
+    async with _stream(client, "POST", url, content=body, headers=JSON_HEADERS) as response:
+        if response.status_code != 200 or ijson is None:
+            await response.aread()
+            if response.status_code != 200:
+                return response.status_code, None, None, response.text
+            data = _loads(response.content)
+            return 200, data, _count_items(data, frames_prefix), None
+
+        item_prefix = frames_prefix + ".item"
+        nested_prefix = item_prefix + "."
+        builder = ijson.ObjectBuilder()
+        frames = 0
+        async for prefix, event, value in ijson.parse_async(_ResponseReader(response), use_float=True):
+            if prefix == item_prefix or prefix.startswith(nested_prefix):
+                if prefix == item_prefix and event not in ("map_key", "end_map", "end_array"):
+                    frames += 1
+                continue
+            builder.event(event, value)
+        return 200, builder.value, frames, None
+
+def _read_cached(path):
+    """Parse a cache entry straight from a read-only mapping of the file"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if orjson is None:
+            return json.loads(mm[:])
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+def _cache_path(url, body):
+    key = f"{BASE}{url}".encode() + b"\0" + body
+    digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+async def _post_animation(client, url, body, frames_prefix):
+    """_fetch_animation, served from the on-disk cache when possible.
+
+    The backend is deterministic for a given (endpoint, body), so successful
+    summaries are kept under CACHE_DIR and reused across REPL sessions.
+    """
+    path = _cache_path(url, body) if USE_CACHE else None
+    if path is not None and path.exists():
+        try:
+            cached = _read_cached(path)
+            return 200, cached["data"], cached["frames"], None
+        except (OSError, ValueError, KeyError):
+            pass  # Unreadable entry, fetch again
+
+    status, data, frames, error = await _fetch_animation(client, url, body, frames_prefix)
+
+    if path is not None and status == 200:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(_dumps({"data": data, "frames": frames}))
+            tmp_path.replace(path)
+        except OSError:
+            pass  # Caching is best effort
+    return status, data, frames, error
+
+# Number of keys shown when summarising an animation payload
+PREVIEW_KEYS = 8
+
+def _preview_keys(mapping):
+    """List the first few keys of a dict without materialising all of them"""
+    keys = list(itertools.islice(mapping.keys(), PREVIEW_KEYS))
+    suffix = ", ..." if len(mapping) > PREVIEW_KEYS else ""
+    return f"{keys}{suffix}"
+
+def _describe_animation(anim):
+    """Summary lines for an animation payload.
+
+    Payloads are almost always a list of frames, so index first and only
+    fall back to the dict summary when that fails.
+    """
+    try:
+        first = anim[0]
+    except IndexError:
+        return ["  Animation frames: 0"]
+    except (KeyError, TypeError):
+        try:
+            return [f"  Animation keys: {_preview_keys(anim)}"]
+        except AttributeError:
+            return []
+
+    try:
+        first_keys = _preview_keys(first)
+    except AttributeError:
+        first_keys = "Not a dict"
+    return [f"  Animation frames: {len(anim)}", f"  First frame keys: {first_keys}"]
+
+def section_lines(title):
+    """Banner lines that open a test's report"""
+    return ["", "=" * 50, f"  {title}", "=" * 50]
+
+def write_lines(lines):
+    """Emit a whole report with a single write to stdout"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _summarize_wlasl_vocab(vocab_data):
+    return [f"✓ WLASL Vocabulary loaded: {len(vocab_data.get('vocabulary', []))} words"]
+
+def _summarize_wlasl_animation(data, frames):
+    lines = [
+        f"  Success: {data.get('success', 'N/A')}",
+        f"  Gloss: {data.get('gloss', 'N/A')}",
+        f"  Has animation data: {bool(data.get('animation_data') or data.get('animation'))}",
+    ]
+
+    # Show some animation details if available
+    if data.get('animation_data'):
+        lines.extend(_describe_animation(data['animation_data']))
+        if frames is not None:
+            lines.append(f"  Streamed frames: {frames}")
+    return lines
+
+def _summarize_how2sign_info(info_data):
+    lines = ["✓ How2Sign Info:", f"  Success: {info_data.get('success', 'N/A')}"]
+    if info_data.get('info'):
+        info = info_data['info']
+        lines.append(f"  Dataset size: {info.get('dataset_size', 'N/A')}")
+        lines.append(f"  Classes: {info.get('classes', 'N/A')}")
+    return lines
+
+def _summarize_how2sign_animation(data, frames):
+    lines = [f"  Success: {data.get('success', 'N/A')}"]
+    if data.get('animation'):
+        lines.extend(_describe_animation(data['animation']))
+        if frames is not None:
+            lines.append(f"  Streamed frames: {frames}")
+    else:
+        lines.append("  No animation data found")
+    return lines
+
+@dataclass(frozen=True)
+class SignTest:
+    """One dataset under test: a static info endpoint plus an animation endpoint"""
+    name: str
+    info_url: str
+    info_label: str
+    summarize_info: Callable[[dict], List[str]]
+    animation_url: str
+    animation_body: Callable[[str], bytes]
+    frames_prefix: str
+    summarize_animation: Callable[[dict, Optional[int]], List[str]]
+
+SIGN_TESTS = (
+    SignTest(
+        name="WLASL",
+        info_url=URL_VOCAB,
+        info_label="Vocabulary",
+        summarize_info=_summarize_wlasl_vocab,
+        animation_url=URL_WLASL_ANIM,
+        animation_body=_wlasl_body,
+        frames_prefix="animation_data.frames",
+        summarize_animation=_summarize_wlasl_animation,
+    ),
+    SignTest(
+        name="How2Sign",
+        info_url=URL_H2S_INFO,
+        info_label="Info",
+        summarize_info=_summarize_how2sign_info,
+        animation_url=URL_H2S_ANIM,
+        animation_body=lambda text: _h2s_body(_gloss(text)),
+        frames_prefix="animation.animation_data",
+        summarize_animation=_summarize_how2sign_animation,
+    ),
+)
+
+async def run_test(test, client, text):
+    """Test one dataset's text-to-animation and print its report"""
+    lines = section_lines(f"{test.name.upper()} TEST")
+    try:
+        # Fetch the info and the animation concurrently
+        (info_status, info_data), (status, data, frames, error) = await asyncio.gather(
+            _get_static(client, test.info_url),
+            _post_animation(client, test.animation_url,
+                            test.animation_body(text), test.frames_prefix)
+        )
     except Exception as e:
-        print(f"✗ WLASL test error: {str(e)}")
+        write_lines(lines + [f"✗ {test.name} test error: {str(e)}"])
+        return
+
+    lines.append(f"Input text: '{text}'")
 
-def test_how2sign(text):
-    """Test How2Sign text-to-animation"""
-    print_section("HOW2SIGN TEST")
-    print(f"Input text: '{text}'")
-    
     try:
-        # Get How2Sign info first
-        info_response = requests.get(f"{BASE}/how2sign/info")
-        if info_response.status_code == 200:
-            info_data = info_response.json()
-            print(f"✓ How2Sign Info:")
-            print(f"  Success: {info_data.get('success', 'N/A')}")
-            if info_data.get('info'):
-                info = info_data['info']
-                print(f"  Dataset size: {info.get('dataset_size', 'N/A')}")
-                print(f"  Classes: {info.get('classes', 'N/A')}")
+        if info_status == 200:
+            lines.extend(test.summarize_info(info_data))
         else:
-            print(f"✗ How2Sign Info failed: {info_response.status_code}")
-        
-        # Test How2Sign animation
-        print(f"\nTesting How2Sign animation for: '{text}'")
-        response = requests.post(f"{BASE}/how2sign/animation", 
-                               json={"sign_gloss": text.upper()})
-        
-        if response.status_code == 200:
-            data = response.json()
-            print("✓ How2Sign Animation Response:")
-            print(f"  Success: {data.get('success', 'N/A')}")
-            
-            if data.get('animation'):
-                anim = data['animation']
-                if isinstance(anim, list):
-                    print(f"  Animation frames: {len(anim)}")
-                    if len(anim) > 0:
-                        print(f"  First frame keys: {list(anim[0].keys()) if isinstance(anim[0], dict) else 'Not a dict'}")
-                elif isinstance(anim, dict):
-                    print(f"  Animation keys: {list(anim.keys())}")
-            else:
-                print("  No animation data found")
-                
+            lines.append(f"✗ {test.name} {test.info_label} failed: {info_status}")
+
+        lines.append(f"\nTesting {test.name} animation for: '{text}'")
+
+        if status == 200:
+            lines.append(f"✓ {test.name} Animation Response:")
+            lines.extend(test.summarize_animation(data, frames))
         else:
-            print(f"✗ How2Sign Animation failed: {response.status_code}")
-            print(f"  Error: {response.text}")
-            
+            lines.append(f"✗ {test.name} Animation failed: {status}")
+            lines.append(f"  Error: {error}")
+
     except Exception as e:
-        print(f"✗ How2Sign test error: {str(e)}")
+        lines.append(f"✗ {test.name} test error: {str(e)}")
+
+    write_lines(lines)
+
+async def run_once(client, texts):
+    """Run every test for every input, with all requests in flight at once"""
+    await asyncio.gather(*(
+        run_test(test, client, text) for text in texts for test in SIGN_TESTS
+    ))
+
+def make_prompt():
+    """Line reader with persistent history.
+
+    Uses prompt_toolkit when installed, otherwise input() backed by readline.
+    """
+    if PromptSession is not None:
+        return PromptSession(history=FileHistory(str(HISTORY_FILE))).prompt
+
+    try:
+        import readline
+    except ImportError:
+        return input
+
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    atexit.register(readline.write_history_file, HISTORY_FILE)
+    return input
 
 def main():
+    global USE_CACHE
+
+    parser = argparse.ArgumentParser(description="Interactive WLASL & How2Sign test")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"always query the backend instead of reusing results in {CACHE_DIR}")
+    args = parser.parse_args()
+    USE_CACHE = not args.no_cache
+
     print("🎯 Interactive WLASL & How2Sign Test")
     print("Type text and see both WLASL and How2Sign outputs!")
+    print("Separate several phrases with ';' to test them in one batch")
     print("Type 'quit' to exit")
-    
-    while True:
-        try:
-            # Get user input
-            text = input("\n📝 Enter text to test (or 'quit'): ").strip()
-            
-            if text.lower() == 'quit':
-                print("👋 Goodbye!")
+
+    # One loop and one client for the whole REPL so keepalive connections
+    # survive between turns. uvloop, when installed, dispatches callbacks in C.
+    read_line = make_prompt()
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    client = httpx.AsyncClient(base_url=BASE, http2=HTTP2_AVAILABLE,
+                               timeout=TIMEOUT, limits=LIMITS)
+
+    try:
+        while True:
+            try:
+                # Get user input
+                text = read_line("\n📝 Enter text to test (or 'quit'): ").strip()
+
+                if text.lower() == 'quit':
+                    print("👋 Goodbye!")
+                    break
+
+                texts = [t.strip() for t in text.split(';') if t.strip()]
+                if not texts:
+                    print("❌ Please enter some text!")
+                    continue
+
+                # Test both systems
+                loop.run_until_complete(run_once(client, texts))
+
+                for text in texts:
+                    print(f"\n✅ Completed tests for: '{text}'")
+
+            except (KeyboardInterrupt, EOFError):
+                print("\n👋 Goodbye!")
                 break
-                
-            if not text:
-                print("❌ Please enter some text!")
-                continue
-            
-            # Test both systems
-            test_wlasl(text)
-            test_how2sign(text)
-            
-            print(f"\n✅ Completed tests for: '{text}'")
-            
-        except KeyboardInterrupt:
-            print("\n👋 Goodbye!")
-            break
-        except Exception as e:
-            print(f"❌ Error: {str(e)}")
+            except Exception as e:
+                print(f"❌ Error: {str(e)}")
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
 
 if __name__ == "__main__":
     main()
@@ -3,20 +3,26 @@ Body Language Translation API
 Main FastAPI application for translating body language to text/audio and vice versa
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse, Response
 import asyncio
-import json
 import base64
+from binascii import a2b_base64
+import hashlib
 import io
-from typing import List, Dict, Any
+import os
+import shutil
+import tempfile
+import uuid
+import numpy as np
+from typing import List, Dict, Any, Callable, Tuple
+from urllib.parse import quote
 import logging
-from datetime import datetime
 
 # Local imports
 from services.body_language_processor import BodyLanguageProcessor
-from services.ai_translator import AITranslator
+from services.ai_translator import AITranslator, instructions_to_columns
 from services.audio_processor import AudioProcessor
 from services.database_manager import DatabaseManager
 from services.asl_processor import asl_processor
@@ -28,8 +34,12 @@ from services.webrtc_manager import webrtc_manager
 from services.movenet_processor import movenet_processor
 from services.onnx_inference_server import onnx_inference_server
 from services.sigml_synthesis import sigml_synthesis
-from models.translation_models import TranslationRequest, TranslationResponse
-from utils.websocket_manager import WebSocketManager
+from models.translation_models import TranslationRequest, TranslationResponse, SignAnimationRequest, SystemHealth, JSON_ENCODER, JSON_DECODER, REALTIME_FRAME_DECODER
+from utils.websocket_manager import WebSocketManager, MSGPACK_AVAILABLE
+from utils.batch_queue import BatchQueue
+from utils.clock import now_iso
+from utils.sysmetrics import start_sampler, stop_sampler
+from utils.responses import ORJSONResponse, cached_with_ttl, dumps as orjson_dumps, stats_body, stats_response, stream_json_array
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,7 +49,9 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Body Language Translator API",
     description="AI-powered body language translation for communication accessibility",
-    version="1.0.0"
+    version="1.0.0",
+    # Responses carry large animation payloads; orjson encodes them much faster than json
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend integration
@@ -58,73 +70,144 @@ audio_processor = AudioProcessor()
 db_manager = DatabaseManager()
 websocket_manager = WebSocketManager()
 
+def pose_length_bucket(item) -> int:
+    """Bucket (body_language_data, context) pairs by pose sequence length"""
+    body_language_data, _ = item
+    return len(body_language_data.get("pose_landmarks") or []) // 32
+
+# Concurrent translate requests and realtime frames share model calls through these batchers
+ai_translator_batcher = BatchQueue(ai_translator.body_language_to_text_batch, bucket_key=pose_length_bucket)
+tts_batcher = BatchQueue(audio_processor.text_to_speech_batch)
+
+# Caps concurrent requests to GPU-backed models; the rest wait their turn
+GPU_SEMAPHORE = asyncio.Semaphore(int(os.getenv("MAX_GPU_CONCURRENCY", "8")))
+
+# Uploads are spooled to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def spool_upload(upload: UploadFile, default_suffix: str) -> str:
+    """
+    Copy an upload to a named temporary file in fixed-size chunks so the
+    whole body is never held in memory. The caller removes the file.
+    """
+    suffix = os.path.splitext(upload.filename or "")[1] or default_suffix
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        await asyncio.to_thread(shutil.copyfileobj, upload.file, temp_file, UPLOAD_CHUNK_SIZE)
+        return temp_file.name
+
+async def warm_up_services():
+    """
+    Run one dummy request through each model-backed service so model loading,
+    engine start-up and first-call compilation happen before real traffic
+    """
+    warmups = {
+        "AI translator": lambda: ai_translator.body_language_to_text_batch(
+            [(body_language_processor._empty_result(), None)]
+        ),
+        "text to speech": lambda: audio_processor.text_to_speech("warmup"),
+        "ONNX inference": lambda: onnx_inference_server.infer(
+            {"input_tensor": np.zeros((3, 256, 256), dtype=np.float32)}
+        ),
+        "ASL animation": lambda: asyncio.to_thread(
+            lambda: avatar_engine.generate_threejs_scene(asl_processor.process_text_to_asl("hello", 1.0))
+        ),
+    }
+    for name, warmup in warmups.items():
+        try:
+            await warmup()
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {str(e)}")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting Body Language Translator API...")
+    start_sampler()
     await db_manager.initialize()
     await ai_translator.initialize()
+    await warm_up_services()
+    try:
+        precomputed_json("asl_vocabulary", _asl_vocabulary_payload)
+        precomputed_json("wlasl_vocabulary", _wlasl_vocabulary_payload)
+    except Exception as e:
+        logger.warning(f"Failed to precompute vocabulary responses: {str(e)}")
     logger.info("All services initialized successfully")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Body Language Translator API...")
+    stop_sampler()
+    await ai_translator_batcher.close()
+    await tts_batcher.close()
     await db_manager.close()
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {
+    return ORJSONResponse({
         "message": "Body Language Translator API is running",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "version": "1.0.0"
-    }
+    })
+
+@app.get("/health")
+async def health():
+    """System health from cached metrics; no system calls per request"""
+    snapshot = SystemHealth.snapshot(
+        active_sessions=websocket_manager.get_active_connections_count(),
+        total_translations=db_manager.total_translations
+    )
+    return Response(JSON_ENCODER.encode(snapshot), media_type="application/json")
 
 @app.post("/translate/body-to-text")
 async def translate_body_language_to_text(
+    background_tasks: BackgroundTasks,
     video_file: UploadFile = File(...),
     context: str = None
 ):
     """
     Translate body language from video to text
     """
+    video_path = await spool_upload(video_file, ".mp4")
     try:
-        # Read video file
-        video_content = await video_file.read()
-        
-        # Process body language
-        body_language_data = await body_language_processor.process_video(video_content)
+        # Process body language straight from the spooled file
+        body_language_data = await body_language_processor.process_video(video_path)
         
         # Translate to text using AI
-        translation_result = await ai_translator.body_language_to_text(
-            body_language_data, 
-            context=context
-        )
+        translation_result = await ai_translator_batcher.submit((body_language_data, context))
         
-        # Store in database
-        session_id = await db_manager.store_translation_session(
+        # Store in database once the response has been sent
+        session_id = str(uuid.uuid4())
+        background_tasks.add_task(
+            db_manager.queue_translation_session,
+            session_id=session_id,
             input_type="body_language",
             output_type="text",
             input_data=body_language_data,
             output_data=translation_result
         )
         
-        return TranslationResponse(
+        response = TranslationResponse.trusted(
             session_id=session_id,
             translated_text=translation_result["text"],
             confidence=translation_result["confidence"],
-            timestamp=datetime.now().isoformat()
+            timestamp=now_iso()
         )
+        # Clients have always received detected_gestures, as null when unset
+        return Response(response.to_json(exclude_none=False), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error in body language to text translation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.unlink(video_path)
 
 @app.post("/translate/text-to-body")
-async def translate_text_to_body_language(request: TranslationRequest):
+async def translate_text_to_body_language(request: TranslationRequest, background_tasks: BackgroundTasks, columnar: bool = False):
     """
-    Translate text to body language instructions
+    Translate text to body language instructions; with ?columnar=true they
+    are returned as one array per field instead of a list of objects
     """
     try:
         # Generate body language instructions using AI
@@ -133,19 +216,29 @@ async def translate_text_to_body_language(request: TranslationRequest):
             context=request.context
         )
         
-        # Store in database
-        session_id = await db_manager.store_translation_session(
+        # Store in database once the response has been sent
+        session_id = str(uuid.uuid4())
+        background_tasks.add_task(
+            db_manager.queue_translation_session,
+            session_id=session_id,
             input_type="text",
             output_type="body_language",
             input_data={"text": request.text},
             output_data=body_language_instructions
         )
         
-        return {
+        if columnar:
+            return ORJSONResponse({
+                "session_id": session_id,
+                "body_language_columns": instructions_to_columns(body_language_instructions),
+                "timestamp": now_iso()
+            })
+        
+        return ORJSONResponse({
             "session_id": session_id,
             "body_language_instructions": body_language_instructions,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
         
     except Exception as e:
         logger.error(f"Error in text to body language translation: {str(e)}")
@@ -153,18 +246,17 @@ async def translate_text_to_body_language(request: TranslationRequest):
 
 @app.post("/translate/audio-to-body")
 async def translate_audio_to_body_language(
+    background_tasks: BackgroundTasks,
     audio_file: UploadFile = File(...),
     context: str = None
 ):
     """
     Translate audio to body language instructions
     """
+    audio_path = await spool_upload(audio_file, ".wav")
     try:
-        # Read audio file
-        audio_content = await audio_file.read()
-        
-        # Convert audio to text
-        transcription = await audio_processor.speech_to_text(audio_content)
+        # Convert audio to text straight from the spooled file
+        transcription = await audio_processor.speech_to_text_file(audio_path)
         
         # Generate body language instructions
         body_language_instructions = await ai_translator.text_to_body_language(
@@ -172,110 +264,215 @@ async def translate_audio_to_body_language(
             context=context
         )
         
-        # Store in database
-        session_id = await db_manager.store_translation_session(
+        # Store in database once the response has been sent
+        session_id = str(uuid.uuid4())
+        background_tasks.add_task(
+            db_manager.queue_translation_session,
+            session_id=session_id,
             input_type="audio",
             output_type="body_language",
             input_data=transcription,
             output_data=body_language_instructions
         )
         
-        return {
+        return ORJSONResponse({
             "session_id": session_id,
             "transcription": transcription,
             "body_language_instructions": body_language_instructions,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
         
     except Exception as e:
         logger.error(f"Error in audio to body language translation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.unlink(audio_path)
+
+async def body_to_audio_pipeline(video_path: str, context: str = None) -> List[tuple]:
+    """
+    Run pose extraction, translation and speech synthesis as concurrent
+    stages over consecutive segments of a video, so each stage works on one
+    segment while the previous stage handles the next.
+    
+    Returns (body_language_data, translation, audio) per segment; audio is
+    None for a segment whose text repeats the previous segment's.
+    """
+    translations = asyncio.Queue()
+    segments = []
+    
+    async def translate():
+        try:
+            async for body_language_data in body_language_processor.process_video_segments(video_path):
+                translation = await ai_translator_batcher.submit((body_language_data, context))
+                await translations.put((body_language_data, translation))
+        finally:
+            await translations.put(None)
+    
+    async def speak():
+        previous_text = None
+        while (item := await translations.get()) is not None:
+            body_language_data, translation = item
+            audio = None
+            if translation["text"] != previous_text:
+                audio = await tts_batcher.submit(translation["text"])
+                previous_text = translation["text"]
+            segments.append((body_language_data, translation, audio))
+    
+    # If either stage fails, stop the other instead of leaving it running
+    stages = [asyncio.create_task(translate()), asyncio.create_task(speak())]
+    try:
+        await asyncio.gather(*stages)
+    except BaseException:
+        for stage in stages:
+            stage.cancel()
+        raise
+    return segments
 
 @app.post("/translate/body-to-audio")
 async def translate_body_language_to_audio(
+    background_tasks: BackgroundTasks,
     video_file: UploadFile = File(...),
-    context: str = None
+    context: str = None,
+    encoding: str = "base64"
 ):
     """
     Translate body language to audio speech
+    
+    Returns JSON with the audio base64-encoded. Pass encoding=binary to get
+    the WAV audio as the response body instead, with the translation
+    metadata in X-* headers.
     """
+    video_path = await spool_upload(video_file, ".mp4")
     try:
-        # Read video file
-        video_content = await video_file.read()
-        
-        # Process body language
-        body_language_data = await body_language_processor.process_video(video_content)
-        
-        # Translate to text using AI
-        translation_result = await ai_translator.body_language_to_text(
-            body_language_data,
-            context=context
-        )
+        # Extract, translate and voice the video segment by segment
+        segments = await body_to_audio_pipeline(video_path, context)
+        spoken = [(translation, audio) for _, translation, audio in segments if audio is not None]
         
-        # Convert text to speech
-        audio_data = await audio_processor.text_to_speech(translation_result["text"])
+        body_language_data = body_language_processor.merge_results([segment for segment, _, _ in segments])
+        translation_result = {
+            "text": " ".join(translation["text"] for translation, _ in spoken),
+            "confidence": sum(translation["confidence"] for translation, _ in spoken) / len(spoken)
+        }
+        audio_data = audio_processor.concatenate_wav([audio for _, audio in spoken])
         
-        # Store in database
-        session_id = await db_manager.store_translation_session(
+        # Store in database once the response has been sent
+        session_id = str(uuid.uuid4())
+        background_tasks.add_task(
+            db_manager.queue_translation_session,
+            session_id=session_id,
             input_type="body_language",
             output_type="audio",
             input_data=body_language_data,
-            output_data={"text": translation_result["text"], "audio": audio_data}
+            output_data={"text": translation_result["text"], "audio_bytes": len(audio_data)}
         )
         
-        return {
+        if encoding == "binary":
+            return StreamingResponse(
+                io.BytesIO(audio_data),
+                media_type="audio/wav",
+                headers={
+                    "X-Session-Id": str(session_id),
+                    # Header values must be latin-1, so the text is percent-encoded
+                    "X-Translated-Text": quote(translation_result["text"]),
+                    "X-Confidence": str(translation_result["confidence"]),
+                    "X-Timestamp": now_iso()
+                }
+            )
+        
+        return ORJSONResponse({
             "session_id": session_id,
             "translated_text": translation_result["text"],
             "audio_base64": base64.b64encode(audio_data).decode(),
             "confidence": translation_result["confidence"],
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
         
     except Exception as e:
         logger.error(f"Error in body language to audio translation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.unlink(video_path)
+
+# Opcodes prefixing binary messages on /ws/realtime-translation
+FRAME_OP = 0x01
+AUDIO_OP = 0x02
+FRAME_MSGPACK_OP = 0x03
 
 @app.websocket("/ws/realtime-translation")
 async def websocket_realtime_translation(websocket: WebSocket):
     """
     WebSocket endpoint for real-time body language translation
+    
+    Binary messages are one opcode byte (FRAME_OP or AUDIO_OP) followed by
+    the raw frame or audio bytes, or FRAME_MSGPACK_OP followed by a
+    msgpack-encoded RealTimeFrame. JSON messages with base64 payloads are
+    still accepted; the "context" of a message applies to later messages too.
+    Empty binary messages are ignored and unknown opcodes get an error
+    message; neither ends the session.
     """
     await websocket_manager.connect(websocket)
+    context = None
+    
+    async def translate_frame(frame_data: bytes, frame_context: str):
+        # Process video frame for body language
+        body_language_data = await asyncio.to_thread(body_language_processor.process_frame, frame_data)
+        
+        if body_language_data["gestures"]:
+            # Translate to text; frames from all connected clients share model calls
+            translation = await ai_translator_batcher.submit((body_language_data, frame_context))
+            
+            # Send translation back
+            await websocket_manager.send_personal_message({
+                "type": "translation",
+                "text": translation["text"],
+                "confidence": translation["confidence"],
+                "dropped_frames": websocket_manager.get_dropped_count(websocket),
+                "timestamp": now_iso()
+            }, websocket)
+    
+    # Only the newest frame waits while one is being translated, so a slow
+    # model drops stale frames instead of building up latency
+    frames = asyncio.Queue(maxsize=1)
+    frame_consumer = asyncio.create_task(websocket_manager.consume_latest(websocket, frames, translate_frame))
     try:
         while True:
-            # Receive video frame or audio data
-            data = await websocket.receive_json()
+            # Receive video frame or audio data, either as a binary message
+            # (opcode byte + raw payload) or as JSON with a base64 payload
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
             
-            if data["type"] == "video_frame":
-                # Process video frame for body language
-                frame_data = base64.b64decode(data["frame"])
-                body_language_data = await body_language_processor.process_frame(frame_data)
-                
-                if body_language_data["gestures"]:
-                    # Translate to text
-                    translation = await ai_translator.body_language_to_text(
-                        body_language_data,
-                        context=data.get("context")
-                    )
-                    
-                    # Send translation back
-                    await websocket_manager.send_personal_message({
-                        "type": "translation",
-                        "text": translation["text"],
-                        "confidence": translation["confidence"],
-                        "timestamp": datetime.now().isoformat()
-                    }, websocket)
+            if message.get("bytes") is not None:
+                # An empty message has no opcode; ignore it rather than end the session
+                if not message["bytes"]:
+                    continue
+                op, payload = message["bytes"][0], message["bytes"][1:]
+                if op == FRAME_MSGPACK_OP:
+                    frame = REALTIME_FRAME_DECODER.decode(payload)
+                    context = frame.context or context
+                    op, payload = FRAME_OP, frame.frame_data
+            else:
+                data = JSON_DECODER.decode(message["text"])
+                context = data.get("context", context)
+                if data["type"] == "video_frame":
+                    op, payload = FRAME_OP, a2b_base64(data["frame"])
+                elif data["type"] == "audio_chunk":
+                    op, payload = AUDIO_OP, a2b_base64(data["audio"])
+                else:
+                    continue
+            
+            if op == FRAME_OP:
+                websocket_manager.put_latest(websocket, frames, (payload, context))
                     
-            elif data["type"] == "audio_chunk":
+            elif op == AUDIO_OP:
                 # Process audio chunk
-                audio_data = base64.b64decode(data["audio"])
-                transcription = await audio_processor.speech_to_text_realtime(audio_data)
+                transcription = await audio_processor.speech_to_text_realtime(payload)
                 
                 if transcription["text"]:
                     # Generate body language instructions
                     body_instructions = await ai_translator.text_to_body_language(
                         transcription["text"],
-                        context=data.get("context")
+                        context=context
                     )
                     
                     # Send instructions back
@@ -283,8 +480,11 @@ async def websocket_realtime_translation(websocket: WebSocket):
                         "type": "body_instructions",
                         "text": transcription["text"],
                         "instructions": body_instructions,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": now_iso()
                     }, websocket)
+            
+            else:
+                await websocket_manager.send_error_message(websocket, f"Unknown opcode 0x{op:02x}", "unknown_opcode")
                     
     except WebSocketDisconnect:
         websocket_manager.disconnect(websocket)
@@ -294,6 +494,8 @@ async def websocket_realtime_translation(websocket: WebSocket):
             "type": "error",
             "message": str(e)
         }, websocket)
+    finally:
+        frame_consumer.cancel()
 
 @app.get("/sessions/{session_id}")
 async def get_translation_session(session_id: str):
@@ -304,7 +506,7 @@ async def get_translation_session(session_id: str):
         session = await db_manager.get_translation_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        return session
+        return ORJSONResponse(session)
     except Exception as e:
         logger.error(f"Error retrieving session: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -316,7 +518,11 @@ async def get_recent_sessions(limit: int = 10):
     """
     try:
         sessions = await db_manager.get_recent_sessions(limit)
-        return {"sessions": sessions}
+        # Encoded in chunks as the body is sent; limit is caller-controlled
+        return StreamingResponse(
+            stream_json_array(b'{"sessions":', sessions, b"}"),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error(f"Error retrieving sessions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -328,14 +534,14 @@ async def submit_feedback(session_id: str, rating: int, comments: str = None):
     """
     try:
         await db_manager.store_feedback(session_id, rating, comments)
-        return {"message": "Feedback submitted successfully"}
+        return ORJSONResponse({"message": "Feedback submitted successfully"})
     except Exception as e:
         logger.error(f"Error submitting feedback: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # ASL Processing Endpoints
 @app.post("/asl/text-to-animation")
-async def text_to_asl_animation(text: str, duration: float = 3.0):
+async def text_to_asl_animation(background_tasks: BackgroundTasks, text: str, duration: float = 3.0):
     """
     Convert text to ASL animation with 3D avatar
     """
@@ -343,32 +549,37 @@ async def text_to_asl_animation(text: str, duration: float = 3.0):
         logger.info(f"Processing ASL animation for text: {text}")
         
         # Process text to ASL animation
-        animation = asl_processor.process_text_to_asl(text, duration)
+        animation = await asyncio.to_thread(asl_processor.process_text_to_asl, text, duration)
         
         # Generate 3D avatar animation
-        avatar_data = avatar_engine.generate_threejs_scene(animation)
+        avatar_data = await asyncio.to_thread(avatar_engine.generate_threejs_scene, animation)
         
-        # Store in database
-        session_id = await db_manager.store_translation_session(
+        # Store in database once the response has been sent
+        session_id = str(uuid.uuid4())
+        background_tasks.add_task(
+            db_manager.queue_translation_session,
+            session_id=session_id,
             input_type="text",
             output_type="asl_animation",
             input_data={"text": text},
             output_data=avatar_data
         )
         
-        return {
+        # Returned directly so orjson writes the animation track arrays without
+        # converting them to lists first
+        return ORJSONResponse(content={
             "session_id": session_id,
             "original_text": text,
             "asl_gloss": animation.gloss.gloss_sequence,
             "animation_data": avatar_data,
             "metadata": {
-                "duration": animation.duration,
+                "duration": animation.total_duration,
                 "fps": animation.fps,
-                "total_frames": len(animation.pose_sequence),
+                "total_frames": len(animation.frames),
                 "confidence": animation.gloss.confidence
             },
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
         
     except Exception as e:
         logger.error(f"Error in text to ASL animation: {str(e)}")
@@ -392,95 +603,132 @@ async def gloss_to_asl_animation(gloss_sequence: List[str], duration: float = 3.
         )
         
         # Generate pose animation
-        animation = asl_processor.generate_pose_from_gloss(gloss, duration)
+        animation = await asyncio.to_thread(asl_processor.generate_pose_from_gloss, gloss, duration)
         
         # Generate 3D avatar animation
-        avatar_data = avatar_engine.generate_threejs_scene(animation)
+        avatar_data = await asyncio.to_thread(avatar_engine.generate_threejs_scene, animation)
         
-        return {
+        return ORJSONResponse(content={
             "gloss_sequence": gloss_sequence,
             "animation_data": avatar_data,
             "metadata": {
-                "duration": animation.duration,
+                "duration": animation.total_duration,
                 "fps": animation.fps,
-                "total_frames": len(animation.pose_sequence)
+                "total_frames": len(animation.frames)
             },
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
         
     except Exception as e:
         logger.error(f"Error in gloss to ASL animation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Serialized bodies and ETags of static responses, built once per process
+_static_responses: Dict[str, Tuple[bytes, str]] = {}
+
+def _asl_vocabulary_payload() -> Dict[str, Any]:
+    return {
+        "vocabulary": asl_processor.asl_gloss_vocab,
+        "total_words": len(asl_processor.asl_gloss_vocab),
+        "timestamp": now_iso()
+    }
+
+def _wlasl_vocabulary_payload() -> Dict[str, Any]:
+    return {
+        "success": True,
+        "vocabulary_info": wlasl_integration.get_comprehensive_vocabulary(),
+        "timestamp": now_iso()
+    }
+
+def precomputed_json(name: str, build: Callable[[], Dict[str, Any]]) -> Tuple[bytes, str]:
+    """Serialize a response that does not change after startup, once"""
+    if name not in _static_responses:
+        body = orjson_dumps(build())
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        _static_responses[name] = (body, etag)
+    return _static_responses[name]
+
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """Return the prebuilt body, or 304 if the client already holds this version"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.get("/asl/vocabulary")
-async def get_asl_vocabulary():
+async def get_asl_vocabulary(request: Request):
     """
     Get available ASL vocabulary
     """
     try:
-        return {
-            "vocabulary": asl_processor.asl_gloss_vocab,
-            "total_words": len(asl_processor.asl_gloss_vocab),
-            "timestamp": datetime.now().isoformat()
-        }
+        body, etag = precomputed_json("asl_vocabulary", _asl_vocabulary_payload)
+        return etag_response(request, body, etag)
     except Exception as e:
         logger.error(f"Error getting ASL vocabulary: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/asl/wlasl-vocabulary")
-async def get_wlasl_vocabulary():
+async def get_wlasl_vocabulary(request: Request):
     """Get comprehensive WLASL vocabulary"""
     try:
-        vocab_info = wlasl_integration.get_comprehensive_vocabulary()
-        return {
-            "success": True,
-            "vocabulary_info": vocab_info,
-            "timestamp": datetime.now().isoformat()
-        }
+        body, etag = precomputed_json("wlasl_vocabulary", _wlasl_vocabulary_payload)
+        return etag_response(request, body, etag)
     except Exception as e:
         logger.error(f"Error getting WLASL vocabulary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _generate_synthetic_pose_landmarks(n_frames: int) -> List[List[Dict[str, float]]]:
+    """Generate synthetic pose landmarks for demonstration, one list per frame"""
+    rng = np.random.default_rng()
+    # 33 MediaPipe Pose landmarks per frame, drawn for every frame at once
+    xyz = rng.uniform(-1, 1, (n_frames, 33, 3)).tolist()
+    confidence = rng.uniform(0.7, 1.0, (n_frames, 33)).tolist()
+    return [
+        [{"x": x, "y": y, "z": z, "confidence": c} for (x, y, z), c in zip(points, scores)]
+        for points, scores in zip(xyz, confidence)
+    ]
+
 @app.post("/asl/text-to-wlasl-animation")
-async def text_to_wlasl_animation(request: dict):
+async def text_to_wlasl_animation(request: SignAnimationRequest, background_tasks: BackgroundTasks):
     """Convert text to ASL animation using WLASL dataset"""
     try:
-        text = request.get("text", "")
-        duration = request.get("duration", 3.0)
-        
-        if not text:
-            raise HTTPException(status_code=400, detail="Text is required")
+        text = request.text
+        duration = request.duration
         
         # Use WLASL integration for advanced text-to-gloss conversion
-        gloss_result = wlasl_integration.text_to_asl_gloss_advanced(text)
+        gloss_result = await asyncio.to_thread(wlasl_integration.text_to_asl_gloss_advanced, text)
         
         # Create synthetic animation data for demonstration
+        total_frames = int(duration * 30)
         animation_data = {
-            "frames": [],
+            "frames": [None] * total_frames,
             "duration": duration,
             "fps": 30,
-            "total_frames": int(duration * 30)
+            "total_frames": total_frames
         }
         
         # Generate synthetic frames
-        for i in range(animation_data["total_frames"]):
-            frame = {
+        pose_landmarks = _generate_synthetic_pose_landmarks(total_frames)
+        for i in range(total_frames):
+            animation_data["frames"][i] = {
                 "frame_id": i,
                 "timestamp": i / 30.0,
-                "pose_landmarks": self._generate_synthetic_pose_landmarks(),
+                "pose_landmarks": pose_landmarks[i],
                 "confidence": 0.8
             }
-            animation_data["frames"].append(frame)
         
-        # Store in database
-        session_id = await db_manager.store_translation_session(
+        # Store in database once the response has been sent
+        session_id = str(uuid.uuid4())
+        background_tasks.add_task(
+            db_manager.queue_translation_session,
+            session_id=session_id,
             input_type="text",
             output_type="wlasl_animation",
             input_data={"text": text},
             output_data=animation_data
         )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "session_id": session_id,
             "original_text": text,
@@ -494,22 +742,9 @@ async def text_to_wlasl_animation(request: dict):
                 "total_frames": animation_data["total_frames"],
                 "confidence": gloss_result.get("confidence", 0.5)
             },
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
 
-    def _generate_synthetic_pose_landmarks(self):
-        """Generate synthetic pose landmarks for demonstration"""
-        import random
-        landmarks = []
-        for i in range(33):  # MediaPipe Pose landmarks
-            landmarks.append({
-                "x": random.uniform(-1, 1),
-                "y": random.uniform(-1, 1),
-                "z": random.uniform(-1, 1),
-                "confidence": random.uniform(0.7, 1.0)
-            })
-        return landmarks
-        
     except Exception as e:
         logger.error(f"Error in text-to-WLASL animation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -519,7 +754,7 @@ async def get_wlasl_stats():
     """Get WLASL dataset statistics"""
     try:
         vocab_info = wlasl_integration.get_comprehensive_vocabulary()
-        return {
+        return ORJSONResponse({
             "success": True,
             "dataset_stats": {
                 "total_words": vocab_info["total_words"],
@@ -528,8 +763,8 @@ async def get_wlasl_stats():
                 "unique_videos": vocab_info["dataset_info"]["unique_videos"],
                 "coverage_stats": vocab_info["coverage_stats"]
             },
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error getting WLASL stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -539,11 +774,11 @@ async def get_how2sign_info():
     """Get How2Sign dataset information"""
     try:
         dataset_info = how2sign_integration.get_dataset_info()
-        return {
+        return ORJSONResponse({
             "success": True,
             "info": dataset_info,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error getting How2Sign info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -560,19 +795,19 @@ async def get_how2sign_animation(request: dict):
         if not input_text:
             raise HTTPException(status_code=400, detail="Text or sign_gloss is required")
         
-        animation_data = how2sign_integration.get_professional_animation(input_text)
+        animation_data = await asyncio.to_thread(how2sign_integration.get_professional_animation, input_text)
         if animation_data:
-            return {
+            return ORJSONResponse({
                 "success": True,
                 "animation": animation_data,
-                "timestamp": datetime.now().isoformat()
-            }
+                "timestamp": now_iso()
+            })
         else:
-            return {
+            return ORJSONResponse({
                 "success": False,
                 "message": "No animation found for this text",
-                "timestamp": datetime.now().isoformat()
-            }
+                "timestamp": now_iso()
+            })
     except Exception as e:
         logger.error(f"Error getting How2Sign animation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -594,14 +829,14 @@ async def export_asl_animation(session_id: str, format: str = "json"):
         animation_data = session["output_data"]
         
         if format == "json":
-            return JSONResponse(content=animation_data)
+            return ORJSONResponse(content=animation_data)
         elif format == "threejs":
             # Return Three.js compatible format
-            return {
+            return ORJSONResponse({
                 "type": "threejs_scene",
                 "data": animation_data,
-                "timestamp": datetime.now().isoformat()
-            }
+                "timestamp": now_iso()
+            })
         else:
             raise HTTPException(status_code=400, detail="Unsupported format")
             
@@ -610,66 +845,84 @@ async def export_asl_animation(session_id: str, format: str = "json"):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.websocket("/ws/asl-realtime")
-async def websocket_asl_realtime(websocket: WebSocket):
+async def websocket_asl_realtime(websocket: WebSocket, encoding: str = "json"):
     """
     WebSocket endpoint for real-time ASL animation
+    
+    Connect with ?encoding=msgpack to receive animations as binary msgpack
+    frames; numpy arrays in the animation tracks are packed as
+    {"__nd__": true, "shape", "dtype", "data"} with the raw buffer in data.
     """
     await websocket_manager.connect(websocket)
+    if encoding == "msgpack" and not MSGPACK_AVAILABLE:
+        logger.warning("msgpack not installed, sending ASL animations as JSON")
+    if encoding == "msgpack" and MSGPACK_AVAILABLE:
+        send = websocket_manager.send_packed_message
+    else:
+        send = websocket_manager.send_personal_message
+    
+    async def animate(data: Dict[str, Any]):
+        if data["type"] == "text":
+            text = data["text"]
+            duration = data.get("duration", 3.0)
+            
+            # Process text to ASL animation
+            animation = await asyncio.to_thread(asl_processor.process_text_to_asl, text, duration)
+            avatar_data = await asyncio.to_thread(avatar_engine.generate_threejs_scene, animation)
+            
+            # Send animation data back
+            await send({
+                "type": "asl_animation",
+                "text": text,
+                "gloss": animation.gloss.gloss_sequence,
+                "animation_data": avatar_data,
+                "timestamp": now_iso()
+            }, websocket)
+            
+        elif data["type"] == "gloss":
+            gloss_sequence = data["gloss_sequence"]
+            duration = data.get("duration", 3.0)
+            
+            # Create ASL gloss object
+            from services.asl_processor import ASLGloss
+            gloss = ASLGloss(
+                original_text=" ".join(gloss_sequence),
+                gloss_sequence=gloss_sequence,
+                confidence=0.9,
+                metadata={"processing_method": "websocket_gloss"}
+            )
+            
+            # Generate animation
+            animation = await asyncio.to_thread(asl_processor.generate_pose_from_gloss, gloss, duration)
+            avatar_data = await asyncio.to_thread(avatar_engine.generate_threejs_scene, animation)
+            
+            # Send animation data back
+            await send({
+                "type": "asl_animation",
+                "gloss_sequence": gloss_sequence,
+                "animation_data": avatar_data,
+                "timestamp": now_iso()
+            }, websocket)
+    
+    # Requests that arrive while one is being animated are superseded by the newest
+    requests = asyncio.Queue(maxsize=1)
+    consumer = asyncio.create_task(websocket_manager.consume_latest(websocket, requests, animate))
     try:
         while True:
             # Receive text for real-time ASL conversion
-            data = await websocket.receive_json()
-            
-            if data["type"] == "text":
-                text = data["text"]
-                duration = data.get("duration", 3.0)
-                
-                # Process text to ASL animation
-                animation = asl_processor.process_text_to_asl(text, duration)
-                avatar_data = avatar_engine.generate_threejs_scene(animation)
-                
-                # Send animation data back
-                await websocket_manager.send_personal_message({
-                    "type": "asl_animation",
-                    "text": text,
-                    "gloss": animation.gloss.gloss_sequence,
-                    "animation_data": avatar_data,
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
-                
-            elif data["type"] == "gloss":
-                gloss_sequence = data["gloss_sequence"]
-                duration = data.get("duration", 3.0)
-                
-                # Create ASL gloss object
-                from services.asl_processor import ASLGloss
-                gloss = ASLGloss(
-                    original_text=" ".join(gloss_sequence),
-                    gloss_sequence=gloss_sequence,
-                    confidence=0.9,
-                    metadata={"processing_method": "websocket_gloss"}
-                )
-                
-                # Generate animation
-                animation = asl_processor.generate_pose_from_gloss(gloss, duration)
-                avatar_data = avatar_engine.generate_threejs_scene(animation)
-                
-                # Send animation data back
-                await websocket_manager.send_personal_message({
-                    "type": "asl_animation",
-                    "gloss_sequence": gloss_sequence,
-                    "animation_data": avatar_data,
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
+            data = JSON_DECODER.decode(await websocket.receive_text())
+            websocket_manager.put_latest(websocket, requests, (data,))
                 
     except WebSocketDisconnect:
         websocket_manager.disconnect(websocket)
     except Exception as e:
         logger.error(f"ASL WebSocket error: {str(e)}")
-        await websocket_manager.send_personal_message({
+        await send({
             "type": "error",
             "message": str(e)
         }, websocket)
+    finally:
+        consumer.cancel()
 
 # SMPL-X Avatar Endpoints
 @app.post("/avatar/smplx/create")
@@ -681,11 +934,11 @@ async def create_smplx_avatar(request: dict):
         
         avatar_id = smplx_avatar_engine.create_avatar(gender, height)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "avatar_id": avatar_id,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error creating SMPL-X avatar: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -699,7 +952,7 @@ async def get_smplx_animation(request: dict):
         duration = request.get("duration", 3.0)
         
         if gesture_type == "swim":
-            animation = smplx_avatar_engine.generate_swimming_animation(avatar_id, duration)
+            animation = await asyncio.to_thread(smplx_avatar_engine.generate_swimming_animation, avatar_id, duration)
         else:
             # Generic pose animation
             pose_data = {
@@ -708,35 +961,43 @@ async def get_smplx_animation(request: dict):
                 "right_hand_pose": request.get("right_hand_pose", []),
                 "face_expression": request.get("face_expression", {})
             }
-            animation = smplx_avatar_engine.apply_pose_animation(avatar_id, pose_data)
+            animation = await asyncio.to_thread(smplx_avatar_engine.apply_pose_animation, avatar_id, pose_data)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "animation": animation,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error getting SMPL-X animation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # MoveNet Endpoints
+def decode_array(data_b64: str, shape: List[int], dtype: str) -> np.ndarray:
+    """
+    Reinterpret a base64-encoded buffer as a read-only array of the given
+    shape and dtype, without building Python objects per element
+    """
+    return np.frombuffer(a2b_base64(data_b64), dtype=np.dtype(dtype)).reshape(shape)
+
 @app.post("/pose/movenet/process")
 async def process_movenet_pose(request: dict):
     """Process frame with MoveNet"""
     try:
-        import numpy as np
-        
-        # Convert frame data to numpy array
-        frame_data = request.get("frame_data", [])
-        frame = np.array(frame_data)
+        # Prefer a raw buffer; a nested list of pixels is still accepted
+        if "frame_b64" in request:
+            frame = decode_array(request["frame_b64"], request["shape"], request.get("dtype", "uint8"))
+        else:
+            frame = np.array(request.get("frame_data", []))
         
-        result = movenet_processor.process_frame(frame)
+        async with GPU_SEMAPHORE:
+            result = await asyncio.to_thread(movenet_processor.process_frame, frame)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "result": result,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error processing MoveNet pose: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -747,11 +1008,7 @@ async def get_movenet_stats():
     try:
         stats = movenet_processor.get_performance_stats()
         
-        return {
-            "success": True,
-            "stats": stats,
-            "timestamp": datetime.now().isoformat()
-        }
+        return stats_response(stats)
     except Exception as e:
         logger.error(f"Error getting MoveNet stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -761,19 +1018,22 @@ async def get_movenet_stats():
 async def process_onnx_inference(request: dict):
     """Process inference with ONNX/Triton"""
     try:
-        import numpy as np
-        
+        # Each input is either {"b64", "shape", "dtype"} or a nested list
         input_data = {}
         for key, value in request.get("input_data", {}).items():
-            input_data[key] = np.array(value)
+            if isinstance(value, dict):
+                input_data[key] = decode_array(value["b64"], value["shape"], value.get("dtype", "float32"))
+            else:
+                input_data[key] = np.array(value)
         
-        result = await onnx_inference_server.infer(input_data)
+        async with GPU_SEMAPHORE:
+            result = await onnx_inference_server.infer(input_data)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "result": result,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error processing ONNX inference: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -784,30 +1044,27 @@ async def get_onnx_stats():
     try:
         stats = onnx_inference_server.get_performance_stats()
         
-        return {
-            "success": True,
-            "stats": stats,
-            "timestamp": datetime.now().isoformat()
-        }
+        return stats_response(stats)
     except Exception as e:
         logger.error(f"Error getting ONNX stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # SiGML Synthesis Endpoints
 @app.post("/sign/sigml/generate")
-async def generate_sigml_sign(request: dict):
+async def generate_sigml_sign(request: SignAnimationRequest):
     """Generate SiGML sign animation"""
     try:
-        text = request.get("text", "")
-        duration = request.get("duration", 3.0)
+        text = request.text
+        duration = request.duration
         
-        animation = sigml_synthesis.generate_sign_animation(text, duration)
+        async with GPU_SEMAPHORE:
+            animation = await asyncio.to_thread(sigml_synthesis.generate_sign_animation, text, duration)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "animation": animation,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error generating SiGML sign: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -818,13 +1075,13 @@ async def export_to_jasigning(request: dict):
     try:
         animation_data = request.get("animation", {})
         
-        jasigning_data = sigml_synthesis.export_to_jasigning(animation_data)
+        jasigning_data = await asyncio.to_thread(sigml_synthesis.export_to_jasigning, animation_data)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "jasigning": jasigning_data,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now_iso()
+        })
     except Exception as e:
         logger.error(f"Error exporting to JASigning: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -835,31 +1092,43 @@ async def get_sigml_stats():
     try:
         stats = sigml_synthesis.get_dictionary_stats()
         
-        return {
-            "success": True,
-            "stats": stats,
-            "timestamp": datetime.now().isoformat()
-        }
+        return stats_response(stats)
     except Exception as e:
         logger.error(f"Error getting SiGML stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # WebRTC Endpoints
+@cached_with_ttl(0.25)
+def _webrtc_status_body() -> bytes:
+    # Status is polled frequently; rebuild the body at most every 250 ms
+    return stats_body(webrtc_manager.get_connection_stats())
+
 @app.get("/webrtc/status")
 async def get_webrtc_status():
     """Get WebRTC connection status"""
     try:
-        stats = webrtc_manager.get_connection_stats()
-        
-        return {
-            "success": True,
-            "stats": stats,
-            "timestamp": datetime.now().isoformat()
-        }
+        return Response(content=_webrtc_status_body(), media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting WebRTC status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # uvloop is not available on Windows; fall back to the default asyncio loop there
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    if os.getenv("DEV") == "1":
+        # Auto-reload runs a single worker under a file watcher
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop=loop, http="httptools")
+    else:
+        # Each worker is a separate process that loads its own models
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop=loop,
+            http="httptools",
+            log_level="warning",
+            access_log=False
+        )
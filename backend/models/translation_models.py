@@ -1,12 +1,16 @@
 """
-Pydantic models for body language translation API
+Pydantic models for body language translation API, and msgspec structs for
+data that is only ever built inside the server
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from utils import clock, sysmetrics
+
 class TranslationType(str, Enum):
     BODY_TO_TEXT = "body_to_text"
     TEXT_TO_BODY = "text_to_body"
@@ -19,28 +23,57 @@ class GestureType(str, Enum):
     BODY = "body"
     POSE = "pose"
 
+class TrustedModel(BaseModel):
+    """Base for API models that are also built from server-generated data"""
+
+    @classmethod
+    def trusted(cls, **data):
+        """Build without validation, for data the server produced itself"""
+        return cls.model_construct(**data)
+
+    def to_json(self, exclude_none: bool = True) -> bytes:
+        """Serialize to JSON bytes, by default leaving out fields that are None"""
+        return self.model_dump_json(exclude_none=exclude_none).encode()
+
 class TranslationRequest(BaseModel):
     text: str = Field(..., description="Text to be translated to body language")
     context: Optional[str] = Field(None, description="Additional context for better translation")
     language: Optional[str] = Field("en", description="Target language for translation")
     emotion: Optional[str] = Field(None, description="Desired emotion to convey")
 
-class TranslationResponse(BaseModel):
+class SignAnimationRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=500, description="Text to convert to a sign animation")
+    duration: float = Field(3.0, gt=0, le=30, description="Animation duration in seconds")
+
+class TranslationResponse(TrustedModel):
+    # Instances are never mutated after construction
+    model_config = ConfigDict(frozen=True)
+
     session_id: str = Field(..., description="Unique session identifier")
     translated_text: str = Field(..., description="Translated text from body language")
     confidence: float = Field(..., description="Confidence score of translation (0-1)")
     timestamp: str = Field(..., description="Translation timestamp")
     detected_gestures: Optional[List[str]] = Field(None, description="List of detected gestures")
 
-class BodyLanguageData(BaseModel):
-    gestures: List[Dict[str, Any]] = Field(..., description="Detected gestures and their data")
-    pose_landmarks: Optional[List[Dict[str, float]]] = Field(None, description="Body pose landmarks")
-    hand_landmarks: Optional[List[Dict[str, float]]] = Field(None, description="Hand landmarks")
-    face_landmarks: Optional[List[Dict[str, float]]] = Field(None, description="Facial landmarks")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    confidence_scores: Dict[str, float] = Field(default_factory=dict)
+class GestureRecord(msgspec.Struct, kw_only=True):
+    type: str  # Gesture name, e.g. "wave" or "hand_open"
+    confidence: float = 0.0
+    x: Optional[float] = None  # Gesture centre in frame pixels
+    y: Optional[float] = None
+    description: Optional[str] = None
+
+class BodyLanguageData(msgspec.Struct, kw_only=True):
+    gestures: List[GestureRecord]  # Detected gestures
+    pose_landmarks: Optional[List[Dict[str, float]]] = None  # Body pose landmarks
+    hand_landmarks: Optional[List[Dict[str, float]]] = None  # Hand landmarks
+    face_landmarks: Optional[List[Dict[str, float]]] = None  # Facial landmarks
+    timestamp: datetime = msgspec.field(default_factory=clock.now)
+    confidence_scores: Dict[str, float] = msgspec.field(default_factory=dict)
+
+class BodyLanguageInstruction(TrustedModel):
+    # Store gesture_type as its plain string so serializing skips the enum
+    model_config = ConfigDict(use_enum_values=True)
 
-class BodyLanguageInstruction(BaseModel):
     gesture_type: GestureType = Field(..., description="Type of gesture")
     description: str = Field(..., description="Human-readable description of the gesture")
     coordinates: Optional[Dict[str, Any]] = Field(None, description="Specific coordinates or positions")
@@ -48,12 +81,26 @@ class BodyLanguageInstruction(BaseModel):
     intensity: Optional[float] = Field(None, description="Gesture intensity (0-1)")
     sequence_order: Optional[int] = Field(None, description="Order in gesture sequence")
 
-class AudioTranscription(BaseModel):
+class AudioFeatureSet(BaseModel):
+    duration: Optional[float] = None
+    rms_energy: Optional[float] = None
+    peak_amplitude: Optional[float] = None
+    zero_crossing_rate: Optional[float] = None
+    spectral_centroid: Optional[float] = None
+    spectral_bandwidth: Optional[float] = None
+    spectral_rolloff: Optional[float] = None
+    mfcc_mean: Optional[List[float]] = None
+    mfcc_std: Optional[List[float]] = None
+
+class AudioTranscription(TrustedModel):
+    # Instances are never mutated after construction
+    model_config = ConfigDict(frozen=True)
+
     text: str = Field(..., description="Transcribed text from audio")
     confidence: float = Field(..., description="Transcription confidence (0-1)")
     language: str = Field(..., description="Detected language")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    audio_features: Optional[Dict[str, Any]] = Field(None, description="Audio analysis features")
+    timestamp: datetime = Field(default_factory=clock.now)
+    audio_features: Optional[AudioFeatureSet] = Field(None, description="Audio analysis features")
 
 class TranslationSession(BaseModel):
     session_id: str = Field(..., description="Unique session identifier")
@@ -62,34 +109,57 @@ class TranslationSession(BaseModel):
     output_data: Dict[str, Any] = Field(..., description="Translation output data")
     confidence: float = Field(..., description="Overall confidence score")
     processing_time: float = Field(..., description="Processing time in seconds")
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=clock.now)
     user_feedback: Optional[Dict[str, Any]] = Field(None, description="User feedback on translation")
 
 class UserFeedback(BaseModel):
+    # Instances are never mutated after construction
+    model_config = ConfigDict(frozen=True)
+
     session_id: str = Field(..., description="Associated session ID")
     rating: int = Field(..., ge=1, le=5, description="User rating (1-5)")
     accuracy_rating: Optional[int] = Field(None, ge=1, le=5, description="Accuracy rating")
     speed_rating: Optional[int] = Field(None, ge=1, le=5, description="Speed rating")
     comments: Optional[str] = Field(None, description="Additional user comments")
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=clock.now)
 
-class RealTimeFrame(BaseModel):
-    frame_data: str = Field(..., description="Base64 encoded frame data")
-    frame_number: int = Field(..., description="Frame sequence number")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    context: Optional[str] = Field(None, description="Additional context")
+class RealTimeFrame(msgspec.Struct, kw_only=True):
+    # Descriptions live in msgspec.Meta, which only msgspec.json.schema() reads;
+    # decoding a frame never touches them
+    frame_data: Annotated[bytes, msgspec.Meta(description="Raw encoded frame; msgpack carries bytes without base64")]
+    frame_number: Annotated[int, msgspec.Meta(description="Frame sequence number")]
+    timestamp: Annotated[Optional[float], msgspec.Meta(description="Client capture time, seconds since the epoch")] = None
+    context: Annotated[Optional[str], msgspec.Meta(description="Additional context")] = None
 
 class WebSocketMessage(BaseModel):
     type: str = Field(..., description="Message type")
     data: Dict[str, Any] = Field(..., description="Message data")
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=clock.now)
     session_id: Optional[str] = Field(None, description="Associated session ID")
 
-class SystemHealth(BaseModel):
-    status: str = Field(..., description="System status")
-    cpu_usage: float = Field(..., description="CPU usage percentage")
-    memory_usage: float = Field(..., description="Memory usage percentage")
-    active_sessions: int = Field(..., description="Number of active sessions")
-    total_translations: int = Field(..., description="Total translations processed")
-    uptime: float = Field(..., description="System uptime in seconds")
-    timestamp: datetime = Field(default_factory=datetime.now)
+class SystemHealth(msgspec.Struct, kw_only=True, frozen=True):
+    status: str  # System status
+    cpu_usage: float  # CPU usage percentage
+    memory_usage: float  # Memory usage percentage
+    active_sessions: int  # Number of active sessions
+    total_translations: int  # Total translations processed
+    uptime: float  # System uptime in seconds
+    timestamp: datetime = msgspec.field(default_factory=clock.now)
+
+    @classmethod
+    def snapshot(cls, active_sessions: int, total_translations: int) -> "SystemHealth":
+        """Build from the background-sampled system metrics"""
+        return cls(
+            status="healthy",
+            cpu_usage=sysmetrics.cpu_usage(),
+            memory_usage=sysmetrics.memory_usage(),
+            active_sessions=active_sessions,
+            total_translations=total_translations,
+            uptime=sysmetrics.uptime()
+        )
+
+# Shared codecs, built once so each message skips encoder/decoder setup
+JSON_ENCODER = msgspec.json.Encoder()
+JSON_DECODER = msgspec.json.Decoder()
+# Decodes msgpack-encoded RealTimeFrame messages from the realtime WebSocket
+REALTIME_FRAME_DECODER = msgspec.msgpack.Decoder(RealTimeFrame)
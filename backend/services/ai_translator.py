@@ -2,30 +2,272 @@
 AI Translation Service using GPT-OSS-120B for context-aware body language translation
 """
 
-import json
+import copy
 import asyncio
+import itertools
 import logging
-from typing import Dict, List, Any, Optional
+import re
+from contextlib import aclosing
+from threading import Event, Thread
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, List, Any, Mapping, Optional, Tuple
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-import torch
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
+import numpy as np
+import orjson
+
+# torch, transformers and the serving backends are imported where the model
+# is used, so workers serving mock translations never load them
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 from models.translation_models import BodyLanguageData, BodyLanguageInstruction, GestureType
+from utils.result_cache import ResultCache, content_key, quantize
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Identical inputs (UI retries, repeated greetings) reuse earlier model output
+translation_cache = ResultCache("body_language_to_text")
+instruction_cache = ResultCache("text_to_body_language")
+enhance_cache = ResultCache("enhance_translation_with_context")
+
+# System prompts are module constants so every request starts with the same
+# token prefix, which the serving engine can cache across requests
+BODY_LANGUAGE_SYSTEM_PROMPT = "Reasoning: high\n\nYou are an expert body language interpreter and translator. Your task is to convert detected body language gestures, poses, and facial expressions into natural, contextually appropriate text.\n\nGuidelines:\n1. Interpret gestures holistically, considering context and cultural meanings\n2. Provide natural, conversational text that captures the intended message\n3. Consider emotional context and non-verbal cues\n4. Return JSON with 'text', 'confidence', and 'detected_gestures' fields\n5. Confidence should be 0.0-1.0 based on gesture clarity and context\n6. Be sensitive to accessibility needs and communication intent"
+
+INSTRUCTIONS_SYSTEM_PROMPT = """You are an expert in body language and non-verbal communication. Your task is to convert text into detailed body language instructions that can be performed to communicate the message effectively.
+
+Guidelines:
+1. Break down the message into clear, performable gestures
+2. Include facial expressions, hand gestures, body posture, and movements
+3. Consider cultural sensitivity and accessibility
+4. Provide timing and intensity guidance
+5. Return structured JSON with gesture instructions
+6. Focus on universal gestures that are widely understood"""
+
+ENHANCE_SYSTEM_PROMPT = """You are helping to improve body language translation accuracy by considering conversation context and history.
+Refine the translation to be more contextually appropriate and natural."""
+
+SYSTEM_PROMPTS = (BODY_LANGUAGE_SYSTEM_PROMPT, INSTRUCTIONS_SYSTEM_PROMPT, ENHANCE_SYSTEM_PROMPT)
+
+# Body language translations are decoded under this schema, so the reply is
+# always parseable and needs far fewer tokens than free-form text
+TRANSLATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "text": {"type": "string"},
+        "confidence": {"type": "number"},
+        "detected_gestures": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["text", "confidence", "detected_gestures"]
+}
+
+# Generation stops as soon as the model steps past the closed JSON object
+TRANSLATION_STOP_STRINGS = ["\n\n", "```", "</json>"]
+
+def body_language_key(body_language_data: Dict[str, Any], context: Optional[str] = None) -> str:
+    """Cache key for a translation; landmarks are rounded so near-identical frames match"""
+    return content_key(quantize(body_language_data), context)
+
+def text_key(text: str, context: Optional[str] = None) -> str:
+    """Cache key for text-to-body-language instructions"""
+    return content_key(text, context)
+
+def enhance_key(translation: str, context_history: List[str]) -> str:
+    """Cache key for a context enhancement; only the window sent to the model counts"""
+    return content_key(translation, context_history[-5:])
+
+def is_mock(translator: "AITranslator") -> bool:
+    """Mock outputs are drawn at random, so they are never cached"""
+    return translator.mock_mode
+
+# A lone gesture at least this confident that names a vocabulary entry is
+# translated by table lookup instead of the model
+VOCABULARY_CONFIDENCE = 0.9
+
+# Seconds a streamed reply may go without a new token before it is abandoned
+STREAM_TIMEOUT = 60.0
+
+CANONICAL_PHRASES = MappingProxyType({
+    "wave": "Hello!",
+    "handshake": "Nice to meet you.",
+    "bow": "Thank you, with respect.",
+    "nod": "Yes, I agree.",
+    "smile": "I'm happy to see you.",
+    "happy": "I'm happy.",
+    "sad": "I'm sad.",
+    "angry": "I'm angry.",
+    "surprised": "I'm surprised!",
+    "confused": "I don't understand.",
+    "excited": "I'm excited!",
+    "hungry": "I'm hungry.",
+    "thirsty": "I'm thirsty.",
+    "tired": "I'm tired.",
+    "pain": "I'm in pain.",
+    "help": "I need help, please.",
+    "yes": "Yes.",
+    "no": "No.",
+    "maybe": "Maybe.",
+    "okay": "Okay.",
+    "stop": "Please stop.",
+    "continue": "Please continue.",
+    "up": "Up.",
+    "down": "Down.",
+    "left": "To the left.",
+    "right": "To the right.",
+    "forward": "Forward.",
+    "backward": "Backward.",
+    "one": "One.",
+    "two": "Two.",
+    "three": "Three.",
+    "four": "Four.",
+    "five": "Five.",
+    "ten": "Ten.",
+    "please": "Please.",
+    "thank_you": "Thank you!",
+    "sorry": "I'm sorry.",
+    "excuse_me": "Excuse me.",
+    "goodbye": "Goodbye!",
+})
+
+# Words of a lowercased sentence, keeping contractions like "let's" whole
+_WORD_RE = re.compile(r"[a-z']+")
+
+MOCK_RESPONSES = (
+    "Hello! How are you today?",
+    "I need help, please.",
+    "Thank you very much!",
+    "I'm sorry, I don't understand.",
+    "Yes, that's correct.",
+    "No, that's not right.",
+    "Please wait a moment.",
+    "I'm feeling good today.",
+    "Can you help me?",
+    "I understand now."
+)
+
+def _mock_draws(size: int = 65536):
+    """Endless (response, confidence) pairs drawn in bulk up front"""
+    rng = np.random.default_rng()
+    texts = [MOCK_RESPONSES[i] for i in rng.integers(0, len(MOCK_RESPONSES), size=size).tolist()]
+    confidences = (0.7 + rng.random(size) * 0.2).tolist()  # 0.7-0.9 range
+    return itertools.cycle(zip(texts, confidences))
+
+_mock_translations = _mock_draws()
+
+def instructions_to_columns(instructions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Column-oriented view of body language instructions, one list or array
+    per field in sequence order, which is cheaper to serialize than a list of dicts
+    """
+    return {
+        "gesture_type": [instruction.get("gesture_type") for instruction in instructions],
+        "description": [instruction.get("description") for instruction in instructions],
+        "duration": np.array([instruction.get("duration", 0.0) for instruction in instructions], dtype=np.float64),
+        "intensity": np.array([instruction.get("intensity", 0.0) for instruction in instructions], dtype=np.float64),
+    }
+
+def _freeze_mappings(mappings: Dict[str, List[Dict[str, Any]]]) -> Mapping[str, Tuple[Mapping[str, Any], ...]]:
+    """Make a keyword -> gestures table read-only so it can be shared by every call"""
+    return MappingProxyType({
+        keyword: tuple(MappingProxyType(gesture) for gesture in gestures)
+        for keyword, gestures in mappings.items()
+    })
+
+# Comprehensive gesture mappings for common phrases and words
+GESTURE_MAPPINGS = _freeze_mappings({
+    # Basic needs and wants
+    "want": [{"gesture_type": "hand", "description": "Point to your chest with index finger, then point forward", "duration": 2.0, "intensity": 0.8}],
+    "need": [{"gesture_type": "hand", "description": "Hold both hands palms up, then bring them toward your chest", "duration": 2.5, "intensity": 0.9}],
+    "go": [{"gesture_type": "hand", "description": "Point forward with index finger, then make walking motion with fingers", "duration": 2.0, "intensity": 0.8}],
+    "come": [{"gesture_type": "hand", "description": "Wave hand toward yourself with palm facing up", "duration": 1.5, "intensity": 0.7}],
+    
+    # Places
+    "school": [{"gesture_type": "hand", "description": "Make writing motion with hand, then point to building location", "duration": 3.0, "intensity": 0.8}],
+    "home": [{"gesture_type": "hand", "description": "Point to your chest, then make roof shape with hands above head", "duration": 2.5, "intensity": 0.8}],
+    "hospital": [{"gesture_type": "hand", "description": "Make cross sign on chest, then point to building location", "duration": 3.0, "intensity": 0.9}],
+    "store": [{"gesture_type": "hand", "description": "Make money counting motion, then point to building location", "duration": 2.5, "intensity": 0.8}],
+    
+    # Actions
+    "eat": [{"gesture_type": "hand", "description": "Bring hand to mouth in eating motion", "duration": 1.5, "intensity": 0.8}],
+    "drink": [{"gesture_type": "hand", "description": "Make cup shape with hand, bring to mouth", "duration": 1.5, "intensity": 0.8}],
+    "sleep": [{"gesture_type": "hand", "description": "Place hands together under tilted head", "duration": 2.0, "intensity": 0.7}],
+    "work": [{"gesture_type": "hand", "description": "Make hammering motion with fist", "duration": 2.0, "intensity": 0.8}],
+    "swim": [{"gesture_type": "swim", "description": "Make swimming motion with both arms in alternating pattern", "duration": 3.0, "intensity": 0.8}],
+    
+    # Emotions and responses
+    "happy": [{"gesture_type": "face", "description": "Smile broadly, then point to your smile", "duration": 2.0, "intensity": 0.9}],
+    "sad": [{"gesture_type": "face", "description": "Frown, then point to your face", "duration": 2.0, "intensity": 0.8}],
+    "angry": [{"gesture_type": "face", "description": "Frown deeply, then make fist", "duration": 2.0, "intensity": 0.9}],
+    "tired": [{"gesture_type": "body", "description": "Slump shoulders, then yawn motion", "duration": 2.5, "intensity": 0.8}],
+    
+    # Communication
+    "hello": [{"gesture_type": "hand", "description": "Wave hand from side to side", "duration": 2.0, "intensity": 0.8}],
+    "goodbye": [{"gesture_type": "hand", "description": "Wave hand, then point away", "duration": 2.0, "intensity": 0.7}],
+    "thank": [{"gesture_type": "hand", "description": "Place hand over heart, then nod head", "duration": 2.0, "intensity": 0.8}],
+    "sorry": [{"gesture_type": "hand", "description": "Place hand over heart, then bow head slightly", "duration": 2.0, "intensity": 0.8}],
+    
+    # Basic responses
+    "yes": [{"gesture_type": "head", "description": "Nod head up and down", "duration": 1.0, "intensity": 0.8}],
+    "no": [{"gesture_type": "head", "description": "Shake head side to side", "duration": 1.0, "intensity": 0.8}],
+    "maybe": [{"gesture_type": "hand", "description": "Hold hand palm up, then tilt side to side", "duration": 2.0, "intensity": 0.6}],
+    "okay": [{"gesture_type": "hand", "description": "Make OK sign with thumb and index finger", "duration": 1.5, "intensity": 0.8}],
+    
+    # Urgency and needs
+    "help": [{"gesture_type": "hand", "description": "Raise hand above head, then point to yourself", "duration": 3.0, "intensity": 0.9}],
+    "stop": [{"gesture_type": "hand", "description": "Hold palm forward like traffic stop", "duration": 1.5, "intensity": 0.9}],
+    "wait": [{"gesture_type": "hand", "description": "Hold palm up, then point to watch", "duration": 2.0, "intensity": 0.7}],
+    "hurry": [{"gesture_type": "hand", "description": "Make fast circular motion with hand", "duration": 2.0, "intensity": 0.9}],
+    
+    # Questions
+    "what": [{"gesture_type": "hand", "description": "Hold hands palms up, then shrug shoulders", "duration": 2.0, "intensity": 0.8}],
+    "where": [{"gesture_type": "hand", "description": "Point to different directions with questioning look", "duration": 2.5, "intensity": 0.8}],
+    "when": [{"gesture_type": "hand", "description": "Point to watch, then hold hands palms up", "duration": 2.0, "intensity": 0.8}],
+    "why": [{"gesture_type": "hand", "description": "Point to head, then hold hands palms up", "duration": 2.0, "intensity": 0.8}],
+    
+    # Numbers
+    "one": [{"gesture_type": "hand", "description": "Hold up index finger", "duration": 1.0, "intensity": 0.8}],
+    "two": [{"gesture_type": "hand", "description": "Hold up index and middle finger", "duration": 1.0, "intensity": 0.8}],
+    "three": [{"gesture_type": "hand", "description": "Hold up three fingers", "duration": 1.0, "intensity": 0.8}],
+})
+
+class StopOnEvent:
+    """Stopping criterion that ends generation once the event is set, e.g. when a stream consumer goes away"""
+
+    def __init__(self, event: Event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.event.is_set()
+
 class AITranslator:
     def __init__(self):
         self.model = "openai/gpt-oss-120b"  # Using GPT-OSS-120B for high accuracy
         self.max_tokens = 2000
+        self.translation_max_tokens = 256  # The JSON reply is well under 200 tokens
+        self.enhance_max_tokens = 128  # A single refined sentence
         self.temperature = 0.3  # Lower temperature for more consistent translations
-        self.mock_mode = True  # Force mock mode for now
-        self.pipe = None
+        self.enhance_temperature = 0.2
+        self.mock_mode = os.getenv("MOCK_TRANSLATOR", "1") != "0"  # Mock unless explicitly disabled
+        self.model_obj = None
+        # Decoding settings per task: "instructions", "translation" and "enhance"
+        self.generation_configs = {}
+        self.sampling_params = {}
+        self.translation_tokens_fn = None
+        self.prefix_tokens = []
+        self.prefix_caches = []
+        self.llm = None
         self.tokenizer = None
+        # The offline vLLM engine and the local model are not thread-safe, so
+        # one generate call runs at a time; the batch queue already merges
+        # concurrent requests into shared calls
+        self.generate_lock = asyncio.Lock()
         
         # Body language gesture vocabulary
         self.gesture_vocabulary = {
@@ -38,30 +280,300 @@ class AITranslator:
             "common_phrases": ["please", "thank_you", "sorry", "excuse_me", "goodbye"]
         }
         
+        # One pass over the text finds every gesture keyword it contains; each
+        # keyword maps to its position in GESTURE_MAPPINGS
+        self.gesture_matcher = None
+        if ahocorasick is not None:
+            self.gesture_matcher = ahocorasick.Automaton()
+            for index, keyword in enumerate(GESTURE_MAPPINGS):
+                self.gesture_matcher.add_word(keyword, (index, keyword))
+            self.gesture_matcher.make_automaton()
+        
+        # Suggestion entries in vocabulary order, plus a matcher mapping each
+        # lowercase gesture to its position
+        self.gesture_suggestions = [
+            {"gesture": gesture, "category": category, "description": f"Common gesture for '{gesture}'"}
+            for category, gestures in self.gesture_vocabulary.items()
+            for gesture in gestures
+        ]
+        self.suggestion_matcher = None
+        if ahocorasick is not None:
+            self.suggestion_matcher = ahocorasick.Automaton()
+            for index, suggestion in enumerate(self.gesture_suggestions):
+                self.suggestion_matcher.add_word(suggestion["gesture"].lower(), index)
+            self.suggestion_matcher.make_automaton()
+        
     async def initialize(self):
         """Initialize GPT-OSS-120B model"""
+        if self.mock_mode:
+            # Mock replies never touch the model, so skip loading its weights
+            logger.info("AI Translator running in mock mode, skipping model load")
+            return
+        
         try:
+            import torch
+            
             # Check if GPU is available
             device = "cuda" if torch.cuda.is_available() else "cpu"
             logger.info(f"Using device: {device}")
             
-            # Initialize the pipeline with GPT-OSS-120B
-            self.pipe = pipeline(
-                "text-generation",
-                model=self.model,
-                torch_dtype="auto",
-                device_map="auto",
-            )
+            try:
+                from vllm import LLM, SamplingParams
+                from vllm.sampling_params import GuidedDecodingParams
+            except ImportError:
+                LLM = None
+            
+            if LLM is not None:
+                # vLLM pages the KV cache and reuses the shared system-prompt
+                # prefix across requests instead of re-running its prefill.
+                # Weights load in the checkpoint's native MXFP4; the KV cache
+                # is kept in FP8 unless the GPU lacks support for it
+                self.llm = LLM(
+                    model=self.model,
+                    enable_prefix_caching=True,
+                    gpu_memory_utilization=0.9,
+                    max_model_len=4096,
+                    kv_cache_dtype=os.getenv("KV_CACHE_DTYPE", "fp8")
+                )
+                self.tokenizer = self.llm.get_tokenizer()
+                self.sampling_params = {
+                    "instructions": SamplingParams(temperature=self.temperature, max_tokens=self.max_tokens),
+                    "translation": SamplingParams(
+                        temperature=self.temperature,
+                        max_tokens=self.translation_max_tokens,
+                        stop=TRANSLATION_STOP_STRINGS,
+                        guided_decoding=GuidedDecodingParams(json=TRANSLATION_SCHEMA)
+                    ),
+                    "enhance": SamplingParams(temperature=self.enhance_temperature, max_tokens=self.enhance_max_tokens)
+                }
+                await asyncio.to_thread(self._warm_prefix_cache)
+            else:
+                # Load GPT-OSS-120B directly, keeping the MXFP4 weights
+                # quantized (~60 GB instead of ~240 GB in BF16)
+                from transformers import AutoTokenizer, AutoModelForCausalLM, GenerationConfig
+                try:
+                    from transformers import Mxfp4Config
+                except ImportError:
+                    Mxfp4Config = None
+                try:
+                    from lmformatenforcer import JsonSchemaParser
+                    from lmformatenforcer.integrations.transformers import build_transformers_prefix_allowed_tokens_fn
+                except ImportError:
+                    JsonSchemaParser = None
+                
+                model_kwargs = {}
+                if Mxfp4Config is not None:
+                    model_kwargs["quantization_config"] = Mxfp4Config(dequantize=False)
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model, padding_side="left", use_fast=True)
+                if self.tokenizer.pad_token is None:
+                    self.tokenizer.pad_token = self.tokenizer.eos_token
+                self.model_obj = AutoModelForCausalLM.from_pretrained(
+                    self.model,
+                    torch_dtype="auto",
+                    device_map="auto",
+                    **model_kwargs
+                ).eval()
+                self.generation_configs = {
+                    "instructions": GenerationConfig(
+                        max_new_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                        do_sample=True,
+                        pad_token_id=self.tokenizer.pad_token_id
+                    ),
+                    "translation": GenerationConfig(
+                        max_new_tokens=self.translation_max_tokens,
+                        temperature=self.temperature,
+                        do_sample=True,
+                        stop_strings=TRANSLATION_STOP_STRINGS,
+                        pad_token_id=self.tokenizer.pad_token_id
+                    ),
+                    "enhance": GenerationConfig(
+                        max_new_tokens=self.enhance_max_tokens,
+                        temperature=self.enhance_temperature,
+                        do_sample=True,
+                        pad_token_id=self.tokenizer.pad_token_id
+                    )
+                }
+                if JsonSchemaParser is not None:
+                    self.translation_tokens_fn = build_transformers_prefix_allowed_tokens_fn(
+                        self.tokenizer, JsonSchemaParser(TRANSLATION_SCHEMA)
+                    )
+                await asyncio.to_thread(self._build_prefix_caches)
             
-            self.mock_mode = True  # Keep mock mode for now
-            logger.info("AI Translator initialized successfully with GPT-OSS-120B (mock mode)")
+            logger.info("AI Translator initialized successfully with GPT-OSS-120B")
             
         except Exception as e:
             logger.error(f"Failed to initialize GPT-OSS-120B: {str(e)}")
             logger.warning("Using mock implementation for demonstration.")
-            self.pipe = None
+            self.model_obj = None
+            self.llm = None
             self.mock_mode = True
 
+    def _warm_prefix_cache(self):
+        """
+        Prefill each system prompt once at startup so the first real request
+        already finds its KV blocks in vLLM's prefix cache
+        """
+        from vllm import SamplingParams
+        
+        prompts = [
+            self.tokenizer.apply_chat_template([{"role": "system", "content": prompt}], tokenize=False)
+            for prompt in SYSTEM_PROMPTS
+        ]
+        self.llm.generate(prompts, SamplingParams(max_tokens=1))
+
+    async def _generate(self, conversations: List[List[Dict[str, str]]], task: str = "instructions") -> List[str]:
+        """
+        Run a batch of chat conversations through the model with the task's
+        decoding settings and return each reply; "translation" replies are
+        constrained to TRANSLATION_SCHEMA
+        """
+        async with self.generate_lock:
+            if self.llm is not None:
+                prompts = [
+                    self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+                    for messages in conversations
+                ]
+                outputs = await asyncio.to_thread(self.llm.generate, prompts, self.sampling_params[task])
+                return [output.outputs[0].text for output in outputs]
+            
+            return await asyncio.to_thread(self._generate_local, conversations, task)
+
+    def _build_prefix_caches(self):
+        """
+        Tokenize each system prompt once and keep its KV cache, so requests
+        neither re-encode it nor, when unbatched, prefill it again
+        """
+        import torch
+        from transformers import DynamicCache
+        
+        for prompt in SYSTEM_PROMPTS:
+            prefix = self.tokenizer.apply_chat_template([{"role": "system", "content": prompt}], tokenize=False)
+            token_ids = self.tokenizer(prefix, add_special_tokens=False)["input_ids"]
+            self.prefix_tokens.append((prefix, token_ids))
+            
+            prefix_ids = torch.tensor([token_ids], device=self.model_obj.device)
+            with torch.inference_mode():
+                cache = self.model_obj(prefix_ids, past_key_values=DynamicCache(), use_cache=True).past_key_values
+            self.prefix_caches.append((prefix_ids[0], cache))
+
+    def _prefix_cache_for(self, input_ids) -> Optional[Any]:
+        """Return a copy of the cached KV for the system prompt this input starts with"""
+        import torch
+        
+        for prefix_ids, cache in self.prefix_caches:
+            if len(input_ids) > len(prefix_ids) and torch.equal(input_ids[:len(prefix_ids)], prefix_ids):
+                return copy.deepcopy(cache)
+        return None
+
+    def _encode_prompts(self, prompts: List[str]) -> Dict[str, Any]:
+        """
+        Tokenize rendered prompts in one batch call, splicing in the
+        pre-tokenized system prompt instead of encoding it again
+        """
+        prefixes = []
+        suffixes = []
+        for prompt in prompts:
+            for prefix, token_ids in self.prefix_tokens:
+                if prompt.startswith(prefix):
+                    prefixes.append(token_ids)
+                    suffixes.append(prompt[len(prefix):])
+                    break
+            else:
+                prefixes.append([])
+                suffixes.append(prompt)
+        
+        encoded = self.tokenizer(suffixes, add_special_tokens=False)["input_ids"]
+        inputs = self.tokenizer.pad({"input_ids": [prefix + suffix for prefix, suffix in zip(prefixes, encoded)]}, return_tensors="pt")
+        
+        # Pinned host memory lets the copy to the GPU run asynchronously
+        device = self.model_obj.device
+        pin = device.type == "cuda"
+        return {
+            name: (tensor.pin_memory() if pin else tensor).to(device, non_blocking=pin)
+            for name, tensor in inputs.items()
+        }
+
+    def _generate_kwargs(self, input_ids, batch_size: int, task: str) -> Dict[str, Any]:
+        """Keyword arguments for model_obj.generate"""
+        generate_kwargs = {"generation_config": self.generation_configs[task]}
+        if task == "translation":
+            # stop_strings are matched against decoded text, which needs the tokenizer
+            generate_kwargs["tokenizer"] = self.tokenizer
+            if self.translation_tokens_fn is not None:
+                generate_kwargs["prefix_allowed_tokens_fn"] = self.translation_tokens_fn
+        # A cached prefix only lines up with unpadded input, i.e. a batch of one
+        if batch_size == 1:
+            prefix_cache = self._prefix_cache_for(input_ids[0])
+            if prefix_cache is not None:
+                generate_kwargs["past_key_values"] = prefix_cache
+        return generate_kwargs
+
+    def _run_generate(self, inputs, **generate_kwargs):
+        import torch
+        
+        with torch.inference_mode():
+            return self.model_obj.generate(**inputs, **generate_kwargs)
+
+    def _run_streamed(self, errors: List[BaseException], inputs, **generate_kwargs):
+        """
+        Thread target for a streamed generate; a failure is recorded in errors
+        and ends the stream, so the consumer is not left waiting for tokens
+        """
+        try:
+            self._run_generate(inputs, **generate_kwargs)
+        except BaseException as e:
+            errors.append(e)
+            generate_kwargs["streamer"].end()
+
+    def _generate_local(self, conversations: List[List[Dict[str, str]]], task: str = "instructions") -> List[str]:
+        """Generate with the locally loaded model"""
+        prompts = [
+            self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+            for messages in conversations
+        ]
+        inputs = self._encode_prompts(prompts)
+        
+        output_ids = self._run_generate(inputs, **self._generate_kwargs(inputs["input_ids"], len(conversations), task))
+        return self.tokenizer.batch_decode(output_ids[:, inputs["input_ids"].shape[1]:], skip_special_tokens=True)
+
+    async def _generate_stream(self, messages: List[Dict[str, str]], task: str = "instructions") -> AsyncIterator[str]:
+        """
+        Yield the reply to one conversation as it is decoded; closing the
+        generator stops generation
+        """
+        if self.llm is None:
+            from transformers import AsyncTextIteratorStreamer, StoppingCriteriaList
+            
+            prompt = self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+            inputs = self._encode_prompts([prompt])
+            generate_kwargs = self._generate_kwargs(inputs["input_ids"], 1, task)
+            
+            stop = Event()
+            streamer = AsyncTextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=STREAM_TIMEOUT)
+            generate_kwargs["streamer"] = streamer
+            generate_kwargs["stopping_criteria"] = StoppingCriteriaList([StopOnEvent(stop)])
+            errors = []
+            thread = Thread(target=self._run_streamed, args=(errors, inputs), kwargs=generate_kwargs, daemon=True)
+            # Held until the generate thread exits (or STREAM_TIMEOUT passes), not
+            # just until the consumer stops reading
+            async with self.generate_lock:
+                thread.start()
+                try:
+                    async for text in streamer:
+                        yield text
+                finally:
+                    stop.set()
+                    await asyncio.to_thread(thread.join, STREAM_TIMEOUT)
+            if errors:
+                raise errors[0]
+            return
+        
+        # The offline vLLM engine only returns whole replies
+        replies = await self._generate([messages], task)
+        yield replies[0]
+
+    @translation_cache.cached(key=body_language_key, cacheable=lambda result: "error" not in result, bypass=is_mock)
     async def body_language_to_text(self, body_language_data: Dict[str, Any], context: Optional[str] = None) -> Dict[str, Any]:
         """
         Convert body language data to natural text using GPT-4
@@ -71,44 +583,20 @@ class AITranslator:
             if self.mock_mode:
                 return self._get_mock_body_language_translation(body_language_data, context)
             
-            # Prepare the prompt with body language data
-            gestures_description = self._format_gestures_for_prompt(body_language_data)
+            result = self._vocabulary_translation(body_language_data)
+            if result is not None:
+                return result
             
-            # Use GPT-OSS-120B with harmony format
-            messages = [
-                {"role": "system", "content": "Reasoning: high\n\nYou are an expert body language interpreter and translator. Your task is to convert detected body language gestures, poses, and facial expressions into natural, contextually appropriate text.\n\nGuidelines:\n1. Interpret gestures holistically, considering context and cultural meanings\n2. Provide natural, conversational text that captures the intended message\n3. Consider emotional context and non-verbal cues\n4. Return JSON with 'text', 'confidence', and 'detected_gestures' fields\n5. Confidence should be 0.0-1.0 based on gesture clarity and context\n6. Be sensitive to accessibility needs and communication intent"},
-                {"role": "user", "content": f"Body Language Data:\n{gestures_description}\n\nAdditional Context: {context or 'No additional context provided'}\n\nPlease interpret this body language and provide:\n1. The most likely intended message in natural text\n2. Confidence level (0.0-1.0)\n3. List of key gestures detected\n\nReturn as JSON format."}
-            ]
+            # Generate response using GPT-OSS-120B, stopping as soon as the
+            # streamed reply is a complete JSON object
+            reply = ""
+            async with aclosing(self._generate_stream(self._body_language_messages(body_language_data, context), task="translation")) as stream:
+                async for text in stream:
+                    reply += text
+                    if "}" in text and self._is_complete_json(reply):
+                        break
             
-            # Generate response using GPT-OSS-120B
-            outputs = self.pipe(
-                messages,
-                max_new_tokens=self.max_tokens,
-                temperature=self.temperature,
-                do_sample=True
-            )
-            
-            # Extract the generated text
-            generated_text = outputs[0]["generated_text"][-1]["content"]
-            
-            # Parse the response
-            try:
-                result = json.loads(generated_text)
-            except json.JSONDecodeError:
-                # Fallback if JSON parsing fails
-                result = {
-                    "text": generated_text,
-                    "confidence": 0.7,
-                    "detected_gestures": []
-                }
-            
-            # Ensure required fields exist
-            if "text" not in result:
-                result["text"] = "Could not interpret body language clearly"
-            if "confidence" not in result:
-                result["confidence"] = 0.5
-            if "detected_gestures" not in result:
-                result["detected_gestures"] = []
+            result = self._parse_body_language_output(reply)
                 
             logger.info(f"Body language translated to text: {result['text'][:50]}...")
             return result
@@ -122,6 +610,122 @@ class AITranslator:
                 "error": str(e)
             }
 
+    async def body_language_to_text_batch(self, items: List[Tuple[Dict[str, Any], Optional[str]]]) -> List[Dict[str, Any]]:
+        """
+        Convert a batch of (body_language_data, context) pairs to text in one model call
+        """
+        if self.mock_mode:
+            return await self._translate_batch(items)
+        
+        keys = [body_language_key(data, context) for data, context in items]
+        results = [translation_cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        if misses:
+            translated = await self._translate_batch([items[i] for i in misses])
+            for i, result in zip(misses, translated):
+                results[i] = result
+                if "error" not in result:
+                    translation_cache.set(keys[i], result)
+        
+        return results
+
+    async def _translate_batch(self, items: List[Tuple[Dict[str, Any], Optional[str]]]) -> List[Dict[str, Any]]:
+        """
+        Run the model over inputs that missed the cache
+        """
+        if self.mock_mode:
+            return [self._get_mock_body_language_translation(data, context) for data, context in items]
+        
+        results = [self._vocabulary_translation(data) for data, _ in items]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        try:
+            replies = await self._generate([self._body_language_messages(*items[i]) for i in pending], task="translation")
+            for i, reply in zip(pending, replies):
+                results[i] = self._parse_body_language_output(reply)
+            logger.info(f"Translated batch of {len(pending)} body language inputs")
+            
+        except Exception as e:
+            logger.error(f"Error in batched body language to text translation: {str(e)}")
+            for i in pending:
+                results[i] = {
+                    "text": "Translation error occurred",
+                    "confidence": 0.0,
+                    "detected_gestures": [],
+                    "error": str(e)
+                }
+        
+        return results
+
+    def _vocabulary_translation(self, body_language_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Translation of a single confident vocabulary gesture by table lookup,
+        or None when the input needs the model
+        """
+        gestures = body_language_data.get("gestures") or ()
+        if len(gestures) != 1:
+            return None
+        
+        gesture = gestures[0]
+        gesture_type = gesture.type
+        confidence = gesture.confidence
+        if confidence < VOCABULARY_CONFIDENCE or gesture_type not in CANONICAL_PHRASES:
+            return None
+        
+        return {
+            "text": CANONICAL_PHRASES[gesture_type],
+            "confidence": confidence,
+            "detected_gestures": [gesture_type]
+        }
+
+    def _body_language_messages(self, body_language_data: Dict[str, Any], context: Optional[str]) -> List[Dict[str, str]]:
+        """
+        Build the harmony-format chat messages for a body language translation
+        """
+        gestures_description = self._format_gestures_for_prompt(body_language_data)
+        
+        return [
+            {"role": "system", "content": BODY_LANGUAGE_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Body Language Data:\n{gestures_description}\n\nAdditional Context: {context or 'No additional context provided'}\n\nPlease interpret this body language and provide:\n1. The most likely intended message in natural text\n2. Confidence level (0.0-1.0)\n3. List of key gestures detected\n\nReturn as JSON format."}
+        ]
+
+    def _is_complete_json(self, text: str) -> bool:
+        """Whether text already parses as a whole JSON value"""
+        try:
+            orjson.loads(text)
+            return True
+        except orjson.JSONDecodeError:
+            return False
+
+    def _parse_body_language_output(self, generated_text: str) -> Dict[str, Any]:
+        """
+        Parse the model's JSON answer, filling in any missing fields; only
+        needed when no constrained decoder is installed
+        """
+        try:
+            result = orjson.loads(generated_text)
+        except orjson.JSONDecodeError:
+            # Fallback if JSON parsing fails
+            result = {
+                "text": generated_text,
+                "confidence": 0.7,
+                "detected_gestures": []
+            }
+        
+        # Ensure required fields exist
+        if "text" not in result:
+            result["text"] = "Could not interpret body language clearly"
+        if "confidence" not in result:
+            result["confidence"] = 0.5
+        if "detected_gestures" not in result:
+            result["detected_gestures"] = []
+        
+        return result
+
+    @instruction_cache.cached(key=text_key, cacheable=lambda result: not any("error" in i for i in result), bypass=is_mock)
     async def text_to_body_language(self, text: str, context: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Convert text to body language instructions using GPT-4
@@ -131,18 +735,6 @@ class AITranslator:
             if self.mock_mode:
                 return self._get_mock_body_language_instructions(text, context)
             
-            system_prompt = """
-            You are an expert in body language and non-verbal communication. Your task is to convert text into detailed body language instructions that can be performed to communicate the message effectively.
-            
-            Guidelines:
-            1. Break down the message into clear, performable gestures
-            2. Include facial expressions, hand gestures, body posture, and movements
-            3. Consider cultural sensitivity and accessibility
-            4. Provide timing and intensity guidance
-            5. Return structured JSON with gesture instructions
-            6. Focus on universal gestures that are widely understood
-            """
-            
             user_prompt = f"""
             Text to translate: "{text}"
             Context: {context or "General communication"}
@@ -157,18 +749,13 @@ class AITranslator:
             Return as JSON array of gesture instructions.
             """
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
+            replies = await self._generate([[
+                {"role": "system", "content": INSTRUCTIONS_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ]], task="instructions")
             
             # Parse the response
-            instructions = json.loads(response.choices[0].message.content)
+            instructions = orjson.loads(replies[0])
             
             # Ensure it's a list
             if not isinstance(instructions, list):
@@ -207,33 +794,7 @@ class AITranslator:
         Enhance translation accuracy using conversation context
         """
         try:
-            system_prompt = """
-            You are helping to improve body language translation accuracy by considering conversation context and history.
-            Refine the translation to be more contextually appropriate and natural.
-            """
-            
-            context_text = "\n".join(context_history[-5:])  # Last 5 messages for context
-            
-            user_prompt = f"""
-            Current translation: "{translation}"
-            Conversation context:
-            {context_text}
-            
-            Please refine this translation to be more contextually appropriate and natural.
-            Return only the improved translation text.
-            """
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=500,
-                temperature=0.2
-            )
-            
-            enhanced_translation = response.choices[0].message.content.strip()
+            enhanced_translation = await self._enhance_translation(translation, context_history)
             logger.info("Translation enhanced with context")
             return enhanced_translation
             
@@ -241,32 +802,57 @@ class AITranslator:
             logger.error(f"Error enhancing translation with context: {str(e)}")
             return translation  # Return original if enhancement fails
 
+    @enhance_cache.cached(key=enhance_key, bypass=is_mock)
+    async def _enhance_translation(self, translation: str, context_history: List[str]) -> str:
+        """
+        Refine a translation with the model; raises on failure so errors are never cached
+        """
+        context_text = "\n".join(context_history[-5:])  # Last 5 messages for context
+        
+        user_prompt = f"""
+        Current translation: "{translation}"
+        Conversation context:
+        {context_text}
+        
+        Please refine this translation to be more contextually appropriate and natural.
+        Return only the improved translation text.
+        """
+        
+        replies = await self._generate([[
+            {"role": "system", "content": ENHANCE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]], task="enhance")
+        
+        return replies[0].strip()
+
     def _format_gestures_for_prompt(self, body_language_data: Dict[str, Any]) -> str:
         """
         Format body language data for GPT-4 prompt
         """
+        data_get = body_language_data.get
         formatted_data = []
         
-        if "gestures" in body_language_data:
-            formatted_data.append(f"Gestures detected: {len(body_language_data['gestures'])}")
-            for gesture in body_language_data['gestures']:
-                gesture_info = f"- {gesture.get('type', 'unknown')}: {gesture.get('description', 'no description')}"
-                if 'confidence' in gesture:
-                    gesture_info += f" (confidence: {gesture['confidence']:.2f})"
-                formatted_data.append(gesture_info)
+        gestures = data_get("gestures")
+        if gestures is not None:
+            formatted_data.append(f"Gestures detected: {len(gestures)}")
+            formatted_data.extend([
+                f"- {gesture.type}: {gesture.description or 'no description'} (confidence: {gesture.confidence:.2f})"
+                for gesture in gestures
+            ])
         
-        if "pose_landmarks" in body_language_data and body_language_data["pose_landmarks"]:
-            formatted_data.append(f"Body pose landmarks: {len(body_language_data['pose_landmarks'])} points detected")
+        if pose_landmarks := data_get("pose_landmarks"):
+            formatted_data.append(f"Body pose landmarks: {len(pose_landmarks)} points detected")
         
-        if "hand_landmarks" in body_language_data and body_language_data["hand_landmarks"]:
-            formatted_data.append(f"Hand landmarks: {len(body_language_data['hand_landmarks'])} points detected")
+        if hand_landmarks := data_get("hand_landmarks"):
+            formatted_data.append(f"Hand landmarks: {len(hand_landmarks)} points detected")
         
-        if "face_landmarks" in body_language_data and body_language_data["face_landmarks"]:
-            formatted_data.append(f"Facial landmarks: {len(body_language_data['face_landmarks'])} points detected")
+        if face_landmarks := data_get("face_landmarks"):
+            formatted_data.append(f"Facial landmarks: {len(face_landmarks)} points detected")
         
-        if "confidence_scores" in body_language_data:
-            avg_confidence = sum(body_language_data["confidence_scores"].values()) / len(body_language_data["confidence_scores"])
-            formatted_data.append(f"Average detection confidence: {avg_confidence:.2f}")
+        confidence_scores = data_get("confidence_scores")
+        if confidence_scores is not None:
+            scores = confidence_scores.values()
+            formatted_data.append(f"Average detection confidence: {sum(scores) / len(scores):.2f}")
         
         return "\n".join(formatted_data) if formatted_data else "No clear body language data detected"
 
@@ -276,18 +862,17 @@ class AITranslator:
         """
         try:
             # Quick gesture suggestions based on common patterns
-            suggestions = []
-            
-            for category, gestures in self.gesture_vocabulary.items():
-                for gesture in gestures:
-                    if gesture.lower() in partial_text.lower():
-                        suggestions.append({
-                            "gesture": gesture,
-                            "category": category,
-                            "description": f"Common gesture for '{gesture}'"
-                        })
+            text_lower = partial_text.lower()
+            if self.suggestion_matcher is not None:
+                matched = sorted({index for _, index in self.suggestion_matcher.iter(text_lower)})
+            else:
+                matched = [
+                    index for index, suggestion in enumerate(self.gesture_suggestions)
+                    if suggestion["gesture"].lower() in text_lower
+                ]
+            suggestions = [dict(self.gesture_suggestions[index]) for index in matched[:5]]
             
-            return suggestions[:5]  # Return top 5 suggestions
+            return suggestions  # Top 5 suggestions
             
         except Exception as e:
             logger.error(f"Error getting gesture suggestions: {str(e)}")
@@ -297,37 +882,30 @@ class AITranslator:
         """
         Provide mock translation responses when OpenAI API is not available
         """
-        import random
-        
-        # Mock responses based on detected gestures
-        mock_responses = [
-            "Hello! How are you today?",
-            "I need help, please.",
-            "Thank you very much!",
-            "I'm sorry, I don't understand.",
-            "Yes, that's correct.",
-            "No, that's not right.",
-            "Please wait a moment.",
-            "I'm feeling good today.",
-            "Can you help me?",
-            "I understand now."
-        ]
-        
-        # Mock confidence based on data quality
-        confidence = 0.7 + (random.random() * 0.2)  # 0.7-0.9 range
+        # Mock response and confidence from the pre-drawn sequence
+        text, confidence = next(_mock_translations)
         
         # Mock detected gestures
         detected_gestures = []
         if "gestures" in body_language_data and body_language_data["gestures"]:
-            detected_gestures = [gesture.get("type", "unknown") for gesture in body_language_data["gestures"][:3]]
+            detected_gestures = [gesture.type for gesture in body_language_data["gestures"][:3]]
         
         return {
-            "text": random.choice(mock_responses),
+            "text": text,
             "confidence": confidence,
             "detected_gestures": detected_gestures,
             "mock_mode": True
         }
 
+    def _match_gesture_keywords(self, text_lower: str) -> List[str]:
+        """
+        Gesture keywords contained in the text, each once, in GESTURE_MAPPINGS order
+        """
+        if self.gesture_matcher is None:
+            return [keyword for keyword in GESTURE_MAPPINGS if keyword in text_lower]
+        
+        return [keyword for _, keyword in sorted({match for _, match in self.gesture_matcher.iter(text_lower)})]
+
     def _get_mock_body_language_instructions(self, text: str, context: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Provide specific body language instructions for communication accessibility
@@ -335,78 +913,25 @@ class AITranslator:
         text_lower = text.lower()
         instructions = []
         
-        # Comprehensive gesture mappings for common phrases and words
-        gesture_mappings = {
-            # Basic needs and wants
-            "want": [{"gesture_type": "hand", "description": "Point to your chest with index finger, then point forward", "duration": 2.0, "intensity": 0.8}],
-            "need": [{"gesture_type": "hand", "description": "Hold both hands palms up, then bring them toward your chest", "duration": 2.5, "intensity": 0.9}],
-            "go": [{"gesture_type": "hand", "description": "Point forward with index finger, then make walking motion with fingers", "duration": 2.0, "intensity": 0.8}],
-            "come": [{"gesture_type": "hand", "description": "Wave hand toward yourself with palm facing up", "duration": 1.5, "intensity": 0.7}],
-            
-            # Places
-            "school": [{"gesture_type": "hand", "description": "Make writing motion with hand, then point to building location", "duration": 3.0, "intensity": 0.8}],
-            "home": [{"gesture_type": "hand", "description": "Point to your chest, then make roof shape with hands above head", "duration": 2.5, "intensity": 0.8}],
-            "hospital": [{"gesture_type": "hand", "description": "Make cross sign on chest, then point to building location", "duration": 3.0, "intensity": 0.9}],
-            "store": [{"gesture_type": "hand", "description": "Make money counting motion, then point to building location", "duration": 2.5, "intensity": 0.8}],
-            
-            # Actions
-            "eat": [{"gesture_type": "hand", "description": "Bring hand to mouth in eating motion", "duration": 1.5, "intensity": 0.8}],
-            "drink": [{"gesture_type": "hand", "description": "Make cup shape with hand, bring to mouth", "duration": 1.5, "intensity": 0.8}],
-            "sleep": [{"gesture_type": "hand", "description": "Place hands together under tilted head", "duration": 2.0, "intensity": 0.7}],
-            "work": [{"gesture_type": "hand", "description": "Make hammering motion with fist", "duration": 2.0, "intensity": 0.8}],
-            "swim": [{"gesture_type": "swim", "description": "Make swimming motion with both arms in alternating pattern", "duration": 3.0, "intensity": 0.8}],
-            
-            # Emotions and responses
-            "happy": [{"gesture_type": "face", "description": "Smile broadly, then point to your smile", "duration": 2.0, "intensity": 0.9}],
-            "sad": [{"gesture_type": "face", "description": "Frown, then point to your face", "duration": 2.0, "intensity": 0.8}],
-            "angry": [{"gesture_type": "face", "description": "Frown deeply, then make fist", "duration": 2.0, "intensity": 0.9}],
-            "tired": [{"gesture_type": "body", "description": "Slump shoulders, then yawn motion", "duration": 2.5, "intensity": 0.8}],
-            
-            # Communication
-            "hello": [{"gesture_type": "hand", "description": "Wave hand from side to side", "duration": 2.0, "intensity": 0.8}],
-            "goodbye": [{"gesture_type": "hand", "description": "Wave hand, then point away", "duration": 2.0, "intensity": 0.7}],
-            "thank": [{"gesture_type": "hand", "description": "Place hand over heart, then nod head", "duration": 2.0, "intensity": 0.8}],
-            "sorry": [{"gesture_type": "hand", "description": "Place hand over heart, then bow head slightly", "duration": 2.0, "intensity": 0.8}],
-            
-            # Basic responses
-            "yes": [{"gesture_type": "head", "description": "Nod head up and down", "duration": 1.0, "intensity": 0.8}],
-            "no": [{"gesture_type": "head", "description": "Shake head side to side", "duration": 1.0, "intensity": 0.8}],
-            "maybe": [{"gesture_type": "hand", "description": "Hold hand palm up, then tilt side to side", "duration": 2.0, "intensity": 0.6}],
-            "okay": [{"gesture_type": "hand", "description": "Make OK sign with thumb and index finger", "duration": 1.5, "intensity": 0.8}],
-            
-            # Urgency and needs
-            "help": [{"gesture_type": "hand", "description": "Raise hand above head, then point to yourself", "duration": 3.0, "intensity": 0.9}],
-            "stop": [{"gesture_type": "hand", "description": "Hold palm forward like traffic stop", "duration": 1.5, "intensity": 0.9}],
-            "wait": [{"gesture_type": "hand", "description": "Hold palm up, then point to watch", "duration": 2.0, "intensity": 0.7}],
-            "hurry": [{"gesture_type": "hand", "description": "Make fast circular motion with hand", "duration": 2.0, "intensity": 0.9}],
-            
-            # Questions
-            "what": [{"gesture_type": "hand", "description": "Hold hands palms up, then shrug shoulders", "duration": 2.0, "intensity": 0.8}],
-            "where": [{"gesture_type": "hand", "description": "Point to different directions with questioning look", "duration": 2.5, "intensity": 0.8}],
-            "when": [{"gesture_type": "hand", "description": "Point to watch, then hold hands palms up", "duration": 2.0, "intensity": 0.8}],
-            "why": [{"gesture_type": "hand", "description": "Point to head, then hold hands palms up", "duration": 2.0, "intensity": 0.8}],
-            
-            # Numbers
-            "one": [{"gesture_type": "hand", "description": "Hold up index finger", "duration": 1.0, "intensity": 0.8}],
-            "two": [{"gesture_type": "hand", "description": "Hold up index and middle finger", "duration": 1.0, "intensity": 0.8}],
-            "three": [{"gesture_type": "hand", "description": "Hold up three fingers", "duration": 1.0, "intensity": 0.8}],
-        }
         
         # Find matching gestures for the text
-        for keyword, gestures in gesture_mappings.items():
-            if keyword in text_lower:
-                instructions.extend(gestures)
+        for keyword in self._match_gesture_keywords(text_lower):
+            instructions.extend(GESTURE_MAPPINGS[keyword])
         
         # If no specific matches found, break down the sentence and provide instructions
         if not instructions:
+            # Tokenize once so the phrase checks below are set lookups
+            words = _WORD_RE.findall(text_lower)
+            tokens = set(words)
+            
             # Check for common phrases
-            if "let's" in text_lower:
-                if "swim" in text_lower:
+            if "let's" in tokens:
+                if "swim" in tokens:
                     instructions = [
                         {"gesture_type": "swim", "description": "Make swimming motion with both arms in alternating pattern", "duration": 3.0, "intensity": 0.8},
                         {"gesture_type": "point", "description": "Point to indicate swimming location", "duration": 2.0, "intensity": 0.7}
                     ]
-                elif "go" in text_lower:
+                elif "go" in tokens:
                     instructions = [
                         {"gesture_type": "hand", "description": "Point forward with index finger, then make walking motion", "duration": 2.5, "intensity": 0.8}
                     ]
@@ -414,31 +939,28 @@ class AITranslator:
                     instructions = [
                         {"gesture_type": "hand", "description": "Gesture to indicate invitation or suggestion", "duration": 2.0, "intensity": 0.7}
                     ]
-            words = text_lower.split()
             for word in words:
-                if word in gesture_mappings:
-                    instructions.extend(gesture_mappings[word])
+                if word in GESTURE_MAPPINGS:
+                    instructions.extend(GESTURE_MAPPINGS[word])
         
-        # If still no matches, provide context-based instructions
-        if not instructions:
-            if "go" in text_lower or "want" in text_lower:
-                instructions = [
-                    {"gesture_type": "hand", "description": "Point to your chest, then point forward in the direction you want to go", "duration": 3.0, "intensity": 0.8},
-                    {"gesture_type": "face", "description": "Show determined expression", "duration": 2.0, "intensity": 0.7}
-                ]
-            elif "need" in text_lower or "help" in text_lower:
-                instructions = [
-                    {"gesture_type": "hand", "description": "Hold both hands palms up toward the person", "duration": 2.0, "intensity": 0.9},
-                    {"gesture_type": "face", "description": "Show concerned or urgent expression", "duration": 2.0, "intensity": 0.8}
-                ]
-            else:
-                instructions = [
-                    {"gesture_type": "hand", "description": "Point to your chest, then gesture to explain what you want", "duration": 2.5, "intensity": 0.8},
-                    {"gesture_type": "face", "description": "Show your emotion about the situation", "duration": 2.0, "intensity": 0.7}
-                ]
-        
-        # Add sequence order
-        for i, instruction in enumerate(instructions):
-            instruction["sequence_order"] = i + 1
+            # If still no matches, provide context-based instructions
+            if not instructions:
+                if "go" in tokens or "want" in tokens:
+                    instructions = [
+                        {"gesture_type": "hand", "description": "Point to your chest, then point forward in the direction you want to go", "duration": 3.0, "intensity": 0.8},
+                        {"gesture_type": "face", "description": "Show determined expression", "duration": 2.0, "intensity": 0.7}
+                    ]
+                elif "need" in tokens or "help" in tokens:
+                    instructions = [
+                        {"gesture_type": "hand", "description": "Hold both hands palms up toward the person", "duration": 2.0, "intensity": 0.9},
+                        {"gesture_type": "face", "description": "Show concerned or urgent expression", "duration": 2.0, "intensity": 0.8}
+                    ]
+                else:
+                    instructions = [
+                        {"gesture_type": "hand", "description": "Point to your chest, then gesture to explain what you want", "duration": 2.5, "intensity": 0.8},
+                        {"gesture_type": "face", "description": "Show your emotion about the situation", "duration": 2.0, "intensity": 0.7}
+                    ]
         
-        return instructions
+        # Add sequence order; each instruction is a fresh dict, so the shared
+        # GESTURE_MAPPINGS entries are never mutated
+        return [{**instruction, "sequence_order": i + 1} for i, instruction in enumerate(instructions)]
@@ -12,8 +12,9 @@ Integrates with:
 
 import json
 import logging
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 import numpy as np
+import orjson
 try:
     import cv2
 except ImportError:
@@ -24,14 +25,28 @@ try:
 except ImportError:
     mp = None
     
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import asyncio
 import time
-import math
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Synthetic hand shapes, used as indices into ASLProcessor._hand_shapes
+HAND_NEUTRAL, HAND_OPEN, HAND_FLAT, HAND_FIST = range(4)
+
+# Punctuation dropped from text before it is split into words
+_PUNCT_TABLE = str.maketrans("", "", ",.!?")
+
+# Fingerspelled letters shown as a closed fist
+_VOWELS = frozenset("AEIOU")
+
+# Left arm motions of the synthetic body pose
+ARM_NEUTRAL, ARM_WAVE, ARM_TO_CHEST = range(3)
+
+# Wrist position of each hand
+HAND_BASES = {"left": (0.7, 0.5), "right": (0.3, 0.5)}
+
 @dataclass
 class ASLGloss:
     """Represents an ASL gloss sequence"""
@@ -45,20 +60,20 @@ class PoseKeypoints:
     """Represents 3D pose keypoints for a single frame"""
     frame_index: int
     timestamp: float
-    body_keypoints: np.ndarray  # 33 body landmarks (x, y, z, visibility)
-    left_hand_keypoints: np.ndarray  # 21 hand landmarks
-    right_hand_keypoints: np.ndarray  # 21 hand landmarks
-    face_keypoints: np.ndarray  # 468 face landmarks
+    body_keypoints: np.ndarray  # 33 body landmarks (x, y, z, visibility), float32
+    left_hand_keypoints: np.ndarray  # 21 hand landmarks, float32
+    right_hand_keypoints: np.ndarray  # 21 hand landmarks, float32
+    face_keypoints: np.ndarray  # 468 face landmarks, float32
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
+        """Convert to dictionary for JSON serialization; arrays are left for orjson to encode"""
         return {
             'frame_index': self.frame_index,
             'timestamp': self.timestamp,
-            'body_keypoints': self.body_keypoints.tolist() if isinstance(self.body_keypoints, np.ndarray) else self.body_keypoints,
-            'left_hand_keypoints': self.left_hand_keypoints.tolist() if isinstance(self.left_hand_keypoints, np.ndarray) else self.left_hand_keypoints,
-            'right_hand_keypoints': self.right_hand_keypoints.tolist() if isinstance(self.right_hand_keypoints, np.ndarray) else self.right_hand_keypoints,
-            'face_keypoints': self.face_keypoints.tolist() if isinstance(self.face_keypoints, np.ndarray) else self.face_keypoints
+            'body_keypoints': self.body_keypoints,
+            'left_hand_keypoints': self.left_hand_keypoints,
+            'right_hand_keypoints': self.right_hand_keypoints,
+            'face_keypoints': self.face_keypoints
         }
 
 @dataclass
@@ -70,6 +85,8 @@ class ASLAnimation:
     fps: int
     total_duration: float
     created_at: float
+    # Keypoints of all frames as (frames, landmarks, 4) arrays, keyed by part
+    keypoints: Dict[str, np.ndarray] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -108,6 +125,72 @@ class ASLProcessor:
         # Load ASL vocabulary
         self.asl_gloss_vocab = self._load_asl_vocabulary()
         
+        # (arm motion, hand shape) of every gloss the processor emits itself;
+        # other glosses are classified when they are animated
+        known_glosses = {g for glosses in self.asl_gloss_vocab.values() for g in glosses}
+        known_glosses.update(f"FS-{c}" for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        known_glosses.add("NEUTRAL")
+        self._gloss_signs = {g: self._classify_gloss(g) for g in known_glosses}
+        
+        # 468 synthetic face landmarks (MediaPipe Face Mesh) on a circle of radius 0.1
+        # Real implementation would have detailed facial expressions for ASL
+        face_angles = np.linspace(0, 2 * np.pi, 468, endpoint=False)
+        self._face_template = np.empty((468, 4), dtype=np.float32)  # x, y, z, visibility
+        self._face_template[:, 0] = 0.5 + 0.1 * np.cos(face_angles)
+        self._face_template[:, 1] = 0.1 + 0.1 * np.sin(face_angles)
+        self._face_template[:, 2] = 0.0
+        self._face_template[:, 3] = 1.0
+        self._face_template.flags.writeable = False
+        
+        # Standing body pose shared by every frame; only the left arm is animated
+        self._body_template = np.array([
+            # Head and shoulders
+            [0.5, 0.1, 0.0, 1.0],    # Nose
+            [0.51, 0.08, 0.0, 1.0],  # Left eye inner
+            [0.52, 0.08, 0.0, 1.0],  # Left eye
+            [0.53, 0.08, 0.0, 1.0],  # Left eye outer
+            [0.49, 0.08, 0.0, 1.0],  # Right eye inner
+            [0.48, 0.08, 0.0, 1.0],  # Right eye
+            [0.47, 0.08, 0.0, 1.0],  # Right eye outer
+            [0.54, 0.09, 0.0, 1.0],  # Left ear
+            [0.46, 0.09, 0.0, 1.0],  # Right ear
+            [0.51, 0.12, 0.0, 1.0],  # Mouth left
+            [0.49, 0.12, 0.0, 1.0],  # Mouth right
+            # Shoulders
+            [0.6, 0.25, 0.0, 1.0],   # Left shoulder
+            [0.4, 0.25, 0.0, 1.0],   # Right shoulder
+            # Arms, left arm in its neutral position
+            [0.65, 0.4, 0.0, 1.0],   # Left elbow
+            [0.35, 0.4, 0.0, 1.0],   # Right elbow
+            [0.7, 0.5, 0.0, 1.0],    # Left wrist
+            [0.3, 0.5, 0.0, 1.0],    # Right wrist
+            # Torso
+            [0.58, 0.45, 0.0, 1.0],  # Left pinky
+            [0.42, 0.45, 0.0, 1.0],  # Right pinky
+            [0.56, 0.42, 0.0, 1.0],  # Left index
+            [0.44, 0.42, 0.0, 1.0],  # Right index
+            [0.54, 0.44, 0.0, 1.0],  # Left thumb
+            [0.46, 0.44, 0.0, 1.0],  # Right thumb
+            # Hips
+            [0.55, 0.6, 0.0, 1.0],   # Left hip
+            [0.45, 0.6, 0.0, 1.0],   # Right hip
+            # Legs
+            [0.55, 0.75, 0.0, 1.0],  # Left knee
+            [0.45, 0.75, 0.0, 1.0],  # Right knee
+            [0.55, 0.9, 0.0, 1.0],   # Left ankle
+            [0.45, 0.9, 0.0, 1.0],   # Right ankle
+            # Feet
+            [0.57, 0.95, 0.0, 1.0],  # Left heel
+            [0.43, 0.95, 0.0, 1.0],  # Right heel
+            [0.58, 0.92, 0.0, 1.0],  # Left foot index
+            [0.42, 0.92, 0.0, 1.0],  # Right foot index
+        ], dtype=np.float32)
+        self._body_template.flags.writeable = False
+        
+        # Landmark offsets from the wrist for each hand shape
+        self._hand_shapes = self._build_hand_shapes()
+        self._hand_shapes.flags.writeable = False
+        
         # For future LLM integration
         self.text_to_gloss_model = None
         
@@ -149,59 +232,59 @@ class ASLProcessor:
             logger.warning(f"Failed to initialize MediaPipe models: {e}")
             logger.info("Proceeding with synthetic pose generation")
     
-    def _load_asl_vocabulary(self) -> Dict[str, List[str]]:
-        """Load ASL vocabulary mapping"""
+    def _load_asl_vocabulary(self) -> Dict[str, Tuple[str, ...]]:
+        """Load ASL vocabulary mapping; signs are tuples so they are shared, never copied"""
         # Simplified ASL vocabulary - can be expanded with WLASL dataset
         vocabulary = {
-            "hello": ["HELLO"],
-            "hi": ["HELLO"],
-            "goodbye": ["GOODBYE"],
-            "bye": ["GOODBYE"],
-            "thank": ["THANK"],
-            "you": ["YOU"],
-            "please": ["PLEASE"],
-            "sorry": ["SORRY"],
-            "yes": ["YES"],
-            "no": ["NO"],
-            "good": ["GOOD"],
-            "bad": ["BAD"],
-            "happy": ["HAPPY"],
-            "sad": ["SAD"],
-            "help": ["HELP"],
-            "me": ["ME"],
-            "my": ["MY"],
-            "name": ["NAME"],
-            "is": ["IS"],
-            "love": ["LOVE"],
-            "like": ["LIKE"],
-            "water": ["WATER"],
-            "food": ["FOOD"],
-            "eat": ["EAT"],
-            "drink": ["DRINK"],
-            "sleep": ["SLEEP"],
-            "work": ["WORK"],
-            "home": ["HOME"],
-            "family": ["FAMILY"],
-            "friend": ["FRIEND"],
-            "time": ["TIME"],
-            "today": ["TODAY"],
-            "tomorrow": ["TOMORROW"],
-            "yesterday": ["YESTERDAY"],
-            "morning": ["MORNING"],
-            "afternoon": ["AFTERNOON"],
-            "night": ["NIGHT"],
-            "where": ["WHERE"],
-            "what": ["WHAT"],
-            "when": ["WHEN"],
-            "why": ["WHY"],
-            "how": ["HOW"],
-            "who": ["WHO"],
-            "beautiful": ["BEAUTIFUL"],
-            "amazing": ["AMAZING"],
-            "wonderful": ["WONDERFUL"],
-            "fine": ["FINE"],
-            "ok": ["OK"],
-            "okay": ["OK"]
+            "hello": ("HELLO",),
+            "hi": ("HELLO",),
+            "goodbye": ("GOODBYE",),
+            "bye": ("GOODBYE",),
+            "thank": ("THANK",),
+            "you": ("YOU",),
+            "please": ("PLEASE",),
+            "sorry": ("SORRY",),
+            "yes": ("YES",),
+            "no": ("NO",),
+            "good": ("GOOD",),
+            "bad": ("BAD",),
+            "happy": ("HAPPY",),
+            "sad": ("SAD",),
+            "help": ("HELP",),
+            "me": ("ME",),
+            "my": ("MY",),
+            "name": ("NAME",),
+            "is": ("IS",),
+            "love": ("LOVE",),
+            "like": ("LIKE",),
+            "water": ("WATER",),
+            "food": ("FOOD",),
+            "eat": ("EAT",),
+            "drink": ("DRINK",),
+            "sleep": ("SLEEP",),
+            "work": ("WORK",),
+            "home": ("HOME",),
+            "family": ("FAMILY",),
+            "friend": ("FRIEND",),
+            "time": ("TIME",),
+            "today": ("TODAY",),
+            "tomorrow": ("TOMORROW",),
+            "yesterday": ("YESTERDAY",),
+            "morning": ("MORNING",),
+            "afternoon": ("AFTERNOON",),
+            "night": ("NIGHT",),
+            "where": ("WHERE",),
+            "what": ("WHAT",),
+            "when": ("WHEN",),
+            "why": ("WHY",),
+            "how": ("HOW",),
+            "who": ("WHO",),
+            "beautiful": ("BEAUTIFUL",),
+            "amazing": ("AMAZING",),
+            "wonderful": ("WONDERFUL",),
+            "fine": ("FINE",),
+            "ok": ("OK",),
+            "okay": ("OK",)
         }
         
         logger.info(f"Loaded ASL vocabulary with {len(vocabulary)} entries")
@@ -215,15 +298,16 @@ class ASLProcessor:
             
             # Basic text preprocessing
             text_lower = text.lower().strip()
-            words = text_lower.replace(',', '').replace('.', '').replace('!', '').replace('?', '').split()
+            words = text_lower.translate(_PUNCT_TABLE).split()
             
             gloss_sequence = []
             timing = []
             
             for word in words:
-                if word in self.asl_gloss_vocab:
-                    gloss_sequence.extend(self.asl_gloss_vocab[word])
-                    timing.extend([1.0] * len(self.asl_gloss_vocab[word]))  # 1 second per sign
+                signs = self.asl_gloss_vocab.get(word)
+                if signs is not None:
+                    gloss_sequence.extend(signs)
+                    timing.extend([1.0] * len(signs))  # 1 second per sign
                 else:
                     # Fingerspelling for unknown words
                     for char in word:
@@ -273,14 +357,9 @@ class ASLProcessor:
         try:
             fps = 30  # 30 frames per second
             total_frames = int(duration * fps)
-            frames = []
             
             animation_id = f"asl_{int(time.time() * 1000)}"
-            
-            for frame_idx in range(total_frames):
-                timestamp = frame_idx / fps
-                pose_keypoints = self._generate_frame_pose(gloss, timestamp, duration)
-                frames.append(pose_keypoints)
+            frames, keypoints = self._generate_frames(gloss.gloss_sequence, total_frames, fps)
             
             return ASLAnimation(
                 animation_id=animation_id,
@@ -288,264 +367,157 @@ class ASLProcessor:
                 frames=frames,
                 fps=fps,
                 total_duration=duration,
-                created_at=time.time()
+                created_at=time.time(),
+                keypoints=keypoints
             )
             
         except Exception as e:
             logger.error(f"Error generating pose sequence: {e}")
             raise
     
-    def _generate_frame_pose(self, gloss: ASLGloss, time: float, duration: float) -> PoseKeypoints:
-        """Generate pose keypoints for a single frame"""
-        frame_index = int(time * 30)  # Assuming 30 FPS
-        
+    def _generate_frames(self, gloss_sequence: List[str], total_frames: int, fps: int) -> Tuple[List[PoseKeypoints], Dict[str, np.ndarray]]:
+        """
+        Generate every frame's keypoints at once as (frames, landmarks, 4)
+        arrays; returns per-frame PoseKeypoints holding views into them, and the arrays
+        """
         # Generate synthetic poses based on gloss sequence
         # In production, this would use trained models or motion capture data
+        times = np.arange(total_frames) / fps
         
-        body_pose = self._generate_body_pose(gloss.gloss_sequence, time)
-        left_hand_pose = self._generate_hand_pose(gloss.gloss_sequence, "left", time)
-        right_hand_pose = self._generate_hand_pose(gloss.gloss_sequence, "right", time)
-        face_pose = self._generate_face_pose(gloss.gloss_sequence, time)
-        
-        return PoseKeypoints(
-            frame_index=frame_index,
-            timestamp=time,
-            body_keypoints=body_pose,
-            left_hand_keypoints=left_hand_pose,
-            right_hand_keypoints=right_hand_pose,
-            face_keypoints=face_pose
-        )
-    
-    def _generate_body_pose(self, gloss_sequence: List[str], time: float) -> np.ndarray:
-        """Generate synthetic body pose based on current gloss"""
-        # 33 body landmarks as per MediaPipe
-        num_landmarks = 33
-        
-        # Basic pose - standing position
-        pose = np.zeros((num_landmarks, 4))  # x, y, z, visibility
-        
-        # Set visibility to 1.0 for all landmarks
-        pose[:, 3] = 1.0
-        
-        # Basic standing pose coordinates (normalized)
-        # These would be replaced with actual ASL pose data in production
-        
-        # Head and shoulders
-        pose[0] = [0.5, 0.1, 0.0, 1.0]  # Nose
-        pose[1] = [0.51, 0.08, 0.0, 1.0]  # Left eye inner
-        pose[2] = [0.52, 0.08, 0.0, 1.0]  # Left eye
-        pose[3] = [0.53, 0.08, 0.0, 1.0]  # Left eye outer
-        pose[4] = [0.49, 0.08, 0.0, 1.0]  # Right eye inner
-        pose[5] = [0.48, 0.08, 0.0, 1.0]  # Right eye
-        pose[6] = [0.47, 0.08, 0.0, 1.0]  # Right eye outer
-        pose[7] = [0.54, 0.09, 0.0, 1.0]  # Left ear
-        pose[8] = [0.46, 0.09, 0.0, 1.0]  # Right ear
-        pose[9] = [0.51, 0.12, 0.0, 1.0]  # Mouth left
-        pose[10] = [0.49, 0.12, 0.0, 1.0]  # Mouth right
+        # Gloss shown in each frame, cycling through the sequence
+        glosses = gloss_sequence or ["NEUTRAL"]
+        gloss_idx = ((times * len(gloss_sequence)) % max(1, len(gloss_sequence))).astype(int)
         
-        # Shoulders
-        pose[11] = [0.6, 0.25, 0.0, 1.0]  # Left shoulder
-        pose[12] = [0.4, 0.25, 0.0, 1.0]  # Right shoulder
+        # Arm motion and hand shape ids of each frame's gloss
+        signs = np.array([self._gloss_sign(g) for g in glosses])[gloss_idx]
         
-        # Arms - add some animation based on gloss
-        current_gloss_idx = int((time * len(gloss_sequence)) % max(1, len(gloss_sequence)))
-        current_gloss = gloss_sequence[current_gloss_idx] if gloss_sequence else "NEUTRAL"
+        body = self._generate_body_poses(signs[:, 0], times)
         
-        # Basic arm movements for different signs
-        arm_offset = math.sin(time * 2) * 0.1  # Gentle movement
+        # Hand shapes depend only on the gloss, so frames gather them by shape id
+        hand_shapes = self._hand_shapes[signs[:, 1]]
+        left_hands = hand_shapes + self._hand_base("left")
+        right_hands = hand_shapes + self._hand_base("right")
         
-        if "HELLO" in current_gloss:
-            # Waving motion
-            wave_offset = math.sin(time * 6) * 0.15
-            pose[13] = [0.7 + wave_offset, 0.35, 0.0, 1.0]  # Left elbow
-            pose[15] = [0.8 + wave_offset, 0.3, 0.0, 1.0]   # Left wrist
-        elif "THANK" in current_gloss or "PLEASE" in current_gloss:
-            # Hand to chest motion
-            pose[13] = [0.65, 0.4, 0.0, 1.0]  # Left elbow
-            pose[15] = [0.55, 0.35, 0.0, 1.0]  # Left wrist
+        # The face only moves with HAPPY; otherwise every frame shares the read-only template
+        if any("HAPPY" in g for g in gloss_sequence):
+            faces = np.repeat(self._face_template[np.newaxis], total_frames, axis=0)
+            faces[:, :, 1] += (0.01 * np.sin(times * 4))[:, np.newaxis]  # Slight smile animation
         else:
-            # Neutral position
-            pose[13] = [0.65, 0.4, 0.0, 1.0]  # Left elbow
-            pose[15] = [0.7, 0.5, 0.0, 1.0]   # Left wrist
-        
-        pose[14] = [0.35, 0.4, 0.0, 1.0]  # Right elbow
-        pose[16] = [0.3, 0.5, 0.0, 1.0]   # Right wrist
-        
-        # Torso
-        pose[17] = [0.58, 0.45, 0.0, 1.0]  # Left pinky
-        pose[18] = [0.42, 0.45, 0.0, 1.0]  # Right pinky
-        pose[19] = [0.56, 0.42, 0.0, 1.0]  # Left index
-        pose[20] = [0.44, 0.42, 0.0, 1.0]  # Right index
-        pose[21] = [0.54, 0.44, 0.0, 1.0]  # Left thumb
-        pose[22] = [0.46, 0.44, 0.0, 1.0]  # Right thumb
-        
-        # Hips
-        pose[23] = [0.55, 0.6, 0.0, 1.0]  # Left hip
-        pose[24] = [0.45, 0.6, 0.0, 1.0]  # Right hip
-        
-        # Legs
-        pose[25] = [0.55, 0.75, 0.0, 1.0]  # Left knee
-        pose[26] = [0.45, 0.75, 0.0, 1.0]  # Right knee
-        pose[27] = [0.55, 0.9, 0.0, 1.0]   # Left ankle
-        pose[28] = [0.45, 0.9, 0.0, 1.0]   # Right ankle
-        
-        # Feet
-        pose[29] = [0.57, 0.95, 0.0, 1.0]  # Left heel
-        pose[30] = [0.43, 0.95, 0.0, 1.0]  # Right heel
-        pose[31] = [0.58, 0.92, 0.0, 1.0]  # Left foot index
-        pose[32] = [0.42, 0.92, 0.0, 1.0]  # Right foot index
-        
-        return pose
-    
-    def _generate_hand_pose(self, gloss_sequence: List[str], hand: str, time: float) -> np.ndarray:
-        """Generate synthetic hand pose"""
-        # 21 hand landmarks as per MediaPipe
-        num_landmarks = 21
-        
-        pose = np.zeros((num_landmarks, 4))  # x, y, z, visibility
-        pose[:, 3] = 1.0  # Set visibility
-        
-        # Get current gloss for hand shape
-        current_gloss_idx = int((time * len(gloss_sequence)) % max(1, len(gloss_sequence)))
-        current_gloss = gloss_sequence[current_gloss_idx] if gloss_sequence else "NEUTRAL"
-        
-        # Base hand position
-        base_x = 0.7 if hand == "left" else 0.3
-        base_y = 0.5
-        
-        # Generate hand landmarks based on sign
-        # This is highly simplified - real ASL would have specific hand shapes
-        
-        if "HELLO" in current_gloss:
-            # Open hand for waving
-            self._generate_open_hand(pose, base_x, base_y)
-        elif "THANK" in current_gloss:
-            # Hand moving towards chin
-            self._generate_flat_hand(pose, base_x, base_y - 0.1)
-        elif any(f"FS-{c}" in current_gloss for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"):
-            # Fingerspelling - simplified
-            self._generate_fingerspelling_hand(pose, base_x, base_y, current_gloss)
-        else:
-            # Neutral/relaxed hand
-            self._generate_neutral_hand(pose, base_x, base_y)
-        
-        return pose
+            faces = np.broadcast_to(self._face_template, (total_frames, *self._face_template.shape))
+        
+        frames = [
+            PoseKeypoints(
+                frame_index=i,
+                timestamp=float(times[i]),
+                body_keypoints=body[i],
+                left_hand_keypoints=left_hands[i],
+                right_hand_keypoints=right_hands[i],
+                face_keypoints=faces[i]
+            )
+            for i in range(total_frames)
+        ]
+        keypoints = {
+            'timestamp': times,
+            'body': body,
+            'left_hand': left_hands,
+            'right_hand': right_hands,
+            'face': faces
+        }
+        return frames, keypoints
     
-    def _generate_open_hand(self, pose: np.ndarray, base_x: float, base_y: float):
-        """Generate open hand pose"""
-        # Wrist
-        pose[0] = [base_x, base_y, 0.0, 1.0]
-        
-        # Thumb
-        pose[1] = [base_x - 0.02, base_y - 0.02, 0.01, 1.0]
-        pose[2] = [base_x - 0.03, base_y - 0.03, 0.02, 1.0]
-        pose[3] = [base_x - 0.04, base_y - 0.04, 0.03, 1.0]
-        pose[4] = [base_x - 0.05, base_y - 0.05, 0.04, 1.0]
+    def _generate_body_poses(self, arm_motions: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """Generate synthetic body poses for all frames from each frame's arm motion"""
+        # 33 body landmarks as per MediaPipe, starting from the standing pose
+        # These would be replaced with actual ASL pose data in production
+        body = np.repeat(self._body_template[np.newaxis], len(times), axis=0)  # x, y, z, visibility
         
-        # Index finger
-        pose[5] = [base_x + 0.01, base_y - 0.03, 0.0, 1.0]
-        pose[6] = [base_x + 0.02, base_y - 0.06, 0.0, 1.0]
-        pose[7] = [base_x + 0.03, base_y - 0.09, 0.0, 1.0]
-        pose[8] = [base_x + 0.04, base_y - 0.12, 0.0, 1.0]
+        # Basic arm movements for different signs
+        hello = arm_motions == ARM_WAVE
+        to_chest = arm_motions == ARM_TO_CHEST
         
-        # Middle finger
-        pose[9] = [base_x + 0.02, base_y - 0.03, 0.0, 1.0]
-        pose[10] = [base_x + 0.03, base_y - 0.06, 0.0, 1.0]
-        pose[11] = [base_x + 0.04, base_y - 0.10, 0.0, 1.0]
-        pose[12] = [base_x + 0.05, base_y - 0.14, 0.0, 1.0]
+        # Waving motion
+        wave_offset = np.sin(times[hello] * 6) * 0.15
+        body[hello, 13, 0] = 0.7 + wave_offset  # Left elbow
+        body[hello, 13, 1] = 0.35
+        body[hello, 15, 0] = 0.8 + wave_offset  # Left wrist
+        body[hello, 15, 1] = 0.3
         
-        # Ring finger
-        pose[13] = [base_x + 0.01, base_y - 0.03, 0.0, 1.0]
-        pose[14] = [base_x + 0.02, base_y - 0.06, 0.0, 1.0]
-        pose[15] = [base_x + 0.03, base_y - 0.09, 0.0, 1.0]
-        pose[16] = [base_x + 0.04, base_y - 0.12, 0.0, 1.0]
+        # Hand to chest motion; the elbow stays in its neutral position
+        body[to_chest, 15, :2] = (0.55, 0.35)  # Left wrist
         
-        # Pinky
-        pose[17] = [base_x, base_y - 0.03, 0.0, 1.0]
-        pose[18] = [base_x + 0.01, base_y - 0.05, 0.0, 1.0]
-        pose[19] = [base_x + 0.02, base_y - 0.07, 0.0, 1.0]
-        pose[20] = [base_x + 0.03, base_y - 0.09, 0.0, 1.0]
+        return body
     
-    def _generate_flat_hand(self, pose: np.ndarray, base_x: float, base_y: float):
-        """Generate flat hand pose (for signs like THANK)"""
-        # Similar to open hand but flatter
-        self._generate_open_hand(pose, base_x, base_y)
-        # Adjust for flatter appearance
-        for i in range(1, 21):
-            pose[i][2] *= 0.5  # Reduce z-depth
+    def _gloss_sign(self, gloss: str) -> Tuple[int, int]:
+        """(arm motion, hand shape) of a gloss, from the precomputed table when known"""
+        sign = self._gloss_signs.get(gloss)
+        if sign is None:
+            sign = self._classify_gloss(gloss)
+        return sign
     
-    def _generate_fingerspelling_hand(self, pose: np.ndarray, base_x: float, base_y: float, gloss: str):
-        """Generate fingerspelling hand shapes"""
-        # Simplified fingerspelling - just basic variations
-        # Real implementation would have specific shapes for each letter
-        letter = gloss.split('-')[-1] if '-' in gloss else 'A'
-        
-        if letter in 'AEIOU':
-            # Vowels - closed fist variations
-            self._generate_closed_fist(pose, base_x, base_y)
+    def _classify_gloss(self, gloss: str) -> Tuple[int, int]:
+        """Work out the arm motion and hand shape of a gloss from its text"""
+        if "HELLO" in gloss:
+            arm_motion = ARM_WAVE
+        elif "THANK" in gloss or "PLEASE" in gloss:
+            arm_motion = ARM_TO_CHEST
         else:
-            # Consonants - open hand variations
-            self._generate_open_hand(pose, base_x, base_y)
+            arm_motion = ARM_NEUTRAL
+        return arm_motion, self._hand_shape_for(gloss)
     
-    def _generate_neutral_hand(self, pose: np.ndarray, base_x: float, base_y: float):
-        """Generate neutral/relaxed hand pose"""
-        # Wrist
-        pose[0] = [base_x, base_y, 0.0, 1.0]
-        
-        # Slightly curved fingers
-        for i in range(1, 21):
-            finger_idx = (i - 1) // 4
-            joint_idx = (i - 1) % 4
-            
-            x_offset = (finger_idx - 2) * 0.015
-            y_offset = -joint_idx * 0.02
-            z_offset = joint_idx * 0.005
-            
-            pose[i] = [base_x + x_offset, base_y + y_offset, z_offset, 1.0]
+    def _hand_shape_for(self, current_gloss: str) -> int:
+        """Hand shape id used for a gloss"""
+        # This is highly simplified - real ASL would have specific hand shapes
+        if "HELLO" in current_gloss:
+            # Open hand for waving
+            return HAND_OPEN
+        if "THANK" in current_gloss:
+            # Flat hand moving towards chin
+            return HAND_FLAT
+        if current_gloss.startswith("FS-") and len(current_gloss) > 3:
+            # Fingerspelling - simplified: vowels as a closed fist, consonants as an open hand
+            # Real implementation would have specific shapes for each letter
+            # Glosses are FS-<letter>, so the letter is the last character
+            return HAND_FIST if current_gloss[-1] in _VOWELS else HAND_OPEN
+        # Neutral/relaxed hand
+        return HAND_NEUTRAL
     
-    def _generate_closed_fist(self, pose: np.ndarray, base_x: float, base_y: float):
-        """Generate closed fist pose"""
-        # Wrist
-        pose[0] = [base_x, base_y, 0.0, 1.0]
-        
-        # Closed fingers
-        for i in range(1, 21):
-            finger_idx = (i - 1) // 4
-            joint_idx = (i - 1) % 4
-            
-            x_offset = (finger_idx - 2) * 0.01
-            y_offset = -0.01 - joint_idx * 0.005
-            z_offset = joint_idx * 0.01
-            
-            pose[i] = [base_x + x_offset, base_y + y_offset, z_offset, 1.0]
+    def _hand_base(self, hand: str) -> np.ndarray:
+        """Wrist position of a hand as an (x, y, z, visibility) offset row"""
+        base_x, base_y = HAND_BASES[hand]
+        return np.array([base_x, base_y, 0.0, 0.0], dtype=np.float32)
     
-    def _generate_face_pose(self, gloss_sequence: List[str], time: float) -> np.ndarray:
-        """Generate synthetic face pose"""
-        # 468 face landmarks as per MediaPipe Face Mesh
-        num_landmarks = 468
-        
-        pose = np.zeros((num_landmarks, 4))  # x, y, z, visibility
-        pose[:, 3] = 1.0  # Set visibility
-        
-        # Basic face landmark positions (highly simplified)
-        # Real implementation would have detailed facial expressions for ASL
-        
-        for i in range(num_landmarks):
-            # Generate circular face pattern
-            angle = (i / num_landmarks) * 2 * math.pi
-            radius = 0.1
-            
-            x = 0.5 + radius * math.cos(angle)
-            y = 0.1 + radius * math.sin(angle)
-            z = 0.0
-            
-            # Add slight animation based on gloss
-            if gloss_sequence and any("HAPPY" in g for g in gloss_sequence):
-                y += 0.01 * math.sin(time * 4)  # Slight smile animation
-            
-            pose[i] = [x, y, z, 1.0]
-        
-        return pose
+    def _build_hand_shapes(self) -> np.ndarray:
+        """
+        Offsets of the 21 hand landmarks from the wrist for every hand shape,
+        as a (shapes, 21, 4) array with visibility 1.0
+        """
+        shapes = np.zeros((4, 21, 4), dtype=np.float32)  # x, y, z, visibility
+        shapes[:, :, 3] = 1.0
+        
+        # Open hand: thumb, then index, middle, ring and pinky from knuckle to tip
+        shapes[HAND_OPEN, 1:, :3] = [
+            [-0.02, -0.02, 0.01], [-0.03, -0.03, 0.02], [-0.04, -0.04, 0.03], [-0.05, -0.05, 0.04],
+            [0.01, -0.03, 0.0], [0.02, -0.06, 0.0], [0.03, -0.09, 0.0], [0.04, -0.12, 0.0],
+            [0.02, -0.03, 0.0], [0.03, -0.06, 0.0], [0.04, -0.10, 0.0], [0.05, -0.14, 0.0],
+            [0.01, -0.03, 0.0], [0.02, -0.06, 0.0], [0.03, -0.09, 0.0], [0.04, -0.12, 0.0],
+            [0.0, -0.03, 0.0], [0.01, -0.05, 0.0], [0.02, -0.07, 0.0], [0.03, -0.09, 0.0],
+        ]
+        
+        # Flat hand (for signs like THANK): the open hand with half the depth, raised towards the chin
+        shapes[HAND_FLAT] = shapes[HAND_OPEN]
+        shapes[HAND_FLAT, 1:, 2] *= 0.5
+        shapes[HAND_FLAT, :, 1] -= 0.1
+        
+        # Neutral and closed fist: fingers spread by finger index, curled by joint index
+        finger_idx, joint_idx = np.divmod(np.arange(20), 4)
+        shapes[HAND_NEUTRAL, 1:, 0] = (finger_idx - 2) * 0.015
+        shapes[HAND_NEUTRAL, 1:, 1] = -joint_idx * 0.02
+        shapes[HAND_NEUTRAL, 1:, 2] = joint_idx * 0.005
+        shapes[HAND_FIST, 1:, 0] = (finger_idx - 2) * 0.01
+        shapes[HAND_FIST, 1:, 1] = -0.01 - joint_idx * 0.005
+        shapes[HAND_FIST, 1:, 2] = joint_idx * 0.01
+        
+        return shapes
     
     def process_text_to_asl(self, text: str, duration: float = 3.0) -> ASLAnimation:
         """Complete pipeline: Text -> ASL Gloss -> Pose Animation"""
@@ -566,10 +538,24 @@ class ASLProcessor:
             logger.error(f"Error in text-to-ASL processing: {e}")
             raise
     
-    def export_animation_data(self, animation: ASLAnimation) -> Dict[str, Any]:
-        """Export animation data for frontend consumption"""
+    def export_animation_data(self, animation: ASLAnimation) -> bytes:
+        """
+        Export animation data for frontend consumption as one JSON document.
+        Keypoints are sent per part as [frame][landmark][x, y, z, visibility]
+        arrays instead of a list of per-frame objects, and orjson writes them
+        straight from the numpy buffers.
+        """
         try:
-            return {
+            keypoints = animation.keypoints or {
+                'timestamp': np.array([frame.timestamp for frame in animation.frames]),
+                'body': np.stack([frame.body_keypoints for frame in animation.frames]),
+                'left_hand': np.stack([frame.left_hand_keypoints for frame in animation.frames]),
+                'right_hand': np.stack([frame.right_hand_keypoints for frame in animation.frames]),
+                'face': np.stack([frame.face_keypoints for frame in animation.frames])
+            }
+            # orjson only writes C-contiguous arrays, which a shared face template is not
+            keypoints = {part: np.ascontiguousarray(values) for part, values in keypoints.items()}
+            return orjson.dumps({
                 'success': True,
                 'animation_id': animation.animation_id,
                 'gloss': {
@@ -582,20 +568,20 @@ class ASLProcessor:
                     'fps': animation.fps,
                     'total_duration': animation.total_duration,
                     'total_frames': len(animation.frames),
-                    'frames': [frame.to_dict() for frame in animation.frames]
+                    'keypoints': keypoints
                 },
                 'metadata': {
                     'created_at': animation.created_at,
                     'processing_time': time.time() - animation.created_at
                 }
-            }
+            }, option=orjson.OPT_SERIALIZE_NUMPY)
         except Exception as e:
             logger.error(f"Error exporting animation data: {e}")
-            return {
+            return orjson.dumps({
                 'success': False,
                 'error': str(e),
                 'animation_id': getattr(animation, 'animation_id', 'unknown')
-            }
+            })
 
 # Initialize the global ASL processor instance
 asl_processor = ASLProcessor()
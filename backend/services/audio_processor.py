@@ -8,16 +8,26 @@ import io
 import base64
 import tempfile
 import os
-from typing import Dict, Any, Optional
+import wave
+from typing import Dict, Any, List, Optional, Union
 import numpy as np
 import soundfile as sf
 import librosa
 import pyttsx3
 import speech_recognition as sr
-from datetime import datetime
+
+from utils.result_cache import ResultCache, content_key
+from utils.clock import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Synthesized speech is reused for repeated text
+speech_cache = ResultCache("text_to_speech", maxsize=512)
+
+def speech_key(text: str, language: str = "en", voice_speed: float = 1.0) -> str:
+    """Cache key for synthesized speech"""
+    return content_key(text, language, voice_speed)
+
 class AudioProcessor:
     def __init__(self):
         self.recognizer = sr.Recognizer()
@@ -63,47 +73,53 @@ class AudioProcessor:
         """
         Convert speech audio to text using SpeechRecognition
         """
+        # Save audio data to temporary file
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+            temp_file.write(audio_data)
+            temp_file_path = temp_file.name
+        
         try:
-            # Save audio data to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-            
-            try:
-                # Load audio file
-                with sr.AudioFile(temp_file_path) as source:
-                    # Adjust for ambient noise
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                    
-                    # Record audio
-                    audio = self.recognizer.record(source)
-                
-                # Perform speech recognition
-                text = self.recognizer.recognize_google(
-                    audio, 
-                    language=f"{language}-{language.upper()}"
-                )
-                
-                # Calculate confidence (Google doesn't provide confidence scores)
-                confidence = 0.8  # Default confidence for Google Speech Recognition
-                
-                # Extract audio features for additional analysis
-                audio_features = await self._extract_audio_features(audio_data)
-                
-                result = {
-                    "text": text,
-                    "confidence": confidence,
-                    "language": language,
-                    "timestamp": datetime.now().isoformat(),
-                    "audio_features": audio_features
-                }
-                
-                logger.info(f"Speech to text successful: {text[:50]}...")
-                return result
+            return await self.speech_to_text_file(temp_file_path, language)
+        finally:
+            # Clean up temporary file
+            os.unlink(temp_file_path)
+
+    async def speech_to_text_file(self, audio_path: str, language: str = "en") -> Dict[str, Any]:
+        """
+        Convert speech in an audio file on disk to text, without loading
+        the whole file into memory first
+        """
+        try:
+            # Load audio file
+            with sr.AudioFile(audio_path) as source:
+                # Adjust for ambient noise
+                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_file_path)
+                # Record audio
+                audio = self.recognizer.record(source)
+            
+            # Perform speech recognition
+            text = self.recognizer.recognize_google(
+                audio, 
+                language=f"{language}-{language.upper()}"
+            )
+            
+            # Calculate confidence (Google doesn't provide confidence scores)
+            confidence = 0.8  # Default confidence for Google Speech Recognition
+            
+            # Extract audio features for additional analysis
+            audio_features = await self._extract_audio_features(audio_path)
+            
+            result = {
+                "text": text,
+                "confidence": confidence,
+                "language": language,
+                "timestamp": now_iso(),
+                "audio_features": audio_features
+            }
+            
+            logger.info(f"Speech to text successful: {text[:50]}...")
+            return result
                 
         except sr.UnknownValueError:
             logger.warning("Speech recognition could not understand audio")
@@ -111,7 +127,7 @@ class AudioProcessor:
                 "text": "",
                 "confidence": 0.0,
                 "language": language,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "error": "Speech not recognized"
             }
         except sr.RequestError as e:
@@ -120,7 +136,7 @@ class AudioProcessor:
                 "text": "",
                 "confidence": 0.0,
                 "language": language,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "error": f"Service error: {str(e)}"
             }
         except Exception as e:
@@ -129,7 +145,7 @@ class AudioProcessor:
                 "text": "",
                 "confidence": 0.0,
                 "language": language,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "error": str(e)
             }
 
@@ -146,7 +162,7 @@ class AudioProcessor:
                     "text": "",
                     "confidence": 0.0,
                     "language": language,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso(),
                     "error": "Invalid audio data"
                 }
             
@@ -156,7 +172,7 @@ class AudioProcessor:
                     "text": "",
                     "confidence": 0.0,
                     "language": language,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso(),
                     "is_silence": True
                 }
             
@@ -180,7 +196,7 @@ class AudioProcessor:
                     "text": text,
                     "confidence": 0.7,  # Lower confidence for real-time
                     "language": language,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso(),
                     "is_silence": False
                 }
                 
@@ -194,7 +210,7 @@ class AudioProcessor:
                 "text": "",
                 "confidence": 0.0,
                 "language": language,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "is_silence": False
             }
         except Exception as e:
@@ -203,10 +219,11 @@ class AudioProcessor:
                 "text": "",
                 "confidence": 0.0,
                 "language": language,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "error": str(e)
             }
 
+    @speech_cache.cached(key=speech_key, cacheable=bool)
     async def text_to_speech(self, text: str, language: str = "en", voice_speed: float = 1.0) -> bytes:
         """
         Convert text to speech audio using pyttsx3
@@ -248,6 +265,73 @@ class AudioProcessor:
             # Return empty audio data on error
             return b""
 
+    async def text_to_speech_batch(self, texts: List[str]) -> List[bytes]:
+        """
+        Convert several texts to speech with a single engine run
+        """
+        keys = [speech_key(text) for text in texts]
+        audio_data = [speech_cache.get(key) for key in keys]
+        misses = [i for i, audio in enumerate(audio_data) if audio is None]
+        
+        if misses:
+            synthesized = await self._synthesize_batch([texts[i] for i in misses])
+            for i, audio in zip(misses, synthesized):
+                audio_data[i] = audio
+                if audio:
+                    speech_cache.set(keys[i], audio)
+        
+        return audio_data
+
+    async def _synthesize_batch(self, texts: List[str]) -> List[bytes]:
+        """
+        Render texts that missed the cache
+        """
+        temp_file_paths = []
+        try:
+            if not self.tts_engine:
+                await self.initialize()
+
+            self.tts_engine.setProperty('rate', 150)
+
+            # Queue every utterance, then render them all in one runAndWait
+            for text in texts:
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+                    temp_file_paths.append(temp_file.name)
+                self.tts_engine.save_to_file(text, temp_file.name)
+            self.tts_engine.runAndWait()
+
+            audio_data = []
+            for temp_file_path in temp_file_paths:
+                with open(temp_file_path, 'rb') as audio_file:
+                    audio_data.append(audio_file.read())
+
+            logger.info(f"Text to speech successful for batch of {len(texts)}")
+            return audio_data
+
+        except Exception as e:
+            logger.error(f"Error in batched text to speech conversion: {str(e)}")
+            return [b"" for _ in texts]
+        finally:
+            for temp_file_path in temp_file_paths:
+                os.unlink(temp_file_path)
+
+    def concatenate_wav(self, clips: List[bytes]) -> bytes:
+        """
+        Join WAV clips with matching formats into one WAV file
+        """
+        clips = [clip for clip in clips if clip]
+        if len(clips) <= 1:
+            return clips[0] if clips else b""
+        
+        output = io.BytesIO()
+        with wave.open(output, 'wb') as writer:
+            for i, clip in enumerate(clips):
+                with wave.open(io.BytesIO(clip), 'rb') as reader:
+                    if i == 0:
+                        writer.setparams(reader.getparams())
+                    writer.writeframes(reader.readframes(reader.getnframes()))
+        return output.getvalue()
+
     async def text_to_speech_advanced(self, text: str, language: str = "en", 
                                     voice_type: str = "neutral", 
                                     emotion: str = "neutral") -> bytes:
@@ -301,9 +385,9 @@ class AudioProcessor:
             logger.error(f"Error in advanced text to speech: {str(e)}")
             return await self.text_to_speech(text, language)  # Fallback to basic TTS
 
-    async def _extract_audio_features(self, audio_data: bytes) -> Dict[str, Any]:
+    async def _extract_audio_features(self, audio_data: Union[bytes, str]) -> Dict[str, Any]:
         """
-        Extract audio features for analysis
+        Extract audio features for analysis from audio bytes or a file path
         """
         try:
             # Convert bytes to audio array
@@ -350,28 +434,28 @@ class AudioProcessor:
             logger.error(f"Error extracting audio features: {str(e)}")
             return {}
 
-    async def _bytes_to_audio_array(self, audio_bytes: bytes) -> Optional[np.ndarray]:
+    async def _bytes_to_audio_array(self, audio_bytes: Union[bytes, str]) -> Optional[np.ndarray]:
         """
-        Convert audio bytes to numpy array
+        Convert audio bytes (or an audio file path) to numpy array
         """
         try:
-            # Try to load with soundfile first
-            with io.BytesIO(audio_bytes) as audio_io:
-                audio_array, sample_rate = sf.read(audio_io)
-                
-                # Resample if necessary
-                if sample_rate != self.sample_rate:
-                    audio_array = librosa.resample(
-                        audio_array, 
-                        orig_sr=sample_rate, 
-                        target_sr=self.sample_rate
-                    )
-                
-                # Convert to mono if stereo
-                if len(audio_array.shape) > 1:
-                    audio_array = np.mean(audio_array, axis=1)
-                
-                return audio_array
+            # Try to load with soundfile first; paths are read straight from disk
+            source = audio_bytes if isinstance(audio_bytes, str) else io.BytesIO(audio_bytes)
+            audio_array, sample_rate = sf.read(source)
+            
+            # Resample if necessary
+            if sample_rate != self.sample_rate:
+                audio_array = librosa.resample(
+                    audio_array, 
+                    orig_sr=sample_rate, 
+                    target_sr=self.sample_rate
+                )
+            
+            # Convert to mono if stereo
+            if len(audio_array.shape) > 1:
+                audio_array = np.mean(audio_array, axis=1)
+            
+            return audio_array
                 
         except Exception as e:
             logger.error(f"Error converting audio bytes to array: {str(e)}")
@@ -448,7 +532,7 @@ class AudioProcessor:
                 "emotion_scores": emotion_scores,
                 "dominant_emotion": dominant_emotion,
                 "confidence": emotion_scores[dominant_emotion],
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
             
         except Exception as e:
@@ -402,6 +402,76 @@ class AvatarEngine:
             logger.error(f"Error generating animation frames: {e}")
             raise
     
+    def generate_animation_tracks(self, animation: ASLAnimation) -> Dict[str, np.ndarray]:
+        """
+        Pack the animation's keypoints into per-part arrays:
+        '<part>_positions' (frames x joints x 3) and '<part>_visibility'
+        (frames x joints) for body, left_hand, right_hand and face.
+        Joints missing from a frame have NaN positions and zero visibility.
+        """
+        frames = animation.frames
+        tracks = {
+            'frame_index': np.array([pose.frame_index for pose in frames], dtype=np.int32),
+            'times': np.array([pose.timestamp for pose in frames], dtype=np.float32)
+        }
+        for part in ('body', 'left_hand', 'right_hand', 'face'):
+            keypoints = [getattr(pose, f"{part}_keypoints") for pose in frames]
+            tracks[f"{part}_positions"], tracks[f"{part}_visibility"] = self._stack_keypoints(keypoints)
+        return tracks
+    
+    def _stack_keypoints(self, keypoints: List[Optional[np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Stack per-frame (n, 3 or 4) keypoint arrays into position and visibility arrays"""
+        count = max((len(points) for points in keypoints if points is not None), default=0)
+        positions = np.full((len(keypoints), count, 3), np.nan, dtype=np.float32)
+        visibility = np.zeros((len(keypoints), count), dtype=np.float32)
+        
+        for i, points in enumerate(keypoints):
+            if points is None or len(points) == 0:
+                continue
+            points = np.asarray(points, dtype=np.float32)
+            n, dims = points.shape[0], min(points.shape[1], 3)
+            positions[i, :n, :dims] = points[:, :dims]
+            positions[i, :n, dims:] = 0.0
+            visibility[i, :n] = points[:, 3] if points.shape[1] > 3 else 1.0
+        
+        return positions, visibility
+    
+    def generate_skeleton(self, face_landmarks: int = 0) -> Dict[str, Any]:
+        """Describe the joints and bones that the animation tracks index into"""
+        def joints(items: List[Joint3D]) -> List[Dict[str, Any]]:
+            return [{'id': j.id, 'name': j.name, 'color': j.color, 'size': j.size} for j in items]
+        
+        def bones(items: List[Bone3D]) -> List[Dict[str, Any]]:
+            return [
+                {'id': b.id, 'name': b.name, 'start_joint': b.start_joint, 'end_joint': b.end_joint,
+                 'color': b.color, 'thickness': b.thickness}
+                for b in items
+            ]
+        
+        body_joints = self._convert_body_keypoints(np.zeros((len(self.pose_indices), 3)))
+        skeleton = {
+            'body': {'joints': joints(body_joints), 'bones': bones(self._create_body_bones(body_joints))},
+            'hands': {},
+            'face': None
+        }
+        for side in ('left', 'right'):
+            hand = self._convert_hand_keypoints(np.zeros((len(self.hand_indices), 3)), side)
+            skeleton['hands'][side] = {
+                'joints': joints(hand.joints),
+                'bones': bones(hand.bones),
+                'fingers': hand.fingers
+            }
+        if face_landmarks:
+            face = self._convert_face_keypoints(np.zeros((face_landmarks, 3)))
+            skeleton['face'] = {
+                'landmarks': joints(face.landmarks),
+                'contour': face.contour,
+                'eyes': face.eyes,
+                'mouth': face.mouth,
+                'eyebrows': face.eyebrows
+            }
+        return skeleton
+    
     def _export_avatar_frame(self, avatar: Avatar3D, frame_index: int, fps: int) -> Dict[str, Any]:
         """Export single avatar frame data"""
         try:
@@ -521,9 +591,15 @@ class AvatarEngine:
             raise
     
     def generate_threejs_scene(self, animation: ASLAnimation) -> Dict[str, Any]:
-        """Generate Three.js scene data for web rendering"""
+        """
+        Generate Three.js scene data for web rendering.
+        
+        Per-frame joint data is returned as float32 arrays in the animation's
+        'tracks' (see generate_animation_tracks), with the static joint and
+        bone layout described once in its 'skeleton'.
+        """
         try:
-            frames_data = self.generate_animation_frames(animation)
+            tracks = self.generate_animation_tracks(animation)
             
             # Create Three.js compatible scene structure
             scene_data = {
@@ -546,7 +622,8 @@ class AvatarEngine:
                         'name': f"ASL_Animation_{animation.animation_id}",
                         'duration': animation.total_duration,
                         'fps': animation.fps,
-                        'frames': frames_data
+                        'skeleton': self.generate_skeleton(tracks['face_positions'].shape[1]),
+                        'tracks': tracks
                     }
                 ],
                 'materials': {
@@ -609,7 +686,7 @@ class AvatarEngine:
                 }
             }
             
-            logger.info(f"Generated Three.js scene with {len(frames_data)} frames")
+            logger.info(f"Generated Three.js scene with {len(animation.frames)} frames")
             return scene_data
             
         except Exception as e:
@@ -622,7 +699,7 @@ class AvatarEngine:
             scene_data = self.generate_threejs_scene(animation)
             
             with open(output_path, 'w') as f:
-                json.dump(scene_data, f, indent=2)
+                json.dump(scene_data, f, indent=2, default=lambda value: value.tolist())
             
             logger.info(f"Animation exported to {output_path}")
             
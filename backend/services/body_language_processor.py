@@ -2,12 +2,15 @@
 Body Language Processing Service using MediaPipe and Computer Vision
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import AsyncIterator, Callable, Dict, List, Tuple, Optional
 import base64
 import io
 from PIL import Image
 
+from models.translation_models import GestureRecord
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -69,12 +72,125 @@ class BodyLanguageProcessor:
         if not OPENCV_AVAILABLE:
             return self._get_mock_detection()
             
-        try:
-            # Convert bytes to OpenCV format
-            image = self._bytes_to_cv_image(image_bytes)
-            if image is None:
-                return self._empty_result()
+        # Convert bytes to OpenCV format
+        image = self._bytes_to_cv_image(image_bytes)
+        if image is None:
+            return self._empty_result()
+        
+        return self._process_image(image)
+    
+    async def process_video(self, video_path: str, sample_every: int = 5) -> Dict:
+        """
+        Process a video file on disk to extract body language data.
+        
+        Frames are decoded one at a time straight from the file, so memory use
+        does not grow with the size of the upload. Decoding runs in a worker
+        thread to keep the event loop free.
+        
+        Args:
+            video_path: Path to the video file
+            sample_every: Analyse every Nth frame
             
+        Returns:
+            Dictionary of detections merged across the sampled frames
+        """
+        return await asyncio.to_thread(self._process_video_file, video_path, sample_every)
+    
+    async def process_video_segments(self, video_path: str, segment_seconds: float = 3.0,
+                                     sample_every: int = 5) -> AsyncIterator[Dict]:
+        """
+        Yield body language data for consecutive segments of a video file.
+        
+        Each segment is yielded as soon as the decoding thread has analysed it,
+        so callers can translate one segment while the next is being decoded.
+        
+        Args:
+            video_path: Path to the video file
+            segment_seconds: Length of each segment
+            sample_every: Analyse every Nth frame
+        """
+        loop = asyncio.get_running_loop()
+        segments = asyncio.Queue()
+        
+        def emit(result: Dict):
+            loop.call_soon_threadsafe(segments.put_nowait, result)
+        
+        async def decode():
+            try:
+                await asyncio.to_thread(self._segment_video_file, video_path, segment_seconds, sample_every, emit)
+            finally:
+                segments.put_nowait(None)
+        
+        decoder = asyncio.create_task(decode())
+        try:
+            while (segment := await segments.get()) is not None:
+                yield segment
+        finally:
+            await decoder
+    
+    def _process_video_file(self, video_path: str, sample_every: int) -> Dict:
+        """Decode and analyse sampled frames of a video file."""
+        results = []
+        self._segment_video_file(video_path, None, sample_every, results.append)
+        return results[0]
+    
+    def _segment_video_file(self, video_path: str, segment_seconds: Optional[float],
+                            sample_every: int, emit: Callable[[Dict], None]):
+        """Decode a video file, emitting merged detections per segment (or once for the whole file)."""
+        if not OPENCV_AVAILABLE:
+            emit(self._get_mock_detection())
+            return
+        
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            logger.error(f"Could not open video: {video_path}")
+            emit(self._empty_result())
+            return
+        
+        segment_frames = None
+        if segment_seconds:
+            segment_frames = max(1, int((capture.get(cv2.CAP_PROP_FPS) or 30) * segment_seconds))
+        
+        results = []
+        emitted = False
+        frame_index = 0
+        try:
+            while True:
+                ok, image = capture.read()
+                if not ok:
+                    break
+                if frame_index % sample_every == 0:
+                    results.append(self._process_image(image))
+                frame_index += 1
+                if segment_frames and frame_index % segment_frames == 0 and results:
+                    emit(self.merge_results(results))
+                    emitted = True
+                    results = []
+        finally:
+            capture.release()
+        
+        if results:
+            emit(self.merge_results(results))
+        elif not emitted:
+            emit(self._empty_result())
+    
+    def merge_results(self, results: List[Dict]) -> Dict:
+        """Combine per-frame (or per-segment) detections into a single result."""
+        merged = self._empty_result()
+        for result in results:
+            for key in ('gestures', 'pose_landmarks', 'face_landmarks', 'expressions'):
+                merged[key].extend(result[key])
+            for key, detected in result['confidence_scores'].items():
+                merged['confidence_scores'][key] = merged['confidence_scores'][key] or detected
+        
+        # Report the quality of a representative (middle) frame
+        merged['frame_quality'] = results[len(results) // 2]['frame_quality']
+        merged['frames_processed'] = sum(result.get('frames_processed', 1) for result in results)
+        return merged
+    
+    def _process_image(self, image: any) -> Dict:
+        """Run all detectors on a decoded OpenCV image."""
+        try:
             # Detect faces
             faces = self._detect_faces(image)
             
@@ -169,7 +285,7 @@ class BodyLanguageProcessor:
         
         return poses
     
-    def _detect_gestures(self, image: any) -> List[Dict]:
+    def _detect_gestures(self, image: any) -> List[GestureRecord]:
         """Detect hand gestures using basic image processing."""
         gestures = []
         
@@ -194,12 +310,12 @@ class BodyLanguageProcessor:
                 gesture_type = self._classify_gesture(contour)
                 if gesture_type:
                     x, y, w, h = cv2.boundingRect(contour)
-                    gestures.append({
-                        'type': gesture_type,
-                        'x': int(x + w/2),
-                        'y': int(y + h/2),
-                        'confidence': 0.7
-                    })
+                    gestures.append(GestureRecord(
+                        type=gesture_type,
+                        x=int(x + w/2),
+                        y=int(y + h/2),
+                        confidence=0.7
+                    ))
         
         return gestures
     
@@ -286,12 +402,12 @@ class BodyLanguageProcessor:
         """Return mock detection data when OpenCV is not available."""
         return {
             'gestures': [
-                {
-                    'type': 'hand_open',
-                    'x': 320,
-                    'y': 240,
-                    'confidence': 0.8
-                }
+                GestureRecord(
+                    type='hand_open',
+                    x=320,
+                    y=240,
+                    confidence=0.8
+                )
             ],
             'pose_landmarks': [
                 {
@@ -352,17 +468,17 @@ class BodyLanguageProcessor:
             }
         }
     
-    def is_thumbs_up(self, gestures: List[Dict]) -> bool:
+    def is_thumbs_up(self, gestures: List[GestureRecord]) -> bool:
         """Check if thumbs up gesture is detected."""
-        return any(g.get('type') == 'hand_closed' for g in gestures)
+        return any(g.type == 'hand_closed' for g in gestures)
     
-    def is_waving(self, gestures: List[Dict]) -> bool:
+    def is_waving(self, gestures: List[GestureRecord]) -> bool:
         """Check if waving gesture is detected."""
-        return any(g.get('type') == 'hand_open' for g in gestures)
+        return any(g.type == 'hand_open' for g in gestures)
     
-    def is_pointing(self, gestures: List[Dict]) -> bool:
+    def is_pointing(self, gestures: List[GestureRecord]) -> bool:
         """Check if pointing gesture is detected."""
-        return any(g.get('type') == 'hand_partial' for g in gestures)
+        return any(g.type == 'hand_partial' for g in gestures)
     
     def get_gesture_summary(self, body_data: Dict) -> str:
         """Generate a summary of detected gestures."""
@@ -375,7 +491,7 @@ class BodyLanguageProcessor:
             summary_parts.append(f"Face detected")
         
         if gestures:
-            gesture_types = [g.get('type', 'unknown') for g in gestures]
+            gesture_types = [g.type for g in gestures]
             summary_parts.append(f"Gestures: {', '.join(gesture_types)}")
         
         if self.is_thumbs_up(gestures):
@@ -10,11 +10,27 @@ import uuid
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import chromadb
+import msgspec
 from chromadb.config import Settings
 import os
 
 logger = logging.getLogger(__name__)
 
+def _json_default(value: Any) -> Any:
+    """Serialize numpy arrays and scalars, and structs such as gestures, stored in session data"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, msgspec.Struct):
+        return msgspec.structs.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+INSERT_SESSION_SQL = """
+    INSERT INTO translation_sessions 
+    (session_id, translation_type, input_type, output_type, input_data, output_data, 
+     confidence, processing_time, user_id, context)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 class DatabaseManager:
     def __init__(self):
         self.sqlite_db_path = "body_language_translator.db"
@@ -23,6 +39,14 @@ class DatabaseManager:
         self.chroma_client = None
         self.chroma_collection = None
         
+        # Queued session writes are coalesced over this window (seconds)
+        self.flush_interval = 0.05
+        self.pending_sessions = []
+        self.flush_task = None
+        
+        # Sessions stored so far, kept in memory for cheap health checks
+        self.total_translations = 0
+        
     async def initialize(self):
         """Initialize both SQLite and ChromaDB connections"""
         try:
@@ -47,6 +71,10 @@ class DatabaseManager:
             # Create tables
             await self._create_sqlite_tables()
             
+            cursor = self.sqlite_conn.cursor()
+            cursor.execute("SELECT COUNT(*) as total FROM translation_sessions")
+            self.total_translations = cursor.fetchone()["total"]
+            
             logger.info("SQLite database initialized")
             
         except Exception as e:
@@ -157,27 +185,21 @@ class DatabaseManager:
     async def store_translation_session(self, input_type: str, output_type: str, 
                                       input_data: Dict[str, Any], output_data: Dict[str, Any],
                                       confidence: float = 0.0, processing_time: float = 0.0,
-                                      user_id: Optional[str] = None, context: Optional[str] = None) -> str:
+                                      user_id: Optional[str] = None, context: Optional[str] = None,
+                                      session_id: Optional[str] = None) -> str:
         """
         Store a translation session in SQLite
         """
         try:
-            session_id = str(uuid.uuid4())
-            translation_type = f"{input_type}_to_{output_type}"
+            session_id = session_id or str(uuid.uuid4())
+            row = self._session_row(session_id, input_type, output_type, input_data, output_data,
+                                    confidence, processing_time, user_id, context)
             
             cursor = self.sqlite_conn.cursor()
-            cursor.execute("""
-                INSERT INTO translation_sessions 
-                (session_id, translation_type, input_type, output_type, input_data, output_data, 
-                 confidence, processing_time, user_id, context)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                session_id, translation_type, input_type, output_type,
-                json.dumps(input_data), json.dumps(output_data),
-                confidence, processing_time, user_id, context
-            ))
+            cursor.execute(INSERT_SESSION_SQL, row)
             
             self.sqlite_conn.commit()
+            self.total_translations += 1
             
             # Store embeddings in ChromaDB if applicable
             await self._store_embeddings(session_id, input_data, output_data)
@@ -189,10 +211,93 @@ class DatabaseManager:
             logger.error(f"Error storing translation session: {str(e)}")
             raise
 
+    async def queue_translation_session(self, session_id: str, input_type: str, output_type: str,
+                                        input_data: Dict[str, Any], output_data: Dict[str, Any],
+                                        confidence: float = 0.0, processing_time: float = 0.0,
+                                        user_id: Optional[str] = None, context: Optional[str] = None):
+        """
+        Buffer a translation session; sessions queued within flush_interval
+        of each other are inserted with a single commit. Reads of stored
+        sessions flush the buffer first, so a queued session is visible to
+        them as soon as this returns.
+        """
+        self.pending_sessions.append((session_id, input_type, output_type, input_data, output_data,
+                                      confidence, processing_time, user_id, context))
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._flush_sessions_later())
+
+    async def _flush_sessions_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush_sessions()
+
+    async def flush_sessions(self):
+        """
+        Write all buffered translation sessions
+        """
+        pending, self.pending_sessions = self.pending_sessions, []
+        if self.flush_task is not None and self.flush_task is not asyncio.current_task():
+            self.flush_task.cancel()
+        self.flush_task = None
+        if not pending:
+            return
+        
+        rows = []
+        stored = []
+        for session in pending:
+            try:
+                rows.append(self._session_row(*session))
+                stored.append(session)
+            except Exception as e:
+                logger.error(f"Error serializing translation session {session[0]}: {str(e)}")
+        
+        try:
+            cursor = self.sqlite_conn.cursor()
+            cursor.executemany(INSERT_SESSION_SQL, rows)
+            self.sqlite_conn.commit()
+        except Exception as e:
+            # One bad row fails the whole batch; retry row by row so only
+            # the sessions that cannot be written are lost
+            logger.error(f"Error storing queued translation sessions, retrying one by one: {str(e)}")
+            self.sqlite_conn.rollback()
+            rows, stored = self._insert_sessions_individually(rows, stored)
+        
+        self.total_translations += len(rows)
+        for session_id, _, _, input_data, output_data, *_ in stored:
+            await self._store_embeddings(session_id, input_data, output_data)
+        
+        logger.info(f"Stored {len(rows)} queued translation sessions")
+
+    def _insert_sessions_individually(self, rows: List[tuple], sessions: List[tuple]):
+        """Insert rows one commit at a time, returning the rows and sessions that were written"""
+        written_rows, written_sessions = [], []
+        cursor = self.sqlite_conn.cursor()
+        for row, session in zip(rows, sessions):
+            try:
+                cursor.execute(INSERT_SESSION_SQL, row)
+                self.sqlite_conn.commit()
+                written_rows.append(row)
+                written_sessions.append(session)
+            except Exception as e:
+                self.sqlite_conn.rollback()
+                logger.error(f"Error storing translation session {session[0]}: {str(e)}")
+        return written_rows, written_sessions
+
+    def _session_row(self, session_id: str, input_type: str, output_type: str,
+                     input_data: Dict[str, Any], output_data: Dict[str, Any],
+                     confidence: float, processing_time: float,
+                     user_id: Optional[str], context: Optional[str]) -> tuple:
+        """Build the translation_sessions row for a session"""
+        return (
+            session_id, f"{input_type}_to_{output_type}", input_type, output_type,
+            json.dumps(input_data, default=_json_default), json.dumps(output_data, default=_json_default),
+            confidence, processing_time, user_id, context
+        )
+
     async def get_translation_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a translation session by ID
         """
+        await self.flush_sessions()
         try:
             cursor = self.sqlite_conn.cursor()
             cursor.execute("""
@@ -225,6 +330,7 @@ class DatabaseManager:
         """
         Get recent translation sessions
         """
+        await self.flush_sessions()
         try:
             cursor = self.sqlite_conn.cursor()
             
@@ -267,6 +373,7 @@ class DatabaseManager:
         """
         Store user feedback for a translation session
         """
+        await self.flush_sessions()
         try:
             feedback_id = str(uuid.uuid4())
             
@@ -439,6 +546,7 @@ class DatabaseManager:
         """
         Search for similar translation sessions using ChromaDB
         """
+        await self.flush_sessions()
         try:
             if not self.chroma_collection:
                 return []
@@ -493,6 +601,7 @@ class DatabaseManager:
         """
         Get system statistics
         """
+        await self.flush_sessions()
         try:
             cursor = self.sqlite_conn.cursor()
             
@@ -535,6 +644,10 @@ class DatabaseManager:
     async def close(self):
         """Close database connections"""
         try:
+            if self.flush_task:
+                self.flush_task.cancel()
+            await self.flush_sessions()
+            
             if self.sqlite_conn:
                 self.sqlite_conn.close()
             
@@ -12,14 +12,17 @@ from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime
 
 # Import the services to test
-from services.ai_translator import AITranslator
+from services.ai_translator import AITranslator, GESTURE_MAPPINGS
 from services.body_language_processor import BodyLanguageProcessor
 from services.audio_processor import AudioProcessor
 from services.database_manager import DatabaseManager
 from utils.websocket_manager import WebSocketManager
+from utils.batch_queue import BatchQueue
+from utils import clock, responses, result_cache
+from utils.result_cache import ResultCache
 from models.translation_models import (
     TranslationRequest, TranslationResponse, BodyLanguageData,
-    TranslationType, GestureType
+    GestureRecord, TranslationType, GestureType, SignAnimationRequest, JSON_ENCODER
 )
 
 class TestAITranslator:
@@ -56,8 +59,8 @@ class TestAITranslator:
         # Test data
         body_language_data = {
             "gestures": [
-                {"type": "wave", "confidence": 0.8, "description": "Hand waving gesture"},
-                {"type": "smile", "confidence": 0.7, "description": "Facial smile"}
+                GestureRecord(type="wave", confidence=0.8, description="Hand waving gesture"),
+                GestureRecord(type="smile", confidence=0.7, description="Facial smile")
             ],
             "pose_landmarks": [{"x": 0.5, "y": 0.5, "z": 0.0}],
             "confidence_scores": {"wave": 0.8, "smile": 0.7}
@@ -92,6 +95,69 @@ class TestAITranslator:
         assert len(result) > 0
         assert result[0]["gesture_type"] == "hand"
         assert "wave" in result[0]["description"].lower()
+    
+    def test_match_gesture_keywords_order(self):
+        """Test the automaton and the substring fallback list keywords in the same order"""
+        translator = AITranslator()
+        text_lower = "sad and happy, i want to go home"
+        expected = [keyword for keyword in GESTURE_MAPPINGS if keyword in text_lower]
+        
+        if translator.gesture_matcher is not None:
+            assert translator._match_gesture_keywords(text_lower) == expected
+        
+        translator.gesture_matcher = None
+        assert translator._match_gesture_keywords(text_lower) == expected
+    
+    @pytest.mark.asyncio
+    async def test_generate_calls_do_not_overlap(self):
+        """Test concurrent _generate calls drive the engine one at a time"""
+        import threading
+        import time
+        
+        class FakeLLM:
+            def __init__(self):
+                self.running = 0
+                self.overlapped = False
+                self.guard = threading.Lock()
+            
+            def generate(self, prompts, sampling_params):
+                with self.guard:
+                    self.running += 1
+                    self.overlapped |= self.running > 1
+                time.sleep(0.02)
+                with self.guard:
+                    self.running -= 1
+                return [Mock(outputs=[Mock(text=prompt)]) for prompt in prompts]
+        
+        translator = AITranslator()
+        translator.llm = FakeLLM()
+        translator.tokenizer = Mock(apply_chat_template=lambda messages, **kwargs: messages[0]["content"])
+        translator.sampling_params = {"translation": None}
+        
+        replies = await asyncio.gather(*(
+            translator._generate([[{"role": "user", "content": str(i)}]], task="translation") for i in range(4)
+        ))
+        
+        assert replies == [["0"], ["1"], ["2"], ["3"]]
+        assert not translator.llm.overlapped
+    
+    @pytest.mark.asyncio
+    async def test_generate_stream_raises_when_generate_fails(self):
+        """Test a failing generate thread ends the stream and surfaces its error"""
+        pytest.importorskip("transformers")
+        
+        translator = AITranslator()
+        translator.tokenizer = Mock(apply_chat_template=lambda messages, **kwargs: "prompt")
+        translator._encode_prompts = lambda prompts: {"input_ids": [[0]]}
+        translator._generate_kwargs = lambda input_ids, batch_size, task: {}
+        
+        def fail(inputs, **generate_kwargs):
+            raise RuntimeError("out of memory")
+        translator._run_generate = fail
+        
+        with pytest.raises(RuntimeError, match="out of memory"):
+            async for _ in translator._generate_stream([{"role": "user", "content": "hi"}], task="translation"):
+                pass
 
 class TestBodyLanguageProcessor:
     """Test Body Language Processor service"""
@@ -264,6 +330,36 @@ class TestDatabaseManager:
         assert feedback["accuracy_rating"] == 5
         assert feedback["speed_rating"] == 4
 
+    @pytest.mark.asyncio
+    async def test_queued_session_is_readable_immediately(self, db_manager):
+        """Test a queued session can be fetched before its coalesced write fires"""
+        await db_manager.initialize()
+        
+        await db_manager.queue_translation_session(
+            "queued-session", "text", "body_language", {"text": "Hello"}, {"text": "Wave hand"}
+        )
+        session = await db_manager.get_translation_session("queued-session")
+        
+        assert session is not None
+        assert session["input_data"]["text"] == "Hello"
+        assert db_manager.pending_sessions == []
+    
+    @pytest.mark.asyncio
+    async def test_flush_keeps_sessions_around_a_failed_row(self, db_manager):
+        """Test one unwritable session does not drop the rest of its batch"""
+        await db_manager.initialize()
+        stored_before = db_manager.total_translations
+        
+        for session_id in ("first", "first", "second"):  # Duplicate key fails the batch insert
+            await db_manager.queue_translation_session(
+                session_id, "text", "body_language", {"text": session_id}, {"text": "ok"}
+            )
+        await db_manager.flush_sessions()
+        
+        assert await db_manager.get_translation_session("first") is not None
+        assert await db_manager.get_translation_session("second") is not None
+        assert db_manager.total_translations == stored_before + 2
+
 class TestWebSocketManager:
     """Test WebSocket Manager"""
     
@@ -305,6 +401,230 @@ class TestWebSocketManager:
         assert sent_data["content"] == "Hello"
         assert "timestamp" in sent_data
 
+class TestBatchQueue:
+    """Test the micro-batching queue"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_items_share_a_batch(self):
+        """Test items submitted together reach the handler as one batch"""
+        batches = []
+        
+        async def handler(items):
+            batches.append(list(items))
+            return [item * 2 for item in items]
+        
+        queue = BatchQueue(handler, max_batch_size=8, max_wait_ms=20)
+        try:
+            results = await asyncio.gather(*(queue.submit(i) for i in range(5)))
+        finally:
+            await queue.close()
+        
+        assert results == [0, 2, 4, 6, 8]
+        assert batches == [[0, 1, 2, 3, 4]]
+    
+    @pytest.mark.asyncio
+    async def test_items_are_bucketed_by_key(self):
+        """Test items with different bucket keys go to separate handler calls"""
+        batches = []
+        
+        async def handler(items):
+            batches.append(sorted(items))
+            return items
+        
+        queue = BatchQueue(handler, max_batch_size=8, max_wait_ms=20, bucket_key=lambda item: item % 2)
+        try:
+            results = await asyncio.gather(*(queue.submit(i) for i in range(4)))
+        finally:
+            await queue.close()
+        
+        assert results == [0, 1, 2, 3]
+        assert sorted(batches) == [[0, 2], [1, 3]]
+    
+    @pytest.mark.asyncio
+    async def test_handler_error_reaches_every_caller(self):
+        """Test a failing batch raises in each caller and the queue keeps working"""
+        async def handler(items):
+            if "bad" in items:
+                raise ValueError("model failed")
+            return items
+        
+        queue = BatchQueue(handler, max_batch_size=8, max_wait_ms=20)
+        try:
+            results = await asyncio.gather(queue.submit("bad"), queue.submit("ok"), return_exceptions=True)
+            assert all(isinstance(result, ValueError) for result in results)
+            
+            assert await queue.submit("ok") == "ok"
+        finally:
+            await queue.close()
+    
+    @pytest.mark.asyncio
+    async def test_bucket_key_error_fails_only_that_item(self):
+        """Test an item whose bucket key raises fails alone without killing the worker"""
+        async def handler(items):
+            return items
+        
+        queue = BatchQueue(handler, max_batch_size=8, max_wait_ms=20, bucket_key=lambda item: 1 // item)
+        try:
+            bad, good = await asyncio.gather(queue.submit(0), queue.submit(1), return_exceptions=True)
+            assert isinstance(bad, ZeroDivisionError)
+            assert good == 1
+            
+            assert await asyncio.wait_for(queue.submit(2), timeout=1) == 2
+        finally:
+            await queue.close()
+    
+    @pytest.mark.asyncio
+    async def test_short_handler_result_fails_the_batch(self):
+        """Test a handler returning too few results fails every caller instead of hanging"""
+        async def handler(items):
+            return items[:1]
+        
+        queue = BatchQueue(handler, max_batch_size=8, max_wait_ms=20)
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(queue.submit(1), queue.submit(2), return_exceptions=True), timeout=1
+            )
+        finally:
+            await queue.close()
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_close_fails_waiting_callers(self):
+        """Test closing the queue fails the batch in flight and items still queued"""
+        started = asyncio.Event()
+        
+        async def handler(items):
+            started.set()
+            await asyncio.sleep(10)
+            return items
+        
+        queue = BatchQueue(handler, max_batch_size=1, max_wait_ms=1)
+        in_flight = asyncio.create_task(queue.submit(1))
+        queued = asyncio.create_task(queue.submit(2))
+        await started.wait()
+        await queue.close()
+        
+        results = await asyncio.wait_for(asyncio.gather(in_flight, queued, return_exceptions=True), timeout=1)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert all("closed" in str(result) for result in results)
+
+class TestResultCache:
+    """Test the content-addressed result cache"""
+    
+    @pytest.fixture
+    def disk_cache(self, tmp_path, monkeypatch):
+        """Point the shared on-disk cache at a temporary directory"""
+        diskcache = pytest.importorskip("diskcache")
+        cache = diskcache.Cache(str(tmp_path))
+        monkeypatch.setattr(result_cache, "_disk_cache", cache)
+        yield cache
+        cache.close()
+    
+    def test_disk_hit_is_not_shared_with_the_caller(self, disk_cache):
+        """Test mutating a result read from disk leaves the cached entry intact"""
+        ResultCache("test").set("key", {"text": "Hello"})
+        
+        cache = ResultCache("test")  # Fresh in-process LRU, so the next get hits disk
+        first = cache.get("key")
+        first["text"] = "changed"
+        
+        assert cache.get("key") == {"text": "Hello"}
+    
+    @pytest.mark.asyncio
+    async def test_bypass_skips_the_cache(self, disk_cache):
+        """Test calls for which bypass is true neither read nor write the cache"""
+        cache = ResultCache("test")
+        
+        class Service:
+            def __init__(self, mock_mode):
+                self.mock_mode = mock_mode
+                self.calls = 0
+            
+            @cache.cached(key=lambda text: text, bypass=lambda service: service.mock_mode)
+            async def run(self, text):
+                self.calls += 1
+                return {"text": text}
+        
+        mock = Service(mock_mode=True)
+        await mock.run("hi")
+        await mock.run("hi")
+        assert mock.calls == 2
+        assert cache.get("hi") is None
+        
+        real = Service(mock_mode=False)
+        await real.run("hi")
+        await real.run("hi")
+        assert real.calls == 1
+
+class TestClock:
+    """Test the timestamp helpers"""
+    
+    @staticmethod
+    def _expected_iso(ns):
+        seconds, nanos = divmod(ns, 1_000_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000).isoformat(timespec="microseconds")
+    
+    def test_fast_iso_across_a_second_boundary(self):
+        """Test the cached date prefix is re-rendered when the second changes"""
+        boundary = 1_700_000_000 * 1_000_000_000
+        for ns in (boundary - 1_000, boundary, boundary + 999_999_999, boundary - 1):
+            assert clock.fast_iso(ns) == self._expected_iso(ns)
+    
+    def test_now_iso_across_a_second_boundary(self, monkeypatch):
+        """Test now_iso reads the clock on every call instead of serving a stale value"""
+        boundary = 1_700_000_000 * 1_000_000_000
+        readings = iter((boundary - 1_000, boundary + 1_000))
+        monkeypatch.setattr(clock.time, "time_ns", lambda: next(readings))
+        
+        assert clock.now_iso() == self._expected_iso(boundary - 1_000)
+        assert clock.now_iso() == self._expected_iso(boundary + 1_000)
+
+class TestResponses:
+    """Test the JSON response helpers"""
+    
+    def test_stats_body_envelope(self, monkeypatch):
+        """Test stats are spliced into the status envelope byte for byte"""
+        monkeypatch.setattr(responses, "now_iso", lambda: "2023-01-01T00:00:00.000000")
+        
+        body = responses.stats_body({"total_sessions": 3, "avg_confidence": 0.5})
+        
+        assert body == (
+            b'{"success":true,"stats":{"total_sessions":3,"avg_confidence":0.5},'
+            b'"timestamp":"2023-01-01T00:00:00.000000"}'
+        )
+        assert json.loads(body)["stats"]["total_sessions"] == 3
+    
+    @pytest.mark.parametrize("count, chunks", [(0, 0), (64, 1), (65, 2)])
+    def test_stream_json_array_chunk_boundaries(self, count, chunks):
+        """Test items are emitted in chunks of 64 and join into valid JSON"""
+        items = [{"id": i} for i in range(count)]
+        
+        parts = list(responses.stream_json_array(b'{"sessions":', items, b'}'))
+        
+        assert parts[0] == b'{"sessions":['
+        assert parts[-1] == b']}'
+        assert len(parts) == chunks + 2
+        assert json.loads(b"".join(parts)) == {"sessions": items}
+    
+    def test_cached_with_ttl_expiry(self, monkeypatch):
+        """Test the cached value is reused until the TTL runs out"""
+        now = [100.0]
+        monkeypatch.setattr(responses.time, "monotonic", lambda: now[0])
+        calls = []
+        
+        @responses.cached_with_ttl(5.0)
+        def compute():
+            calls.append(now[0])
+            return len(calls)
+        
+        assert compute() == 1
+        now[0] = 104.9
+        assert compute() == 1
+        now[0] = 105.0
+        assert compute() == 2
+        assert calls == [100.0, 105.0]
+
 class TestTranslationModels:
     """Test Pydantic models"""
     
@@ -337,20 +657,52 @@ class TestTranslationModels:
         assert response.confidence == 0.85
         assert "wave" in response.detected_gestures
     
+    def test_translation_response_to_json_omits_none(self):
+        """Test to_json leaves out unset optional fields"""
+        response = TranslationResponse.trusted(
+            session_id="test-session-123",
+            translated_text="Hello world",
+            confidence=0.85,
+            timestamp="2023-01-01T00:00:00"
+        )
+        
+        payload = json.loads(response.to_json())
+        assert payload["translated_text"] == "Hello world"
+        assert "detected_gestures" not in payload
+        
+        payload = json.loads(response.to_json(exclude_none=False))
+        assert payload["detected_gestures"] is None
+    
     def test_body_language_data(self):
         """Test BodyLanguageData model"""
         data = BodyLanguageData(
             gestures=[
-                {"type": "wave", "confidence": 0.8, "description": "Hand wave"}
+                GestureRecord(type="wave", confidence=0.8, description="Hand wave")
             ],
             pose_landmarks=[{"x": 0.5, "y": 0.5, "z": 0.0}],
             confidence_scores={"wave": 0.8}
         )
         
         assert len(data.gestures) == 1
-        assert data.gestures[0]["type"] == "wave"
+        assert data.gestures[0].type == "wave"
         assert len(data.pose_landmarks) == 1
         assert data.confidence_scores["wave"] == 0.8
+        
+        payload = json.loads(JSON_ENCODER.encode(data))
+        assert payload["gestures"][0]["type"] == "wave"
+        assert payload["pose_landmarks"] == [{"x": 0.5, "y": 0.5, "z": 0.0}]
+    
+    def test_sign_animation_request_validation(self):
+        """Test SignAnimationRequest rejects empty text and out-of-range durations"""
+        request = SignAnimationRequest(text="hello")
+        assert request.duration == 3.0
+        
+        with pytest.raises(ValueError):
+            SignAnimationRequest(text="")
+        with pytest.raises(ValueError):
+            SignAnimationRequest(text="hello", duration=3600)
+        with pytest.raises(ValueError):
+            SignAnimationRequest(text="hello", duration=0)
 
 class TestIntegration:
     """Integration tests"""
@@ -383,7 +735,7 @@ class TestIntegration:
         # Test body language to text translation
         body_language_data = {
             "gestures": [
-                {"type": "wave", "confidence": 0.8, "description": "Hand waving gesture"}
+                GestureRecord(type="wave", confidence=0.8, description="Hand waving gesture")
             ],
             "confidence_scores": {"wave": 0.8}
         }
@@ -9,9 +9,26 @@ import time
 from typing import List, Dict, Any
 
 import requests
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE = "http://localhost:8000"
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def encode(payload: Any) -> bytes:
+    """Serialise a request body once, so it can be sent as-is"""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode()
+
+def post_json(path: str, payload: Any) -> requests.Response:
+    return requests.post(f"{BASE}{path}", data=encode(payload), headers=JSON_HEADERS)
+
+def decode(response: requests.Response) -> Any:
+    """Parse a JSON body from the raw bytes, skipping the str decode of .json()"""
+    return orjson.loads(response.content) if orjson else json.loads(response.content)
+
 def pretty(label: str, data: Any):
     print(f"\n=== {label} ===")
     if isinstance(data, (dict, list)):
@@ -23,8 +40,8 @@ def test_text_to_body(inputs: List[str]):
     results = []
     for text in inputs:
         try:
-            r = requests.post(f"{BASE}/translate/text-to-body", json={"text": text})
-            res = r.json()
+            r = post_json("/translate/text-to-body", {"text": text})
+            res = decode(r)
             results.append({
                 "input": text,
                 "status": r.status_code,
@@ -38,13 +55,13 @@ def test_text_to_body(inputs: List[str]):
 
 def test_wlasl():
     try:
-        vocab = requests.get(f"{BASE}/asl/wlasl-vocabulary").json()
+        vocab = decode(requests.get(f"{BASE}/asl/wlasl-vocabulary"))
         pretty("WLASL vocabulary count", {"count": len(vocab.get("vocabulary", []))})
     except Exception as e:
         pretty("WLASL vocabulary error", str(e))
 
     try:
-        anim = requests.post(f"{BASE}/asl/text-to-wlasl-animation", json={"text": "hello"}).json()
+        anim = decode(post_json("/asl/text-to-wlasl-animation", {"text": "hello"}))
         pretty("WLASL animation (hello)", {
             "success": anim.get("success"),
             "gloss": anim.get("gloss"),
@@ -56,13 +73,13 @@ def test_wlasl():
 
 def test_how2sign():
     try:
-        info = requests.get(f"{BASE}/how2sign/info").json()
+        info = decode(requests.get(f"{BASE}/how2sign/info"))
         pretty("How2Sign info", info)
     except Exception as e:
         pretty("How2Sign info error", str(e))
 
     try:
-        anim = requests.post(f"{BASE}/how2sign/animation", json={"sign_gloss": "HELLO"}).json()
+        anim = decode(post_json("/how2sign/animation", {"sign_gloss": "HELLO"}))
         pretty("How2Sign animation (HELLO)", {
             "success": anim.get("success"),
             "num_frames": len(anim.get("animation", [])) if isinstance(anim.get("animation"), list) else None
@@ -73,7 +90,7 @@ def test_how2sign():
 
 def test_sigml():
     try:
-        res = requests.post(f"{BASE}/sign/sigml/generate", json={"text": "hello", "duration": 3.0}).json()
+        res = decode(post_json("/sign/sigml/generate", {"text": "hello", "duration": 3.0}))
         pretty("SiGML generate (hello)", {
             "success": res.get("success"),
             "hamnosys": res.get("animation", {}).get("hamnosys"),
@@ -0,0 +1,114 @@
+"""
+Micro-batching queue for model calls made by concurrent requests
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class BatchQueue:
+    """
+    Collects items submitted by concurrent callers for up to `max_wait_ms`
+    (or until `max_batch_size` items are pending), runs them through
+    `handler` as one batch and resolves each caller's future with its result.
+    """
+
+    def __init__(self,
+                 handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 16,
+                 max_wait_ms: float = 15.0,
+                 bucket_key: Optional[Callable[[Any], Hashable]] = None):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.bucket_key = bucket_key
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        # The batch the collector is currently gathering or dispatching
+        self.pending: List[Any] = []
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the next batch"""
+        if self.worker is None or self.worker.done():
+            self.queue = asyncio.Queue()
+            self.worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def close(self):
+        """Stop the collector task, failing every caller still waiting on a result"""
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+            
+            closed = RuntimeError("batch queue closed")
+            self._fail(self.pending, closed)
+            while not self.queue.empty():
+                self._fail([self.queue.get_nowait()], closed)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = self.pending = [await self.queue.get()]
+            try:
+                deadline = loop.time() + self.max_wait
+                while len(pending) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        pending.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                for bucket in self._bucket(pending).values():
+                    await self._dispatch(bucket)
+            except Exception as e:
+                # Keep the collector alive; only this batch's callers see the error
+                logger.error(f"Batch collection failed: {str(e)}")
+                self._fail(pending, e)
+
+    def _bucket(self, pending):
+        """
+        Group items of similar size so a batch is not padded out to its
+        longest member; an item whose key cannot be computed fails alone
+        """
+        buckets = defaultdict(list)
+        for item, future in pending:
+            try:
+                key = self.bucket_key(item) if self.bucket_key else None
+            except Exception as e:
+                logger.error(f"Could not bucket batch item: {str(e)}")
+                self._fail([(item, future)], e)
+                continue
+            buckets[key].append((item, future))
+        return buckets
+
+    async def _dispatch(self, bucket):
+        items = [item for item, _ in bucket]
+        try:
+            results = await self.handler(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch handler returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            logger.error(f"Batch of {len(items)} failed: {str(e)}")
+            self._fail(bucket, e)
+            return
+
+        for (_, future), result in zip(bucket, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(entries, error: Exception):
+        for _, future in entries:
+            if not future.done():
+                future.set_exception(error)
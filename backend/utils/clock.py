@@ -0,0 +1,33 @@
+"""
+Cheap wall-clock timestamps for responses and WebSocket messages
+"""
+
+import time
+from datetime import datetime
+
+# Rendered "YYYY-MM-DDTHH:MM:SS" for the most recent whole second seen
+_second_prefix = (0, "")
+
+def fast_iso(ns: int) -> str:
+    """
+    Format a time.time_ns() value like datetime.isoformat(), re-rendering
+    the date part only when the second changes
+    """
+    global _second_prefix
+    sec, nanos = divmod(ns, 1_000_000_000)
+    cached_sec, prefix = _second_prefix
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        _second_prefix = (sec, prefix)
+    return f"{prefix}.{nanos // 1000:06d}"
+
+def now() -> datetime:
+    """Current time, for model default_factory fields"""
+    return datetime.now()
+
+def now_iso() -> str:
+    """
+    Current time as an ISO string; computed on each call, which only costs
+    a time_ns() read and a short format once the second's prefix is cached
+    """
+    return fast_iso(time.time_ns())
@@ -0,0 +1,95 @@
+"""
+orjson-backed JSON response used as the app's default response class
+"""
+
+import functools
+import time
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator
+
+import msgspec
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from utils.clock import now_iso
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Fixed parts of {"success": true, "stats": ..., "timestamp": "..."}
+_STATS_PREFIX = b'{"success":true,"stats":'
+_STATS_TIMESTAMP = b',"timestamp":"'
+_STATS_SUFFIX = b'"}'
+
+def orjson_default(obj: Any) -> Any:
+    """Fallback for values orjson does not encode natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, msgspec.Struct):
+        # Shallow, so numpy fields are left to orjson's native encoder
+        return msgspec.structs.asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Serialize content the same way ORJSONResponse does"""
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, including numpy arrays and scalars"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def stats_body(stats: Any) -> bytes:
+    """Splice serialized stats into the fixed status-endpoint envelope"""
+    return b"".join((_STATS_PREFIX, dumps(stats), _STATS_TIMESTAMP, now_iso().encode(), _STATS_SUFFIX))
+
+def stats_response(stats: Any) -> Response:
+    """Status-endpoint response for the given stats"""
+    return Response(content=stats_body(stats), media_type="application/json")
+
+def stream_json_array(prefix: bytes, items: Iterable[Any], suffix: bytes, chunk_size: int = 64) -> Iterator[bytes]:
+    """
+    Yield prefix + "[item, ...]" + suffix, encoding chunk_size items at a
+    time so a long list is never held as one serialized buffer
+    """
+    yield prefix + b"["
+    chunk = []
+    separator = b""
+    for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) == chunk_size:
+            yield separator + b",".join(chunk)
+            chunk, separator = [], b","
+    if chunk:
+        yield separator + b",".join(chunk)
+    yield b"]" + suffix
+
+def cached_with_ttl(ttl: float):
+    """Reuse a no-argument function's result for `ttl` seconds"""
+    def decorator(func: Callable[[], Any]):
+        expires_at = 0.0
+        value = None
+
+        @functools.wraps(func)
+        def wrapper():
+            nonlocal expires_at, value
+            now = time.monotonic()
+            if now >= expires_at:
+                value = func()
+                expires_at = now + ttl
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,116 @@
+"""
+Content-addressed cache for model outputs (translations, synthesized speech)
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import msgspec
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+logger = logging.getLogger(__name__)
+
+# Defaults to backend/cache/results, wherever the server is launched from
+CACHE_DIR = os.getenv(
+    "RESULT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "results")
+)
+
+_disk_cache = None
+
+def _get_disk_cache():
+    """Open the on-disk cache shared by all workers, if diskcache is installed"""
+    global _disk_cache
+    if _disk_cache is None and diskcache is not None:
+        try:
+            _disk_cache = diskcache.Cache(CACHE_DIR)
+        except Exception as e:
+            logger.error(f"Failed to open result cache at {CACHE_DIR}: {str(e)}")
+    return _disk_cache
+
+def content_key(*parts: Any) -> str:
+    """Hash JSON-serializable inputs into a stable cache key"""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def quantize(value: Any, ndigits: int = 3) -> Any:
+    """Round every float in a nested structure so near-identical inputs share a key"""
+    if isinstance(value, float):
+        return round(value, ndigits)
+    if isinstance(value, dict):
+        return {k: quantize(v, ndigits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [quantize(v, ndigits) for v in value]
+    if isinstance(value, msgspec.Struct):
+        return quantize(msgspec.structs.asdict(value), ndigits)
+    return value
+
+class ResultCache:
+    """
+    In-process LRU of results for one namespace, backed by the shared
+    on-disk cache so repeated inputs skip inference across workers and restarts.
+    """
+
+    def __init__(self, namespace: str, maxsize: int = 4096):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached result, or None on a miss"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return copy.deepcopy(self.entries[key])
+
+        disk = _get_disk_cache()
+        if disk is not None:
+            value = disk.get(f"{self.namespace}:{key}")
+            if value is not None:
+                # The caller owns the returned object; keep a private copy
+                self._remember(key, copy.deepcopy(value))
+                return value
+        return None
+
+    def set(self, key: str, value: Any):
+        """Store a result in memory and on disk"""
+        self._remember(key, copy.deepcopy(value))
+        disk = _get_disk_cache()
+        if disk is not None:
+            disk.set(f"{self.namespace}:{key}", value)
+
+    def cached(self, key: Callable[..., str], cacheable: Callable[[Any], bool] = lambda result: True,
+               bypass: Callable[[Any], bool] = lambda instance: False):
+        """
+        Decorate an async method so results are cached by key(*args, **kwargs);
+        calls for which bypass(instance) is true skip the cache entirely
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(instance, *args, **kwargs):
+                if bypass(instance):
+                    return await func(instance, *args, **kwargs)
+                cache_key = key(*args, **kwargs)
+                result = self.get(cache_key)
+                if result is None:
+                    result = await func(instance, *args, **kwargs)
+                    if cacheable(result):
+                        self.set(cache_key, result)
+                return result
+            return wrapper
+        return decorator
+
+    def _remember(self, key: str, value: Any):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
@@ -0,0 +1,52 @@
+"""
+Cached CPU and memory usage, sampled in the background for health checks
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Sampling interval of the cached metrics, in seconds
+SAMPLE_INTERVAL = 1.0
+
+_started = time.monotonic()
+_cpu_usage = 0.0
+_memory_usage = 0.0
+_sampler: Optional[asyncio.Task] = None
+
+def cpu_usage() -> float:
+    """CPU usage percentage as of the last sample"""
+    return _cpu_usage
+
+def memory_usage() -> float:
+    """Memory usage percentage as of the last sample"""
+    return _memory_usage
+
+def uptime() -> float:
+    """Seconds since the process loaded this module"""
+    return time.monotonic() - _started
+
+async def _sample():
+    global _cpu_usage, _memory_usage
+    while True:
+        _cpu_usage = psutil.cpu_percent(interval=None)
+        _memory_usage = psutil.virtual_memory().percent
+        await asyncio.sleep(SAMPLE_INTERVAL)
+
+def start_sampler():
+    """Start sampling on the running event loop; metrics stay at 0 without psutil"""
+    global _sampler
+    if _sampler is None and psutil is not None:
+        _sampler = asyncio.create_task(_sample())
+
+def stop_sampler():
+    """Stop the background sampler"""
+    global _sampler
+    if _sampler is not None:
+        _sampler.cancel()
+        _sampler = None
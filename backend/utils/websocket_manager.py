@@ -2,14 +2,45 @@
 WebSocket Manager for real-time body language translation
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, List, Any
+from typing import Awaitable, Callable, Dict, List, Any
 from fastapi import WebSocket
 from datetime import datetime
 
+from utils.clock import now_iso
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+def encode_message(message: Dict[str, Any]) -> str:
+    """Encode a message as JSON text; numpy arrays (e.g. animation tracks) are written directly"""
+    if orjson is not None:
+        return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, default=lambda value: value.tolist())
+
+def _pack_ndarray(value: Any) -> Dict[str, Any]:
+    """Pack numpy arrays as their raw buffer plus shape and dtype"""
+    if hasattr(value, "tobytes") and hasattr(value, "dtype"):
+        return {"__nd__": True, "shape": list(value.shape), "dtype": str(value.dtype), "data": value.tobytes()}
+    raise TypeError(f"Object of type {type(value).__name__} cannot be packed")
+
+def pack_message(message: Dict[str, Any]) -> bytes:
+    """Encode a message as msgpack"""
+    return msgpack.packb(message, use_bin_type=True, default=_pack_ndarray)
+
 class WebSocketManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
@@ -20,10 +51,11 @@ class WebSocketManager:
         await websocket.accept()
         self.active_connections.append(websocket)
         self.connection_data[websocket] = {
-            "connected_at": datetime.now().isoformat(),
-            "last_activity": datetime.now().isoformat(),
+            "connected_at": now_iso(),
+            "last_activity": now_iso(),
             "session_id": None,
-            "user_id": None
+            "user_id": None,
+            "dropped_messages": 0
         }
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
@@ -40,17 +72,32 @@ class WebSocketManager:
         try:
             # Add timestamp if not present
             if "timestamp" not in message:
-                message["timestamp"] = datetime.now().isoformat()
+                message["timestamp"] = now_iso()
             
             # Update last activity
             if websocket in self.connection_data:
-                self.connection_data[websocket]["last_activity"] = datetime.now().isoformat()
+                self.connection_data[websocket]["last_activity"] = now_iso()
             
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_text(encode_message(message))
             
         except Exception as e:
             logger.error(f"Error sending personal message: {str(e)}")
-            await self.disconnect(websocket)
+            self.disconnect(websocket)
+
+    async def send_packed_message(self, message: Dict[str, Any], websocket: WebSocket):
+        """Send message to specific WebSocket connection as a binary msgpack frame"""
+        try:
+            if "timestamp" not in message:
+                message["timestamp"] = now_iso()
+            
+            if websocket in self.connection_data:
+                self.connection_data[websocket]["last_activity"] = now_iso()
+            
+            await websocket.send_bytes(pack_message(message))
+            
+        except Exception as e:
+            logger.error(f"Error sending packed message: {str(e)}")
+            self.disconnect(websocket)
 
     async def broadcast(self, message: Dict[str, Any]):
         """Broadcast message to all connected WebSockets"""
@@ -60,13 +107,13 @@ class WebSocketManager:
             try:
                 # Add timestamp if not present
                 if "timestamp" not in message:
-                    message["timestamp"] = datetime.now().isoformat()
+                    message["timestamp"] = now_iso()
                 
                 # Update last activity
                 if websocket in self.connection_data:
-                    self.connection_data[websocket]["last_activity"] = datetime.now().isoformat()
+                    self.connection_data[websocket]["last_activity"] = now_iso()
                 
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_text(encode_message(message))
                 
             except Exception as e:
                 logger.error(f"Error broadcasting message: {str(e)}")
@@ -87,12 +134,12 @@ class WebSocketManager:
                     
                     # Add timestamp if not present
                     if "timestamp" not in message:
-                        message["timestamp"] = datetime.now().isoformat()
+                        message["timestamp"] = now_iso()
                     
                     # Update last activity
-                    self.connection_data[websocket]["last_activity"] = datetime.now().isoformat()
+                    self.connection_data[websocket]["last_activity"] = now_iso()
                     
-                    await websocket.send_text(json.dumps(message))
+                    await websocket.send_text(encode_message(message))
                     
             except Exception as e:
                 logger.error(f"Error broadcasting to session: {str(e)}")
@@ -102,6 +149,29 @@ class WebSocketManager:
         for websocket in disconnected:
             self.disconnect(websocket)
 
+    def put_latest(self, websocket: WebSocket, queue: asyncio.Queue, item: Any):
+        """Queue an item for a connection, dropping the oldest pending item if the queue is full"""
+        if queue.full():
+            queue.get_nowait()
+            if websocket in self.connection_data:
+                self.connection_data[websocket]["dropped_messages"] += 1
+        queue.put_nowait(item)
+
+    async def consume_latest(self, websocket: WebSocket, queue: asyncio.Queue,
+                             handler: Callable[..., Awaitable[None]]):
+        """Run handler on each item put on a connection's queue until cancelled"""
+        while True:
+            item = await queue.get()
+            try:
+                await handler(*item)
+            except Exception as e:
+                logger.error(f"Error handling WebSocket message: {str(e)}")
+                await self.send_error_message(websocket, str(e))
+
+    def get_dropped_count(self, websocket: WebSocket) -> int:
+        """Get number of messages dropped for a connection because it fell behind"""
+        return self.connection_data.get(websocket, {}).get("dropped_messages", 0)
+
     def set_session_id(self, websocket: WebSocket, session_id: str):
         """Set session ID for a WebSocket connection"""
         if websocket in self.connection_data:
@@ -142,7 +212,7 @@ class WebSocketManager:
             "type": "system",
             "message_type": message_type,
             "content": content,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         await self.send_personal_message(system_message, websocket)
 
@@ -152,7 +222,7 @@ class WebSocketManager:
             "type": "error",
             "message": error_message,
             "error_code": error_code,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         await self.send_personal_message(error_msg, websocket)
 
@@ -161,7 +231,7 @@ class WebSocketManager:
         translation_message = {
             "type": "translation_result",
             "data": translation_data,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         await self.send_personal_message(translation_message, websocket)
 
@@ -170,7 +240,7 @@ class WebSocketManager:
         instructions_message = {
             "type": "body_instructions",
             "instructions": instructions,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         await self.send_personal_message(instructions_message, websocket)
 
@@ -179,7 +249,7 @@ class WebSocketManager:
         transcription_message = {
             "type": "audio_transcription",
             "transcription": transcription,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         await self.send_personal_message(transcription_message, websocket)
 
@@ -189,7 +259,7 @@ class WebSocketManager:
             "type": "confidence_update",
             "confidence": confidence,
             "gesture_type": gesture_type,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         await self.send_personal_message(confidence_message, websocket)
 
@@ -198,7 +268,7 @@ class WebSocketManager:
         gesture_message = {
             "type": "gesture_detected",
             "gesture": gesture_data,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         await self.send_personal_message(gesture_message, websocket)
 
@@ -164,7 +164,8 @@ const RealTimeTranslation: React.FC = () => {
 
         mediaRecorder.ondataavailable = (event) => {
           if (event.data.size > 0 && wsRef.current?.readyState === WebSocket.OPEN) {
-            wsRef.current.send(event.data);
+            // Binary messages start with an opcode byte; 0x01 marks a video frame
+            wsRef.current.send(new Blob([new Uint8Array([0x01]), event.data]));
           }
         };
 